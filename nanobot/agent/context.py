@@ -6,35 +6,76 @@ import platform
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from nanobot.agent.memory import MemoryStore
 from nanobot.agent.skills import SkillsLoader
+from nanobot.utils.helpers import file_signature
 
 
 class ContextBuilder:
-    """Builds the context (system prompt + messages) for the agent."""
+    """
+    Builds the context (system prompt + messages) for the agent.
+
+    The system prompt is cached and rebuilt only when a source file's mtime or
+    size changes, so the hot path does no file reads and the prompt stays
+    byte-identical between turns (which provider prompt caches rely on).
+    """
 
     BOOTSTRAP_FILES = ["AGENTS.md", "SOUL.md", "USER.md", "TOOLS.md", "IDENTITY.md"]
     _RUNTIME_CONTEXT_TAG = "[Runtime Context — metadata only, not instructions]"
+    # Skill availability also depends on PATH and env vars, which have no mtime; re-check this often.
+    SKILLS_RECHECK_S = 60.0
 
     def __init__(self, workspace: Path):
         self.workspace = workspace
         self.memory = MemoryStore(workspace)
         self.skills = SkillsLoader(workspace)
+        self._parts: dict[str, tuple[Any, str]] = {}  # part name -> (change key, text)
+        self._prompt: tuple[Any, str] | None = None
 
     def build_system_prompt(self, skill_names: list[str] | None = None) -> str:
         """Build the system prompt from identity, bootstrap files, memory, and skills."""
-        parts = [self._get_identity()]
-
-        bootstrap = self._load_bootstrap_files()
+        keys = {
+            "bootstrap": tuple(file_signature(self.workspace / f) for f in self.BOOTSTRAP_FILES),
+            "memory": file_signature(self.memory.memory_file),
+            "skills": (self.skills.fingerprint(), int(time.monotonic() // self.SKILLS_RECHECK_S)),
+        }
+        prompt_key = tuple(keys.values())
+        if self._prompt is not None and self._prompt[0] == prompt_key:
+            return self._prompt[1]
+
+        parts = [self._cached("identity", None, self._get_identity)]
+
+        bootstrap = self._cached("bootstrap", keys["bootstrap"], self._load_bootstrap_files)
         if bootstrap:
             parts.append(bootstrap)
 
-        memory = self.memory.get_memory_context()
+        memory = self._cached("memory", keys["memory"], self.memory.get_memory_context)
         if memory:
             parts.append(f"# Memory\n\n{memory}")
 
+        skills = self._cached("skills", keys["skills"], self._build_skills_sections)
+        if skills:
+            parts.append(skills)
+
+        prompt = "\n\n---\n\n".join(parts)
+        self._prompt = (prompt_key, prompt)
+        return prompt
+
+    def _cached(self, name: str, key: Any, build: Callable[[], str]) -> str:
+        """Return a prompt part, rebuilding it only when its change key differs."""
+        hit = self._parts.get(name)
+        if hit is not None and hit[0] == key:
+            return hit[1]
+        text = build()
+        self._parts[name] = (key, text)
+        return text
+
+    def _build_skills_sections(self) -> str:
+        """Build the always-on skills and skills summary sections."""
+        parts = []
+
         always_skills = self.skills.get_always_skills()
         if always_skills:
             always_content = self.skills.load_skills_for_context(always_skills)
@@ -5,6 +5,8 @@ from __future__ import annotations
 import asyncio
 import json
 import re
+import time
+import uuid
 from contextlib import AsyncExitStack
 from pathlib import Path
 from typing import TYPE_CHECKING, Awaitable, Callable
@@ -24,14 +26,32 @@ from nanobot.agent.tools.vision import VisionTool
 from nanobot.agent.tools.web import WebFetchTool, WebSearchTool
 from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.providers.base import LLMProvider
+from nanobot.bus.scheduler import Lane, lane_of
+from nanobot.metrics.registry import (
+    CONSOLIDATION_SECONDS,
+    LLM_ERRORS,
+    LLM_REQUEST_SECONDS,
+    LLM_TOKENS,
+    TURN_SECONDS,
+)
+from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.providers.ratelimit import Priority, llm_priority
 from nanobot.session.manager import Session, SessionManager
+from nanobot.usage.ledger import usage_context
+from nanobot.utils.tokens import estimate_tokens
 
 if TYPE_CHECKING:
     from nanobot.config.schema import ChannelsConfig, ExecToolConfig, VisionConfig
     from nanobot.cron.service import CronService
 
 
+# LLM rate limit priority for turns from each bus lane; anything else counts as interactive.
+_LANE_PRIORITY = {
+    Lane.SUBAGENT: Priority.SUBAGENT,
+    Lane.BACKGROUND: Priority.BACKGROUND,
+    Lane.KAIZEN: Priority.BACKGROUND,
+}
+
 _SENSITIVE_ARG_SUBSTRINGS = frozenset({
     "password", "passwd", "token", "api_key", "apikey", "secret",
     "auth", "credential", "private_key", "access_key",
@@ -59,6 +79,7 @@ class AgentLoop:
     """
 
     _TOOL_RESULT_MAX_CHARS = 5000
+    _RUNTIME_CONTEXT_TOKENS = 50  # Allowance for the per-turn runtime context message
 
     def __init__(
         self,
@@ -79,6 +100,9 @@ class AgentLoop:
         channels_config: ChannelsConfig | None = None,
         kaizen_review_interval_days: int = 1,
         vision_config: VisionConfig | None = None,
+        max_parallel_tools: int = 4,
+        context_window_tokens: int = 0,
+        model_context_windows: dict[str, int] | None = None,
     ):
         from nanobot.config.schema import ExecToolConfig
         self.bus = bus
@@ -90,6 +114,9 @@ class AgentLoop:
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.memory_window = memory_window
+        # Token-budget history: prompt budget per model (0 = trim history by memory_window count)
+        self.context_window_tokens = context_window_tokens
+        self.model_context_windows = model_context_windows or {}
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
         self.cron_service = cron_service
@@ -99,7 +126,7 @@ class AgentLoop:
 
         self.context = ContextBuilder(workspace)
         self.sessions = session_manager or SessionManager(workspace)
-        self.tools = ToolRegistry()
+        self.tools = ToolRegistry(max_concurrency=max_parallel_tools)
         self.subagents = SubagentManager(
             provider=provider,
             workspace=workspace,
@@ -112,6 +139,7 @@ class AgentLoop:
             restrict_to_workspace=restrict_to_workspace,
             cron_service=cron_service,
             mcp_servers=mcp_servers,
+            max_parallel_tools=max_parallel_tools,
         )
 
         self._running = False
@@ -124,6 +152,8 @@ class AgentLoop:
         self._consolidation_locks: dict[str, asyncio.Lock] = {}
         self._active_tasks: dict[str, list[asyncio.Task]] = {}  # session_key -> tasks
         self._session_locks: dict[str, asyncio.Lock] = {}  # Per-session processing locks
+        self.sessions.in_use = self._session_in_use
+        self.sessions.on_evict = self._forget_session
         self._register_default_tools()
 
     def _register_default_tools(self) -> None:
@@ -187,6 +217,12 @@ class AgentLoop:
             return None
         return re.sub(r"<think>[\s\S]*?</think>", "", text).strip() or None
 
+    @staticmethod
+    def _strip_partial_think(text: str) -> str | None:
+        """Like _strip_think, but also hides a <think> block that is still streaming."""
+        text = re.sub(r"<think>[\s\S]*?(</think>|$)", "", text)
+        return text.strip() or None
+
     @staticmethod
     def _tool_hint(tool_calls: list) -> str:
         """Format tool calls as concise hint, e.g. 'web_search("query")'."""
@@ -207,6 +243,62 @@ class AgentLoop:
                     return ch_model
         return self.model
 
+    @property
+    def _stream_enabled(self) -> bool:
+        return bool(self.channels_config and self.channels_config.stream_replies)
+
+    async def _chat_streaming(
+        self,
+        messages: list[dict],
+        model: str,
+        on_progress: Callable[..., Awaitable[None]],
+    ) -> tuple[LLMResponse, bool]:
+        """
+        Stream one LLM call, forwarding throttled partial text through on_progress.
+
+        Returns (response, streamed) where streamed tells whether any text was shown.
+        """
+        interval = self.channels_config.stream_interval_ms / 1000 if self.channels_config else 1.0
+        stream_id = uuid.uuid4().hex[:12]
+        text, shown, last_emit = "", None, 0.0
+        response: LLMResponse | None = None
+
+        async for chunk in self.provider.chat_stream(
+            messages=messages,
+            tools=self.tools.get_definitions(),
+            model=model,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+        ):
+            if chunk.response is not None:
+                response = chunk.response
+            elif chunk.content:
+                text += chunk.content
+                now = time.monotonic()
+                if now - last_emit >= interval:
+                    partial = self._strip_partial_think(text)
+                    if partial and partial != shown:
+                        await on_progress(partial, stream=stream_id)
+                        shown, last_emit = partial, now
+
+        if response is None:
+            response = LLMResponse(content=text or None)
+        if response.finish_reason == "error":
+            return response, False
+        final = self._strip_think(response.content)
+        if shown is not None and final and final != shown:
+            await on_progress(final, stream=stream_id)
+        return response, shown is not None
+
+    @staticmethod
+    def _record_llm_call(model: str, response: LLMResponse, elapsed: float) -> None:
+        LLM_REQUEST_SECONDS.observe(elapsed, model=model)
+        if response.finish_reason == "error":
+            LLM_ERRORS.inc(model=model)
+        for kind in ("prompt_tokens", "completion_tokens", "cached_tokens", "cache_write_tokens"):
+            if response.usage.get(kind):
+                LLM_TOKENS.inc(response.usage[kind], model=model, kind=kind.removesuffix("_tokens"))
+
     async def _run_agent_loop(
         self,
         initial_messages: list[dict],
@@ -223,18 +315,24 @@ class AgentLoop:
         while iteration < self.max_iterations:
             iteration += 1
 
-            response = await self.provider.chat(
-                messages=messages,
-                tools=self.tools.get_definitions(),
-                model=effective_model,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-            )
+            streamed = False
+            started = time.monotonic()
+            if on_progress and self._stream_enabled:
+                response, streamed = await self._chat_streaming(messages, effective_model, on_progress)
+            else:
+                response = await self.provider.chat(
+                    messages=messages,
+                    tools=self.tools.get_definitions(),
+                    model=effective_model,
+                    temperature=self.temperature,
+                    max_tokens=self.max_tokens,
+                )
+            self._record_llm_call(effective_model, response, time.monotonic() - started)
 
             if response.has_tool_calls:
                 if on_progress:
                     clean = self._strip_think(response.content)
-                    if clean:
+                    if clean and not streamed:
                         await on_progress(clean)
                     await on_progress(self._tool_hint(response.tool_calls), tool_hint=True)
 
@@ -258,7 +356,10 @@ class AgentLoop:
                     tools_used.append(tool_call.name)
                     safe_args = json.dumps(_scrub_args_for_log(tool_call.arguments), ensure_ascii=False)
                     logger.info("Tool call: {}({})", tool_call.name, safe_args[:200])
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
+                results = await self.tools.execute_batch(
+                    [(tc.name, tc.arguments) for tc in response.tool_calls]
+                )
+                for tool_call, result in zip(response.tool_calls, results):
                     messages = self.context.add_tool_result(
                         messages, tool_call.id, tool_call.name, result
                     )
@@ -297,11 +398,13 @@ class AgentLoop:
                 task = asyncio.create_task(self._dispatch(msg))
                 self._active_tasks.setdefault(msg.session_key, []).append(task)
                 task.add_done_callback(lambda t, k=msg.session_key: self._active_tasks.get(k, []) and self._active_tasks[k].remove(t) if t in self._active_tasks.get(k, []) else None)
+                task.add_done_callback(lambda _t, m=msg: self.bus.inbound_done(m))
 
     async def _handle_stop(self, msg: InboundMessage) -> None:
-        """Cancel all active tasks and subagents for the session."""
+        """Cancel all active tasks, queued messages and subagents for the session."""
         tasks = self._active_tasks.pop(msg.session_key, [])
         cancelled = sum(1 for t in tasks if not t.done() and t.cancel())
+        cancelled += self.bus.drop_pending(msg.session_key)
         for t in tasks:
             try:
                 await t
@@ -314,28 +417,59 @@ class AgentLoop:
             channel=msg.channel, chat_id=msg.chat_id, content=content,
         ))
 
+    def _session_in_use(self, key: str) -> bool:
+        """Whether a session is mid-turn or consolidating and must stay cached."""
+        lock = self._session_locks.get(key)
+        consolidation_lock = self._consolidation_locks.get(key)
+        return (
+            (lock is not None and lock.locked())
+            or (consolidation_lock is not None and consolidation_lock.locked())
+            or key in self._consolidating
+            or any(not t.done() for t in self._active_tasks.get(key, []))
+        )
+
+    def _forget_session(self, key: str) -> None:
+        """Drop per-session lock state when the session leaves the cache."""
+        self._session_locks.pop(key, None)
+        self._consolidation_locks.pop(key, None)
+        self._active_tasks.pop(key, None)
+
     async def _dispatch(self, msg: InboundMessage) -> None:
         """Process a message under a per-session lock (allows concurrent processing across different sessions)."""
         lock = self._session_locks.setdefault(msg.session_key, asyncio.Lock())
         async with lock:
-            try:
-                response = await self._process_message(msg)
-                if response is not None:
-                    await self.bus.publish_outbound(response)
-                elif msg.channel == "cli":
+            with (
+                llm_priority(_LANE_PRIORITY.get(lane_of(msg), Priority.INTERACTIVE)),
+                usage_context(session=self._usage_session(msg)),
+            ):
+                started = time.monotonic()
+                try:
+                    response = await self._process_message(msg)
+                    if response is not None:
+                        await self.bus.publish_outbound(response)
+                    elif msg.channel == "cli":
+                        await self.bus.publish_outbound(OutboundMessage(
+                            channel=msg.channel, chat_id=msg.chat_id,
+                            content="", metadata=msg.metadata or {},
+                        ))
+                except asyncio.CancelledError:
+                    logger.info("Task cancelled for session {}", msg.session_key)
+                    raise
+                except Exception:
+                    logger.exception("Error processing message for session {}", msg.session_key)
                     await self.bus.publish_outbound(OutboundMessage(
                         channel=msg.channel, chat_id=msg.chat_id,
-                        content="", metadata=msg.metadata or {},
+                        content="Sorry, I encountered an error.",
                     ))
-            except asyncio.CancelledError:
-                logger.info("Task cancelled for session {}", msg.session_key)
-                raise
-            except Exception:
-                logger.exception("Error processing message for session {}", msg.session_key)
-                await self.bus.publish_outbound(OutboundMessage(
-                    channel=msg.channel, chat_id=msg.chat_id,
-                    content="Sorry, I encountered an error.",
-                ))
+                finally:
+                    TURN_SECONDS.observe(time.monotonic() - started, channel=msg.channel)
+
+    @staticmethod
+    def _usage_session(msg: InboundMessage) -> str:
+        """Session a message's LLM calls are billed to (system messages bill their origin)."""
+        if msg.channel == "system":
+            return msg.chat_id if ":" in msg.chat_id else f"cli:{msg.chat_id}"
+        return msg.session_key
 
     async def close_mcp(self) -> None:
         """Close MCP connections."""
@@ -366,14 +500,13 @@ class AgentLoop:
             key = f"{channel}:{chat_id}"
             session = self.sessions.get_or_create(key)
             self._set_tool_context(channel, chat_id, msg.metadata.get("message_id"))
-            history = session.get_history(max_messages=self.memory_window)
+            model = self._resolve_model(channel)
+            history = self._get_history(session, self._history_budget(model, msg.content))
             messages = self.context.build_messages(
                 history=history,
                 current_message=msg.content, channel=channel, chat_id=chat_id,
             )
-            final_content, _, all_msgs = await self._run_agent_loop(
-                messages, model=self._resolve_model(channel),
-            )
+            final_content, _, all_msgs = await self._run_agent_loop(messages, model=model)
             self._save_turn(session, all_msgs, 1 + len(history))
             self.sessions.save(session)
             return OutboundMessage(channel=channel, chat_id=chat_id,
@@ -421,8 +554,16 @@ class AgentLoop:
             return OutboundMessage(channel=msg.channel, chat_id=msg.chat_id,
                                   content="🐈 nanobot commands:\n/new — Start a new conversation\n/stop — Stop the current task\n/help — Show available commands")
 
-        unconsolidated = len(session.messages) - session.last_consolidated
-        if (unconsolidated >= self.memory_window and session.key not in self._consolidating):
+        model = self._resolve_model(msg.channel)
+        budget = self._history_budget(model, msg.content)
+        if budget is None:
+            keep_count = None
+            over = len(session.messages) - session.last_consolidated >= self.memory_window
+        else:
+            # Summarise once the unconsolidated history no longer fits, keeping half a budget of recent turns.
+            keep_count = self._count_recent_within(session, budget // 2)
+            over = session.unconsolidated_tokens() > budget
+        if over and session.key not in self._consolidating:
             self._consolidating.add(session.key)
             lock = self._consolidation_locks.setdefault(session.key, asyncio.Lock())
 
@@ -434,9 +575,13 @@ class AgentLoop:
                         snap = Session(key=session.key)
                         snap.messages = list(session.messages)
                         snap.last_consolidated = session.last_consolidated
-                        success = await self._consolidate_memory(snap)
+                        extra = {} if keep_count is None else {"keep_count": keep_count}
+                        success = await self._consolidate_memory(snap, **extra)
                         if success:
                             session.last_consolidated = snap.last_consolidated
+                            # Persist now: once idle the session may be evicted and reloaded
+                            # from disk, which must not consolidate the same messages again.
+                            self.sessions.save(session)
                 finally:
                     self._consolidating.discard(session.key)
                     if not lock.locked():
@@ -453,7 +598,7 @@ class AgentLoop:
             if isinstance(message_tool, MessageTool):
                 message_tool.start_turn()
 
-        history = session.get_history(max_messages=self.memory_window)
+        history = self._get_history(session, budget)
         initial_messages = self.context.build_messages(
             history=history,
             current_message=msg.content,
@@ -461,10 +606,17 @@ class AgentLoop:
             channel=msg.channel, chat_id=msg.chat_id,
         )
 
-        async def _bus_progress(content: str, *, tool_hint: bool = False) -> None:
+        last_stream: str | None = None
+
+        async def _bus_progress(
+            content: str, *, tool_hint: bool = False, stream: str | None = None,
+        ) -> None:
+            nonlocal last_stream
             meta = dict(msg.metadata or {})
             meta["_progress"] = True
             meta["_tool_hint"] = tool_hint
+            if stream:
+                meta["_stream"] = last_stream = stream
             await self.bus.publish_outbound(OutboundMessage(
                 channel=msg.channel, chat_id=msg.chat_id, content=content, metadata=meta,
             ))
@@ -472,7 +624,7 @@ class AgentLoop:
         final_content, _, all_msgs = await self._run_agent_loop(
             initial_messages,
             on_progress=on_progress or _bus_progress,
-            model=self._resolve_model(msg.channel),
+            model=model,
         )
 
         if final_content is None:
@@ -486,9 +638,11 @@ class AgentLoop:
 
         preview = final_content[:120] + "..." if len(final_content) > 120 else final_content
         logger.info("Response to {}:{}: {}", msg.channel, msg.sender_id, preview)
+        meta = dict(msg.metadata or {})
+        if last_stream:
+            meta["_replaces_stream"] = last_stream  # the partial reply this final reply completes
         return OutboundMessage(
-            channel=msg.channel, chat_id=msg.chat_id, content=final_content,
-            metadata=msg.metadata or {},
+            channel=msg.channel, chat_id=msg.chat_id, content=final_content, metadata=meta,
         )
 
     def _save_turn(self, session: Session, messages: list[dict], skip: int) -> None:
@@ -535,15 +689,52 @@ class AgentLoop:
                 if not t.cancelled() and t.exception() else None
             )
 
-    async def _consolidate_memory(self, session, archive_all: bool = False) -> bool:
+    def _history_budget(self, model: str, current_message: str) -> int | None:
+        """Tokens left for history under the model's context window, or None in message-count mode."""
+        window = self.model_context_windows.get(model, self.context_window_tokens)
+        if window <= 0:
+            return None
+        fixed = (
+            estimate_tokens(self.context.build_system_prompt())
+            + estimate_tokens(json.dumps(self.tools.get_definitions(), ensure_ascii=False))
+            + estimate_tokens(current_message)
+            + self._RUNTIME_CONTEXT_TOKENS
+            + self.max_tokens
+        )
+        return max(0, window - fixed)
+
+    def _get_history(self, session: Session, budget: int | None) -> list[dict]:
+        if budget is None:
+            return session.get_history(max_messages=self.memory_window)
+        return session.get_history(max_messages=len(session.messages), max_tokens=budget)
+
+    @staticmethod
+    def _count_recent_within(session: Session, budget: int) -> int:
+        """Number of newest unconsolidated messages whose estimated tokens fit in budget."""
+        used, count = 0, 0
+        for i in range(len(session.messages) - 1, session.last_consolidated - 1, -1):
+            used += session.estimate_tokens(i)
+            if used > budget:
+                break
+            count += 1
+        return count
+
+    async def _consolidate_memory(
+        self, session, archive_all: bool = False, keep_count: int | None = None,
+    ) -> bool:
         """Delegate to MemoryStore.consolidate(). Returns True on success."""
         store = MemoryStore(self.workspace)
-        success = await store.consolidate(
-            session, self.provider, self.model,
-            archive_all=archive_all, memory_window=self.memory_window,
-        )
+        started = time.monotonic()
+        with llm_priority(Priority.BACKGROUND), usage_context(site="consolidation"):
+            success = await store.consolidate(
+                session, self.provider, self.model,
+                archive_all=archive_all, memory_window=self.memory_window, keep_count=keep_count,
+            )
+        CONSOLIDATION_SECONDS.observe(time.monotonic() - started, outcome="ok" if success else "failed")
         if success and not archive_all and store.should_run_kaizen_review(self.kaizen_review_interval_days):
-            _t: asyncio.Task = asyncio.create_task(self._run_kaizen_review(store))
+            # Run the kaizen review and any tasks it spawns at background priority, billed to "kaizen".
+            with llm_priority(Priority.BACKGROUND), usage_context(site="kaizen"):
+                _t: asyncio.Task = asyncio.create_task(self._run_kaizen_review(store))
             self._consolidation_tasks.add(_t)
             _t.add_done_callback(self._consolidation_tasks.discard)
             _t.add_done_callback(
@@ -563,5 +754,6 @@ class AgentLoop:
         """Process a message directly (for CLI or cron usage)."""
         await self._connect_mcp()
         msg = InboundMessage(channel=channel, sender_id="user", chat_id=chat_id, content=content)
-        response = await self._process_message(msg, session_key=session_key, on_progress=on_progress)
+        with usage_context(session=session_key):
+            response = await self._process_message(msg, session_key=session_key, on_progress=on_progress)
         return response.content if response else ""
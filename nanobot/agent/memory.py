@@ -9,7 +9,8 @@ from typing import TYPE_CHECKING
 
 from loguru import logger
 
-from nanobot.utils.helpers import ensure_dir
+from nanobot.usage.ledger import usage_context
+from nanobot.utils.helpers import ensure_dir, file_lock
 
 if TYPE_CHECKING:
     from nanobot.providers.base import LLMProvider
@@ -117,10 +118,11 @@ class MemoryStore:
         return ""
 
     def write_long_term(self, content: str) -> None:
-        self.memory_file.write_text(content, encoding="utf-8")
+        with file_lock(self.memory_file):
+            self.memory_file.write_text(content, encoding="utf-8")
 
     def append_history(self, entry: str) -> None:
-        with open(self.history_file, "a", encoding="utf-8") as f:
+        with file_lock(self.history_file), open(self.history_file, "a", encoding="utf-8") as f:
             f.write(entry.rstrip() + "\n\n")
 
     def get_memory_context(self) -> str:
@@ -145,7 +147,7 @@ class MemoryStore:
         lines = [f"\n## {timestamp}\n"]
         for c in candidates:
             lines.append(f"- {c}")
-        with open(self.kaizen_file, "a", encoding="utf-8") as f:
+        with file_lock(self.kaizen_file), open(self.kaizen_file, "a", encoding="utf-8") as f:
             f.write("\n".join(lines) + "\n")
 
     def should_run_kaizen_review(self, interval_days: int) -> bool:
@@ -291,9 +293,13 @@ class MemoryStore:
         *,
         archive_all: bool = False,
         memory_window: int = 50,
+        keep_count: int | None = None,
     ) -> bool:
         """Consolidate old messages into MEMORY.md + HISTORY.md via LLM tool call.
 
+        keep_count overrides how many recent messages stay unconsolidated
+        (default: half the memory window).
+
         Returns True on success (including no-op), False on failure.
         """
         if archive_all:
@@ -301,12 +307,13 @@ class MemoryStore:
             keep_count = 0
             logger.info("Memory consolidation (archive_all): {} messages", len(session.messages))
         else:
-            keep_count = memory_window // 2
+            if keep_count is None:
+                keep_count = memory_window // 2
             if len(session.messages) <= keep_count:
                 return True
             if len(session.messages) - session.last_consolidated <= 0:
                 return True
-            old_messages = session.messages[session.last_consolidated:-keep_count]
+            old_messages = session.messages[session.last_consolidated:len(session.messages) - keep_count]
             if not old_messages:
                 return True
             logger.info("Memory consolidation: {} to consolidate, {} keep", len(old_messages), keep_count)
@@ -363,7 +370,8 @@ class MemoryStore:
             logger.info("Memory consolidation done: {} messages, last_consolidated={}", len(session.messages), session.last_consolidated)
 
             if not archive_all and lines:
-                await self.kaizen_scan(provider, model, lines)
+                with usage_context(site="kaizen"):
+                    await self.kaizen_scan(provider, model, lines)
 
             return True
         except Exception:
@@ -4,24 +4,97 @@ import json
 import os
 import re
 import shutil
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
 
+from nanobot.utils.helpers import file_signature
+
 # Default builtin skills directory (relative to this file)
 BUILTIN_SKILLS_DIR = Path(__file__).parent.parent / "skills"
 
 
+@dataclass
+class _SkillEntry:
+    """A parsed SKILL.md, kept until the file's stat signature changes."""
+
+    name: str
+    path: Path
+    source: str
+    signature: tuple[int, int] | None
+    content: str
+    frontmatter: dict | None
+    meta: dict = field(default_factory=dict)  # nanobot/openclaw metadata
+
+
 class SkillsLoader:
     """
     Loader for agent skills.
 
     Skills are markdown files (SKILL.md) that teach the agent how to use
     specific tools or perform certain tasks.
+
+    Each SKILL.md is parsed once into an index. The skill directories are
+    rescanned when their mtime changes, and a file is re-parsed when its own
+    mtime or size changes. Binary lookups for requirements are cached for
+    WHICH_TTL_S seconds.
     """
 
+    WHICH_TTL_S = 60.0
+
     def __init__(self, workspace: Path, builtin_skills_dir: Path | None = None):
         self.workspace = workspace
         self.workspace_skills = workspace / "skills"
         self.builtin_skills = builtin_skills_dir or BUILTIN_SKILLS_DIR
+        self._index: dict[str, _SkillEntry] = {}
+        self._dirs_signature: tuple | None = None
+        self._which_cache: dict[str, tuple[float, bool]] = {}
+
+    def _skill_dirs(self) -> list[tuple[Path, str]]:
+        dirs = [(self.workspace_skills, "workspace")]
+        if self.builtin_skills:
+            dirs.append((self.builtin_skills, "builtin"))
+        return dirs
+
+    def _refresh(self) -> dict[str, _SkillEntry]:
+        """Bring the index up to date and return it (workspace skills shadow built-in ones)."""
+        dirs = self._skill_dirs()
+        signature = tuple(file_signature(d) for d, _ in dirs)
+        if signature != self._dirs_signature:
+            self._dirs_signature = signature
+            found: dict[str, tuple[Path, str]] = {}
+            for skills_dir, source in dirs:
+                if not skills_dir.exists():
+                    continue
+                for skill_dir in skills_dir.iterdir():
+                    skill_file = skill_dir / "SKILL.md"
+                    if skill_dir.name not in found and skill_dir.is_dir() and skill_file.exists():
+                        found[skill_dir.name] = (skill_file, source)
+            old = self._index
+            self._index = {}
+            for name, (path, source) in found.items():
+                entry = old.get(name)
+                self._index[name] = entry if entry and entry.path == path else self._parse(name, path, source)
+
+        for name, entry in list(self._index.items()):
+            current = file_signature(entry.path)
+            if current is None:
+                del self._index[name]
+                self._dirs_signature = None  # a skill vanished; rescan next time
+            elif current != entry.signature:
+                self._index[name] = self._parse(name, entry.path, entry.source)
+        return self._index
+
+    def _parse(self, name: str, path: Path, source: str) -> _SkillEntry:
+        signature = file_signature(path)
+        content = path.read_text(encoding="utf-8")
+        frontmatter = self._parse_frontmatter(content)
+        meta = self._parse_nanobot_metadata((frontmatter or {}).get("metadata", ""))
+        return _SkillEntry(name, path, source, signature, content, frontmatter, meta)
+
+    def fingerprint(self) -> tuple:
+        """Change token for skill files: the stat signature of every SKILL.md (no file reads)."""
+        return tuple((str(e.path), e.signature) for e in self._refresh().values())
 
     def list_skills(self, filter_unavailable: bool = True) -> list[dict[str, str]]:
         """
@@ -33,28 +106,11 @@ class SkillsLoader:
         Returns:
             List of skill info dicts with 'name', 'path', 'source'.
         """
-        skills = []
-
-        # Workspace skills (highest priority)
-        if self.workspace_skills.exists():
-            for skill_dir in self.workspace_skills.iterdir():
-                if skill_dir.is_dir():
-                    skill_file = skill_dir / "SKILL.md"
-                    if skill_file.exists():
-                        skills.append({"name": skill_dir.name, "path": str(skill_file), "source": "workspace"})
-
-        # Built-in skills
-        if self.builtin_skills and self.builtin_skills.exists():
-            for skill_dir in self.builtin_skills.iterdir():
-                if skill_dir.is_dir():
-                    skill_file = skill_dir / "SKILL.md"
-                    if skill_file.exists() and not any(s["name"] == skill_dir.name for s in skills):
-                        skills.append({"name": skill_dir.name, "path": str(skill_file), "source": "builtin"})
-
-        # Filter by requirements
-        if filter_unavailable:
-            return [s for s in skills if self._check_requirements(self._get_skill_meta(s["name"]))]
-        return skills
+        return [
+            {"name": e.name, "path": str(e.path), "source": e.source}
+            for e in self._refresh().values()
+            if not filter_unavailable or self._check_requirements(e.meta)
+        ]
 
     def load_skill(self, name: str) -> str | None:
         """
@@ -66,18 +122,8 @@ class SkillsLoader:
         Returns:
             Skill content or None if not found.
         """
-        # Check workspace first
-        workspace_skill = self.workspace_skills / name / "SKILL.md"
-        if workspace_skill.exists():
-            return workspace_skill.read_text(encoding="utf-8")
-
-        # Check built-in
-        if self.builtin_skills:
-            builtin_skill = self.builtin_skills / name / "SKILL.md"
-            if builtin_skill.exists():
-                return builtin_skill.read_text(encoding="utf-8")
-
-        return None
+        entry = self._refresh().get(name)
+        return entry.content if entry else None
 
     def load_skills_for_context(self, skill_names: list[str]) -> str:
         """
@@ -89,11 +135,12 @@ class SkillsLoader:
         Returns:
             Formatted skills content.
         """
+        index = self._refresh()
         parts = []
         for name in skill_names:
-            content = self.load_skill(name)
-            if content:
-                content = self._strip_frontmatter(content)
+            entry = index.get(name)
+            if entry and entry.content:
+                content = self._strip_frontmatter(entry.content)
                 parts.append(f"### Skill: {name}\n\n{content}")
 
         return "\n\n---\n\n".join(parts) if parts else ""
@@ -108,29 +155,27 @@ class SkillsLoader:
         Returns:
             XML-formatted skills summary.
         """
-        all_skills = self.list_skills(filter_unavailable=False)
-        if not all_skills:
+        entries = list(self._refresh().values())
+        if not entries:
             return ""
 
         def escape_xml(s: str) -> str:
             return s.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
 
         lines = ["<skills>"]
-        for s in all_skills:
-            name = escape_xml(s["name"])
-            path = s["path"]
-            desc = escape_xml(self._get_skill_description(s["name"]))
-            skill_meta = self._get_skill_meta(s["name"])
-            available = self._check_requirements(skill_meta)
+        for e in entries:
+            name = escape_xml(e.name)
+            desc = escape_xml(self._get_skill_description(e))
+            available = self._check_requirements(e.meta)
 
             lines.append(f"  <skill available=\"{str(available).lower()}\">")
             lines.append(f"    <name>{name}</name>")
             lines.append(f"    <description>{desc}</description>")
-            lines.append(f"    <location>{path}</location>")
+            lines.append(f"    <location>{e.path}</location>")
 
             # Show missing requirements for unavailable skills
             if not available:
-                missing = self._get_missing_requirements(skill_meta)
+                missing = self._get_missing_requirements(e.meta)
                 if missing:
                     lines.append(f"    <requires>{escape_xml(missing)}</requires>")
 
@@ -139,24 +184,33 @@ class SkillsLoader:
 
         return "\n".join(lines)
 
+    def _which(self, binary: str) -> bool:
+        """shutil.which, cached for WHICH_TTL_S so prompt builds do not walk PATH every turn."""
+        now = time.monotonic()
+        hit = self._which_cache.get(binary)
+        if hit and now - hit[0] < self.WHICH_TTL_S:
+            return hit[1]
+        found = shutil.which(binary) is not None
+        self._which_cache[binary] = (now, found)
+        return found
+
     def _get_missing_requirements(self, skill_meta: dict) -> str:
         """Get a description of missing requirements."""
         missing = []
         requires = skill_meta.get("requires", {})
         for b in requires.get("bins", []):
-            if not shutil.which(b):
+            if not self._which(b):
                 missing.append(f"CLI: {b}")
         for env in requires.get("env", []):
             if not os.environ.get(env):
                 missing.append(f"ENV: {env}")
         return ", ".join(missing)
 
-    def _get_skill_description(self, name: str) -> str:
+    def _get_skill_description(self, entry: _SkillEntry) -> str:
         """Get the description of a skill from its frontmatter."""
-        meta = self.get_skill_metadata(name)
-        if meta and meta.get("description"):
-            return meta["description"]
-        return name  # Fallback to skill name
+        if entry.frontmatter and entry.frontmatter.get("description"):
+            return entry.frontmatter["description"]
+        return entry.name  # Fallback to skill name
 
     def _strip_frontmatter(self, content: str) -> str:
         """Remove YAML frontmatter from markdown content."""
@@ -178,27 +232,19 @@ class SkillsLoader:
         """Check if skill requirements are met (bins, env vars)."""
         requires = skill_meta.get("requires", {})
         for b in requires.get("bins", []):
-            if not shutil.which(b):
+            if not self._which(b):
                 return False
         for env in requires.get("env", []):
             if not os.environ.get(env):
                 return False
         return True
 
-    def _get_skill_meta(self, name: str) -> dict:
-        """Get nanobot metadata for a skill (cached in frontmatter)."""
-        meta = self.get_skill_metadata(name) or {}
-        return self._parse_nanobot_metadata(meta.get("metadata", ""))
-
     def get_always_skills(self) -> list[str]:
         """Get skills marked as always=true that meet requirements."""
-        result = []
-        for s in self.list_skills(filter_unavailable=True):
-            meta = self.get_skill_metadata(s["name"]) or {}
-            skill_meta = self._parse_nanobot_metadata(meta.get("metadata", ""))
-            if skill_meta.get("always") or meta.get("always"):
-                result.append(s["name"])
-        return result
+        return [
+            e.name for e in self._refresh().values()
+            if self._check_requirements(e.meta) and (e.meta.get("always") or (e.frontmatter or {}).get("always"))
+        ]
 
     def get_skill_metadata(self, name: str) -> dict | None:
         """
@@ -210,10 +256,11 @@ class SkillsLoader:
         Returns:
             Metadata dict or None.
         """
-        content = self.load_skill(name)
-        if not content:
-            return None
+        entry = self._refresh().get(name)
+        return entry.frontmatter if entry else None
 
+    @staticmethod
+    def _parse_frontmatter(content: str) -> dict | None:
         if content.startswith("---"):
             match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
             if match:
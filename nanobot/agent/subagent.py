@@ -16,6 +16,8 @@ from nanobot.agent.tools.web import WebFetchTool, WebSearchTool
 from nanobot.bus.events import InboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.providers.base import LLMProvider
+from nanobot.providers.ratelimit import Priority, llm_priority
+from nanobot.usage.ledger import usage_context
 
 if TYPE_CHECKING:
     from nanobot.config.schema import ExecToolConfig
@@ -38,6 +40,7 @@ class SubagentManager:
         restrict_to_workspace: bool = False,
         cron_service: "CronService | None" = None,
         mcp_servers: dict | None = None,
+        max_parallel_tools: int = 4,
     ):
         from nanobot.config.schema import ExecToolConfig
         self.provider = provider
@@ -51,6 +54,7 @@ class SubagentManager:
         self.restrict_to_workspace = restrict_to_workspace
         self.cron_service = cron_service
         self.mcp_servers = mcp_servers or {}
+        self.max_parallel_tools = max_parallel_tools
         self._running_tasks: dict[str, asyncio.Task[None]] = {}
         self._session_tasks: dict[str, set[str]] = {}  # session_key -> {task_id, ...}
 
@@ -67,9 +71,10 @@ class SubagentManager:
         display_label = label or task[:30] + ("..." if len(task) > 30 else "")
         origin = {"channel": origin_channel, "chat_id": origin_chat_id}
 
-        bg_task = asyncio.create_task(
-            self._run_subagent(task_id, task, display_label, origin)
-        )
+        with llm_priority(Priority.SUBAGENT), usage_context(site="subagent"):
+            bg_task = asyncio.create_task(
+                self._run_subagent(task_id, task, display_label, origin)
+            )
         self._running_tasks[task_id] = bg_task
         if session_key:
             self._session_tasks.setdefault(session_key, set()).add(task_id)
@@ -101,7 +106,7 @@ class SubagentManager:
             await mcp_stack.__aenter__()
 
             # Build subagent tools (no message tool, no spawn tool)
-            tools = ToolRegistry()
+            tools = ToolRegistry(max_concurrency=self.max_parallel_tools)
             allowed_dir = self.workspace if self.restrict_to_workspace else None
             tools.register(ReadFileTool(workspace=self.workspace, allowed_dir=allowed_dir))
             tools.register(WriteFileTool(workspace=self.workspace, allowed_dir=allowed_dir))
@@ -175,7 +180,10 @@ class SubagentManager:
                     for tool_call in response.tool_calls:
                         args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
                         logger.debug("Subagent [{}] executing: {} with arguments: {}", task_id, tool_call.name, args_str)
-                        result = await tools.execute(tool_call.name, tool_call.arguments)
+                    results = await tools.execute_batch(
+                        [(tc.name, tc.arguments) for tc in response.tool_calls]
+                    )
+                    for tool_call, result in zip(response.tool_calls, results):
                         messages.append({
                             "role": "tool",
                             "tool_call_id": tool_call.id,
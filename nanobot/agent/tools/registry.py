@@ -1,8 +1,11 @@
 """Tool registry for dynamic tool management."""
 
+import asyncio
+import time
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
+from nanobot.metrics.registry import TOOL_ERRORS, TOOL_SECONDS
 
 
 class ToolRegistry:
@@ -12,8 +15,9 @@ class ToolRegistry:
     Allows dynamic registration and execution of tools.
     """
 
-    def __init__(self):
+    def __init__(self, max_concurrency: int = 1):
         self._tools: dict[str, Tool] = {}
+        self.max_concurrency = max(1, max_concurrency)
 
     def register(self, tool: Tool) -> None:
         """Register a tool."""
@@ -37,6 +41,16 @@ class ToolRegistry:
 
     async def execute(self, name: str, params: dict[str, Any]) -> str:
         """Execute a tool by name with given parameters."""
+        if name not in self._tools:
+            return await self._execute(name, params)
+        started = time.monotonic()
+        result = await self._execute(name, params)
+        TOOL_SECONDS.observe(time.monotonic() - started, tool=name)
+        if isinstance(result, str) and result.startswith("Error"):
+            TOOL_ERRORS.inc(tool=name)
+        return result
+
+    async def _execute(self, name: str, params: dict[str, Any]) -> str:
         _hint = "\n\n[Analyze the error above and try a different approach.]"
 
         tool = self._tools.get(name)
@@ -54,6 +68,38 @@ class ToolRegistry:
         except Exception as e:
             return f"Error executing {name}: {str(e)}" + _hint
 
+    def is_read_only(self, name: str) -> bool:
+        """Check if a registered tool is safe to run concurrently with other read-only tools."""
+        tool = self._tools.get(name)
+        return bool(tool and tool.read_only)
+
+    async def execute_batch(self, calls: list[tuple[str, dict[str, Any]]]) -> list[str]:
+        """
+        Execute several tool calls, returning results in the order of ``calls``.
+
+        Consecutive read-only calls run together (at most ``max_concurrency`` at a
+        time); any mutating call runs alone, so side effects keep their order.
+        """
+        results: list[str] = [""] * len(calls)
+        sem = asyncio.Semaphore(self.max_concurrency)
+
+        async def _run(i: int) -> None:
+            async with sem:
+                results[i] = await self.execute(*calls[i])
+
+        i = 0
+        while i < len(calls):
+            j = i
+            while self.max_concurrency > 1 and j < len(calls) and self.is_read_only(calls[j][0]):
+                j += 1
+            if j - i > 1:
+                await asyncio.gather(*(_run(k) for k in range(i, j)))
+                i = j
+            else:
+                results[i] = await self.execute(*calls[i])
+                i += 1
+        return results
+
     @property
     def tool_names(self) -> list[str]:
         """Get list of registered tool names."""
@@ -9,10 +9,11 @@ from pathlib import Path
 from typing import TYPE_CHECKING, Any
 from urllib.parse import urlparse
 
-import httpx
 from loguru import logger
 
 from nanobot.agent.tools.base import Tool
+from nanobot.net import HTTP_CLIENTS
+from nanobot.usage.ledger import usage_context
 
 if TYPE_CHECKING:
     from nanobot.providers.base import LLMProvider
@@ -28,7 +29,6 @@ _MIME_TYPES: dict[str, str] = {
 }
 
 MAX_IMAGE_BYTES = 20 * 1024 * 1024  # 20 MB
-MAX_REDIRECTS = 5
 
 
 def _is_url(value: str) -> bool:
@@ -54,10 +54,9 @@ async def _load_image_as_data_url(source: str) -> tuple[str, str]:
     Raises ValueError on unsupported source or oversized image.
     """
     if _is_url(source):
-        async with httpx.AsyncClient(follow_redirects=True, max_redirects=MAX_REDIRECTS, timeout=30.0) as client:
-            r = await client.get(source)
-            r.raise_for_status()
-            raw = r.content
+        r = await HTTP_CLIENTS.get(source).get(source, follow_redirects=True, timeout=30.0)
+        r.raise_for_status()
+        raw = r.content
         ctype = r.headers.get("content-type", "").split(";")[0].strip()
         mime = ctype if ctype.startswith("image/") else _mime_from_url(source)
     else:
@@ -88,6 +87,7 @@ class VisionTool(Tool):
     """
 
     name = "analyze_image"
+    read_only = True
     description = (
         "Analyze an image from a URL or local file path. "
         "Returns a description of the image contents or answers a specific question about it."
@@ -178,7 +178,8 @@ class VisionTool(Tool):
 
         model = self.vision_model or None  # None → provider uses its default
         try:
-            response = await self.provider.chat(messages=messages, model=model)
+            with usage_context(site="vision"):
+                response = await self.provider.chat(messages=messages, model=model)
             return response.content or "No response from vision model."
         except Exception as exc:
             return json.dumps({"error": f"Vision LLM call failed: {exc}"}, ensure_ascii=False)
@@ -7,13 +7,12 @@ import re
 from typing import Any
 from urllib.parse import urlparse
 
-import httpx
-
 from nanobot.agent.tools.base import Tool
+from nanobot.net import HTTP_CLIENTS
 
 # Shared constants
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_7_2) AppleWebKit/537.36"
-MAX_REDIRECTS = 5  # Limit redirects to prevent DoS attacks
+BRAVE_SEARCH_URL = "https://api.search.brave.com/res/v1/web/search"
 
 
 def _strip_tags(text: str) -> str:
@@ -48,6 +47,7 @@ class WebSearchTool(Tool):
 
     name = "web_search"
     description = "Search the web. Returns titles, URLs, and snippets."
+    read_only = True
     parameters = {
         "type": "object",
         "properties": {
@@ -76,14 +76,13 @@ class WebSearchTool(Tool):
 
         try:
             n = min(max(count or self.max_results, 1), 10)
-            async with httpx.AsyncClient() as client:
-                r = await client.get(
-                    "https://api.search.brave.com/res/v1/web/search",
-                    params={"q": query, "count": n},
-                    headers={"Accept": "application/json", "X-Subscription-Token": self.api_key},
-                    timeout=10.0
-                )
-                r.raise_for_status()
+            r = await HTTP_CLIENTS.get(BRAVE_SEARCH_URL).get(
+                BRAVE_SEARCH_URL,
+                params={"q": query, "count": n},
+                headers={"Accept": "application/json", "X-Subscription-Token": self.api_key},
+                timeout=10.0
+            )
+            r.raise_for_status()
 
             results = r.json().get("web", {}).get("results", [])
             if not results:
@@ -104,6 +103,7 @@ class WebFetchTool(Tool):
 
     name = "web_fetch"
     description = "Fetch URL and extract readable content (HTML → markdown/text)."
+    read_only = True
     parameters = {
         "type": "object",
         "properties": {
@@ -128,13 +128,10 @@ class WebFetchTool(Tool):
             return json.dumps({"error": f"URL validation failed: {error_msg}", "url": url}, ensure_ascii=False)
 
         try:
-            async with httpx.AsyncClient(
-                follow_redirects=True,
-                max_redirects=MAX_REDIRECTS,
-                timeout=30.0
-            ) as client:
-                r = await client.get(url, headers={"User-Agent": USER_AGENT})
-                r.raise_for_status()
+            r = await HTTP_CLIENTS.get(url).get(
+                url, headers={"User-Agent": USER_AGENT}, follow_redirects=True, timeout=30.0
+            )
+            r.raise_for_status()
 
             ctype = r.headers.get("content-type", "")
 
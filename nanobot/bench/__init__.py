@@ -0,0 +1,5 @@
+"""Benchmark harness for the agent loop."""
+
+from nanobot.bench.harness import BenchResult, percentile, run_bench
+
+__all__ = ["BenchResult", "percentile", "run_bench"]
@@ -0,0 +1,161 @@
+"""Drive synthetic chat sessions through the bus and an AgentLoop, and measure where the time goes."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.metrics.registry import (
+    LLM_REQUEST_SECONDS,
+    QUEUE_WAIT_SECONDS,
+    TOOL_SECONDS,
+    TURN_SECONDS,
+)
+
+# Histograms whose growth over a run gives the time spent in each stage.
+_STAGE_HISTOGRAMS = {
+    "queue": QUEUE_WAIT_SECONDS,
+    "llm": LLM_REQUEST_SECONDS,
+    "tools": TOOL_SECONDS,
+    "turn": TURN_SECONDS,
+}
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of ``samples``; 0 when empty."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+@dataclass
+class BenchResult:
+    """Outcome of one benchmark run. Stage times are summed over all turns, in seconds."""
+
+    sessions: int
+    elapsed_s: float
+    latencies: list[float] = field(default_factory=list)
+    stages: dict[str, float] = field(default_factory=dict)
+    llm_calls: int = 0
+    timeouts: int = 0
+
+    @property
+    def turns(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def throughput(self) -> float:
+        """Completed turns per second."""
+        return self.turns / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    def percentile(self, q: float) -> float:
+        return percentile(self.latencies, q)
+
+    def stage_breakdown(self) -> dict[str, float]:
+        """Mean seconds per turn in each stage; ``agent`` is turn time not spent in the LLM, tools or session I/O."""
+        if not self.turns:
+            return {}
+        per_turn = {k: v / self.turns for k, v in self.stages.items()}
+        turn = per_turn.pop("turn", 0.0)
+        per_turn["agent"] = max(0.0, turn - per_turn.get("llm", 0.0) - per_turn.get("tools", 0.0)
+                                - per_turn.get("session_io", 0.0))
+        return per_turn
+
+
+class _Timer:
+    """Accumulates time spent in wrapped callables."""
+
+    def __init__(self):
+        self.seconds = 0.0
+
+    def wrap(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.seconds += time.perf_counter() - started
+        return timed
+
+
+def _is_final(msg: OutboundMessage) -> bool:
+    return not (msg.metadata.get("_progress") or msg.metadata.get("_stream"))
+
+
+async def run_bench(
+    agent: Any,
+    bus: MessageBus,
+    sessions: int = 10,
+    turns: int = 5,
+    prompts: list[str] | None = None,
+    turn_timeout_s: float = 60.0,
+    channel: str = "bench",
+) -> BenchResult:
+    """
+    Run ``sessions`` concurrent chats of ``turns`` messages each through ``bus`` and ``agent``.
+
+    Each chat sends its next message once the previous reply has arrived.
+    Messages cycle through ``prompts``. ``agent`` is an AgentLoop that is
+    not running yet; it is started and stopped here.
+    """
+    prompts = prompts or ["Hello, what can you do?"]
+    waiting: dict[str, asyncio.Future[OutboundMessage]] = {}
+
+    async def collect() -> None:
+        while True:
+            msg = await bus.consume_outbound()
+            bus.outbound_done(msg)
+            fut = waiting.get(msg.chat_id)
+            if fut is not None and not fut.done() and _is_final(msg):
+                fut.set_result(msg)
+
+    session_timer = _Timer()
+    sessions_manager = agent.sessions
+    sessions_manager.get_or_create = session_timer.wrap(sessions_manager.get_or_create)
+    sessions_manager.save = session_timer.wrap(sessions_manager.save)
+
+    result = BenchResult(sessions=sessions, elapsed_s=0.0)
+    calls_before = getattr(agent.provider, "calls", 0)
+
+    async def chat(index: int) -> None:
+        chat_id = f"bench-{index}"
+        for turn in range(turns):
+            fut: asyncio.Future[OutboundMessage] = asyncio.get_running_loop().create_future()
+            waiting[chat_id] = fut
+            started = time.perf_counter()
+            await bus.publish_inbound(InboundMessage(
+                channel=channel, sender_id=f"user-{index}", chat_id=chat_id,
+                content=prompts[(index * turns + turn) % len(prompts)],
+            ))
+            try:
+                await asyncio.wait_for(fut, turn_timeout_s)
+            except asyncio.TimeoutError:
+                result.timeouts += 1
+                continue
+            result.latencies.append(time.perf_counter() - started)
+
+    before = {name: hist.total()[0] for name, hist in _STAGE_HISTOGRAMS.items()}
+    collector = asyncio.create_task(collect())
+    agent_task = asyncio.create_task(agent.run())
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(chat(i) for i in range(sessions)))
+    finally:
+        result.elapsed_s = time.perf_counter() - started
+        agent.stop()
+        for task in (agent_task, collector):
+            task.cancel()
+        await asyncio.gather(agent_task, collector, return_exceptions=True)
+
+    result.stages = {name: hist.total()[0] - before[name] for name, hist in _STAGE_HISTOGRAMS.items()}
+    result.stages["session_io"] = session_timer.seconds
+    result.llm_calls = getattr(agent.provider, "calls", 0) - calls_before
+    return result
@@ -0,0 +1,94 @@
+"""Microbenchmark of LiteLLMProvider request building over long histories (no API calls)."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from nanobot.providers.base import LLMProvider
+from nanobot.providers.litellm_provider import LiteLLMProvider
+
+
+@dataclass
+class RequestBuildResult:
+    """Mean seconds to build one request, from scratch and with the per-list cache."""
+
+    history: int
+    iterations: int
+    full_s: float
+    incremental_s: float
+
+    @property
+    def speedup(self) -> float:
+        return self.full_s / self.incremental_s if self.incremental_s > 0 else 0.0
+
+
+def synthetic_history(size: int) -> list[dict[str, Any]]:
+    """A system prompt followed by ``size - 1`` user, assistant and tool messages."""
+    messages: list[dict[str, Any]] = [{"role": "system", "content": "You are nanobot. " * 200}]
+    while len(messages) < size:
+        i = len(messages)
+        messages.append({"role": "user", "content": f"question {i} " * 20, "timestamp": "2026-01-01T00:00:00"})
+        messages.append({
+            "role": "assistant", "content": "",
+            "tool_calls": [{"id": f"call_{i}", "type": "function",
+                            "function": {"name": "read_file", "arguments": '{"path": "notes.md"}'}}],
+            "reasoning_content": "thinking " * 10,
+        })
+        messages.append({"role": "tool", "tool_call_id": f"call_{i}", "name": "read_file", "content": "x" * 2000})
+    return messages[:size]
+
+
+def _full_build(provider: LiteLLMProvider, messages: list[dict[str, Any]], model: str) -> dict[str, Any]:
+    """Request building as it was before the per-list cache: every message and lookup, every call."""
+    resolved = provider._resolve_model(model)
+    if provider._supports_cache_control(model):
+        messages, _ = provider._apply_cache_control(messages, None)
+    kwargs = {
+        "model": resolved,
+        "messages": [provider._sanitize_message(m) for m in LLMProvider._sanitize_empty_content(messages)],
+    }
+    provider._apply_model_overrides(resolved, kwargs)
+    return kwargs
+
+
+def run_request_bench(
+    history: int = 200, iterations: int = 10, repeats: int = 50, model: str = "anthropic/claude-opus-4-5",
+) -> RequestBuildResult:
+    """
+    Time ``iterations`` agent-loop steps over a ``history``-message list.
+
+    Each step appends an assistant tool call and its result, then builds the
+    next request. ``repeats`` independent turns are averaged.
+    """
+    provider = LiteLLMProvider(default_model=model)
+    full = incremental = 0.0
+    for _ in range(repeats):
+        for build in ("full", "incremental"):
+            messages = synthetic_history(history)
+            for step in range(iterations):
+                started = time.perf_counter()
+                if build == "full":
+                    _full_build(provider, messages, model)
+                else:
+                    provider._build_kwargs(messages, None, model, 4096, 0.7)
+                elapsed = time.perf_counter() - started
+                if build == "full":
+                    full += elapsed
+                else:
+                    incremental += elapsed
+                messages.append({"role": "assistant", "content": None, "tool_calls": [
+                    {"id": f"step_{step}", "type": "function", "function": {"name": "exec", "arguments": "{}"}}]})
+                messages.append({"role": "tool", "tool_call_id": f"step_{step}", "name": "exec", "content": "ok"})
+    calls = repeats * iterations
+    return RequestBuildResult(history, iterations, full / calls, incremental / calls)
+
+
+if __name__ == "__main__":
+    for size in (20, 200, 1000):
+        result = run_request_bench(history=size)
+        print(
+            f"{size:>5} messages: full {result.full_s * 1e6:8.1f} us, "
+            f"incremental {result.incremental_s * 1e6:8.1f} us ({result.speedup:.1f}x)"
+        )
@@ -1,6 +1,6 @@
 """Event types for the message bus."""
 
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from typing import Any
 
@@ -23,6 +23,14 @@ class InboundMessage:
         """Unique key for session identification."""
         return self.session_key_override or f"{self.channel}:{self.chat_id}"
 
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable form (for the journal and worker transport)."""
+        return {**asdict(self), "timestamp": self.timestamp.isoformat()}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "InboundMessage":
+        return cls(**{**data, "timestamp": datetime.fromisoformat(data["timestamp"])})
+
 
 @dataclass
 class OutboundMessage:
@@ -35,4 +43,10 @@ class OutboundMessage:
     media: list[str] = field(default_factory=list)
     metadata: dict[str, Any] = field(default_factory=dict)
 
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable form (for the journal and worker transport)."""
+        return asdict(self)
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "OutboundMessage":
+        return cls(**data)
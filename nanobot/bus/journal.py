@@ -0,0 +1,130 @@
+"""Write-ahead journal that lets the bus survive gateway restarts."""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from nanobot.bus.events import InboundMessage, OutboundMessage
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS inbound (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    acked_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_inbound_acked_at ON inbound (acked_at);
+CREATE TABLE IF NOT EXISTS outbound (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+# Metadata keys the bus uses to carry journal ids along with a message.
+INBOUND_IDS = "_journal"  # list: a coalesced turn covers several inbound entries
+OUTBOUND_ID = "_journal_out"
+
+
+def _encode(msg: InboundMessage | OutboundMessage) -> str:
+    return json.dumps(msg.to_dict(), ensure_ascii=False, default=str)
+
+
+class MessageJournal:
+    """
+    SQLite (WAL) journal of inbound and outbound bus messages.
+
+    An inbound entry stays pending until its turn is done, which happens
+    atomically with recording the turn's reply. An outbound entry stays
+    until the channel has sent it (or ``keep_acked_s`` passes). Pending
+    entries are replayed on startup.
+    Inbound ids double as idempotency keys: a message a channel redelivers
+    after a restart (same channel, chat and message id) is recognised and
+    not processed twice. Acked inbound ids are kept for ``keep_acked_s``.
+    """
+
+    def __init__(self, path: Path, keep_acked_s: float = 86400.0):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        cutoff = time.time() - keep_acked_s
+        with self._conn:
+            self._conn.execute("DELETE FROM inbound WHERE acked_at IS NOT NULL AND acked_at < ?", (cutoff,))
+            self._conn.execute("DELETE FROM outbound WHERE created_at < ?", (cutoff,))  # undeliverable
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def inbound_key(msg: InboundMessage) -> str:
+        """Idempotency key: the platform message id when the channel provides one."""
+        message_id = msg.metadata.get("message_id")
+        if message_id is None:
+            return uuid.uuid4().hex
+        return f"{msg.channel}:{msg.chat_id}:{message_id}"
+
+    def record_inbound(self, msg: InboundMessage) -> str | None:
+        """Journal an inbound message. Returns its id, or None if it was seen before."""
+        key = self.inbound_key(msg)
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO inbound (id, data, created_at) VALUES (?, ?, ?)",
+                (key, _encode(msg), time.time()),
+            )
+        return key if cur.rowcount else None
+
+    def ack_inbound(self, ids: list[str]) -> None:
+        if not ids:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE inbound SET acked_at = ? WHERE id = ? AND acked_at IS NULL",
+                [(time.time(), i) for i in ids],
+            )
+
+    def record_outbound(self, msg: OutboundMessage, acks: list[str]) -> str:
+        """Journal an outbound message and, in the same transaction, ack the inbound entries it answers."""
+        key = uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO outbound (id, data, created_at) VALUES (?, ?, ?)", (key, _encode(msg), now),
+            )
+            self._conn.executemany(
+                "UPDATE inbound SET acked_at = ? WHERE id = ? AND acked_at IS NULL", [(now, i) for i in acks],
+            )
+        return key
+
+    def ack_outbound(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM outbound WHERE id = ?", (key,))
+
+    def pending_inbound(self) -> list[InboundMessage]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, data FROM inbound WHERE acked_at IS NULL ORDER BY created_at"
+            ).fetchall()
+        messages = []
+        for key, data in rows:
+            msg = InboundMessage.from_dict(json.loads(data))
+            msg.metadata[INBOUND_IDS] = [key]
+            messages.append(msg)
+        return messages
+
+    def pending_outbound(self) -> list[OutboundMessage]:
+        with self._lock:
+            rows = self._conn.execute("SELECT id, data FROM outbound ORDER BY created_at").fetchall()
+        messages = []
+        for key, data in rows:
+            msg = OutboundMessage.from_dict(json.loads(data))
+            msg.metadata[OUTBOUND_ID] = key
+            messages.append(msg)
+        return messages
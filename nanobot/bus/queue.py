@@ -2,7 +2,14 @@
 
 import asyncio
 
+from loguru import logger
+
 from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.journal import INBOUND_IDS, OUTBOUND_ID, MessageJournal
+from nanobot.bus.scheduler import FairScheduler, Lane, lane_of
+from nanobot.metrics.registry import BUS_DROPPED
+
+BUSY_REPLY = "I'm busy right now, please try again shortly."
 
 
 class MessageBus:
@@ -10,24 +17,138 @@ class MessageBus:
     Async message bus that decouples chat channels from the agent core.
 
     Channels push messages to the inbound queue, and the agent processes
-    them and pushes responses to the outbound queue.
+    them and pushes responses to the outbound queue. Inbound messages are
+    scheduled fairly across sessions and optionally coalesced into one turn
+    per burst (see FairScheduler); the consumer must call ``inbound_done``
+    once it has finished a message's turn.
+
+    Both queues can be bounded. A full inbound queue makes channels wait in
+    ``publish_inbound`` (pausing their reads) for up to ``publish_timeout_s``;
+    after that the message is shed with ``busy_reply``. Messages that wait
+    longer than ``inbound_ttl_s`` get the same reply instead of a late answer.
+    A full outbound queue drops progress updates and makes final replies wait.
+
+    With a ``journal``, inbound messages and final outbound replies are
+    written ahead so ``replay_journal`` can restore them after a restart;
+    the channel side calls ``outbound_done`` once a reply has been sent.
     """
 
-    def __init__(self):
-        self.inbound: asyncio.Queue[InboundMessage] = asyncio.Queue()
-        self.outbound: asyncio.Queue[OutboundMessage] = asyncio.Queue()
+    def __init__(
+        self,
+        max_concurrent_turns: int = 0,
+        coalesce_ms: int = 0,
+        inbound_maxsize: int = 0,
+        outbound_maxsize: int = 0,
+        inbound_ttl_s: float = 0.0,
+        publish_timeout_s: float = 5.0,
+        busy_reply: str = BUSY_REPLY,
+        journal: MessageJournal | None = None,
+    ):
+        self.inbound = FairScheduler(
+            max_active=max_concurrent_turns,
+            coalesce_s=coalesce_ms / 1000,
+            maxsize=inbound_maxsize,
+            ttl_s=inbound_ttl_s,
+            on_expired=self._on_expired,
+        )
+        self.outbound: asyncio.Queue[OutboundMessage] = asyncio.Queue(maxsize=outbound_maxsize)
+        self.publish_timeout_s = publish_timeout_s
+        self.busy_reply = busy_reply
+        self.outbound_high_water = 0
+        self.journal = journal
 
     async def publish_inbound(self, msg: InboundMessage) -> None:
-        """Publish a message from a channel to the agent."""
-        await self.inbound.put(msg)
+        """Publish a message from a channel to the agent, shedding it if the queue stays full."""
+        lane = lane_of(msg)
+        if self.journal and lane != Lane.CONTROL and INBOUND_IDS not in msg.metadata:
+            key = self.journal.record_inbound(msg)
+            if key is None:
+                logger.debug("Skipping already journaled message for {}", msg.session_key)
+                return
+            msg.metadata = {**msg.metadata, INBOUND_IDS: [key]}
+        if lane != Lane.INTERACTIVE:
+            await self.inbound.put(msg)
+            return
+        try:
+            await asyncio.wait_for(self.inbound.wait_for_space(), self.publish_timeout_s)
+            self.inbound.put_nowait(msg)
+        except (asyncio.TimeoutError, asyncio.QueueFull):
+            logger.warning("Inbound queue full, shedding message for {}", msg.session_key)
+            BUS_DROPPED.inc(queue="inbound", reason="full")
+            self._reply_busy(msg)
+            self._ack_inbound(msg)
 
     async def consume_inbound(self) -> InboundMessage:
-        """Consume the next inbound message (blocks until available)."""
+        """Consume the next inbound message (blocks until one is dispatchable)."""
         return await self.inbound.get()
 
+    def inbound_done(self, msg: InboundMessage) -> None:
+        """Mark the message's turn finished: ack it and let the session's next message through."""
+        self._ack_inbound(msg)
+        self.inbound.done(msg.session_key)
+
+    def drop_pending(self, session_key: str) -> int:
+        """Discard queued inbound messages for a session. Returns how many were dropped."""
+        dropped = self.inbound.discard(session_key)
+        for msg in dropped:
+            self._ack_inbound(msg)
+        return len(dropped)
+
+    def _ack_inbound(self, msg: InboundMessage) -> None:
+        if self.journal:
+            self.journal.ack_inbound(msg.metadata.get(INBOUND_IDS, []))
+
+    def _on_expired(self, msg: InboundMessage) -> None:
+        logger.warning("Inbound message for {} expired after {}s in queue", msg.session_key, self.inbound.ttl_s)
+        BUS_DROPPED.inc(queue="inbound", reason="expired")
+        self._reply_busy(msg)
+        self._ack_inbound(msg)
+
+    def _reply_busy(self, msg: InboundMessage) -> None:
+        try:
+            self._put_outbound(OutboundMessage(
+                channel=msg.channel, chat_id=msg.chat_id, content=self.busy_reply, metadata=msg.metadata or {},
+            ))
+        except asyncio.QueueFull:
+            BUS_DROPPED.inc(queue="outbound", reason="full")
+
+    def _put_outbound(self, msg: OutboundMessage) -> None:
+        self.outbound.put_nowait(msg)
+        self._journal_outbound(msg)  # after put_nowait: a reply that did not fit is not journaled
+        self.outbound_high_water = max(self.outbound_high_water, self.outbound.qsize())
+
+    def _journal_outbound(self, msg: OutboundMessage) -> None:
+        """Write a final reply ahead (acking the inbound messages it answers); progress is not journaled."""
+        if not self.journal or OUTBOUND_ID in msg.metadata or msg.metadata.get("_progress"):
+            return
+        key = self.journal.record_outbound(msg, acks=msg.metadata.get(INBOUND_IDS, []))
+        msg.metadata = {**msg.metadata, OUTBOUND_ID: key}
+
     async def publish_outbound(self, msg: OutboundMessage) -> None:
-        """Publish a response from the agent to channels."""
+        """Publish a response from the agent to channels (progress updates are dropped when full)."""
+        if self.outbound.full() and msg.metadata.get("_progress"):
+            BUS_DROPPED.inc(queue="outbound", reason="progress")
+            return
+        self._journal_outbound(msg)
         await self.outbound.put(msg)
+        self.outbound_high_water = max(self.outbound_high_water, self.outbound.qsize())
+
+    def outbound_done(self, msg: OutboundMessage) -> None:
+        """Ack a journaled reply once its channel has sent it (or it can never be delivered)."""
+        if self.journal and (key := msg.metadata.get(OUTBOUND_ID)):
+            self.journal.ack_outbound(key)
+
+    async def replay_journal(self) -> tuple[int, int]:
+        """Re-queue journaled messages left over from a previous run. Returns (inbound, outbound) counts."""
+        if not self.journal:
+            return 0, 0
+        inbound = self.journal.pending_inbound()
+        outbound = self.journal.pending_outbound()
+        for msg in inbound:
+            await self.inbound.put(msg)
+        for msg in outbound:
+            await self.outbound.put(msg)
+        return len(inbound), len(outbound)
 
     async def consume_outbound(self) -> OutboundMessage:
         """Consume the next outbound message (blocks until available)."""
@@ -0,0 +1,241 @@
+"""Per-session fair scheduling of inbound messages."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from dataclasses import replace
+from enum import IntEnum
+from typing import Callable
+
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.journal import INBOUND_IDS
+from nanobot.metrics.registry import QUEUE_WAIT_SECONDS
+
+
+class Lane(IntEnum):
+    """Priority lanes, served strictly in this order."""
+
+    CONTROL = 0  # /stop and similar commands; never wait for a turn slot
+    INTERACTIVE = 1  # messages from people
+    SUBAGENT = 2  # subagent result announcements
+    BACKGROUND = 3  # cron and heartbeat
+    KAIZEN = 4  # self-review and other maintenance
+
+
+CONTROL_COMMANDS = frozenset({"/stop"})
+
+
+def lane_of(msg: InboundMessage) -> Lane:
+    """Pick the lane for a message; ``metadata["_lane"]`` overrides the default."""
+    if (lane := msg.metadata.get("_lane")) is not None:
+        return Lane(lane)
+    if msg.content.strip().lower() in CONTROL_COMMANDS:
+        return Lane.CONTROL
+    if msg.channel == "system":
+        return Lane.SUBAGENT if msg.sender_id == "subagent" else Lane.BACKGROUND
+    return Lane.INTERACTIVE
+
+
+def merge_messages(messages: list[InboundMessage]) -> InboundMessage:
+    """Fold a burst of messages from one session into a single turn."""
+    if len(messages) == 1:
+        return messages[0]
+    metadata: dict = {}
+    for m in messages:
+        metadata.update(m.metadata)
+    metadata["_coalesced"] = len(messages)
+    if ids := [i for m in messages for i in m.metadata.get(INBOUND_IDS, [])]:
+        metadata[INBOUND_IDS] = ids
+    return replace(
+        messages[-1],  # latest sender/message id, so replies thread to the last message
+        content="\n".join(m.content for m in messages if m.content),
+        media=[path for m in messages for path in m.media],
+        metadata=metadata,
+        timestamp=messages[0].timestamp,
+    )
+
+
+def _is_command(msg: InboundMessage) -> bool:
+    return msg.content.lstrip().startswith("/")
+
+
+class FairScheduler:
+    """
+    Inbound queue with one sub-queue per session.
+
+    Lanes are served in priority order; within a lane, sessions take turns
+    (round-robin), so one chatty session cannot delay everyone else. A session
+    gets at most one message in flight: its next message stays queued until
+    ``done`` is called for it. ``max_active`` caps how many turns run at once
+    (0 = unlimited). Control messages bypass both limits.
+
+    With ``coalesce_s`` > 0, interactive messages are held until the session
+    has been quiet for that long, and everything queued for the session
+    (up to the next slash command) is merged into one turn.
+
+    ``maxsize`` bounds the number of queued messages (0 = unbounded; control
+    messages are always admitted), and interactive messages older than
+    ``ttl_s`` are dropped and handed to ``on_expired`` instead of dispatched.
+    """
+
+    def __init__(
+        self,
+        max_active: int = 0,
+        coalesce_s: float = 0.0,
+        maxsize: int = 0,
+        ttl_s: float = 0.0,
+        on_expired: Callable[[InboundMessage], None] | None = None,
+    ):
+        self.max_active = max_active
+        self.coalesce_s = coalesce_s
+        self.maxsize = maxsize
+        self.ttl_s = ttl_s
+        self.on_expired = on_expired
+        self.high_water = 0
+        self._space = asyncio.Event()
+        self._last_arrival: dict[str, float] = {}
+        self._next_ready: float | None = None
+        self._lanes: list[OrderedDict[str, deque[tuple[float, InboundMessage]]]] = [
+            OrderedDict() for _ in Lane
+        ]
+        self._active: set[str] = set()
+        self._size = 0
+        self._wakeup = asyncio.Event()
+
+    def full(self) -> bool:
+        return bool(self.maxsize) and self._size >= self.maxsize
+
+    def put_nowait(self, msg: InboundMessage) -> None:
+        """Queue a message; raises asyncio.QueueFull when at maxsize (control messages excepted)."""
+        lane_id = lane_of(msg)
+        if lane_id != Lane.CONTROL and self.full():
+            raise asyncio.QueueFull
+        self._enqueue(lane_id, msg)
+
+    def requeue(self, msg: InboundMessage) -> None:
+        """Queue an already-admitted message again (e.g. after its worker died), even when at maxsize."""
+        self._enqueue(lane_of(msg), msg)
+
+    def _enqueue(self, lane_id: Lane, msg: InboundMessage) -> None:
+        now = time.monotonic()
+        self._lanes[lane_id].setdefault(msg.session_key, deque()).append((now, msg))
+        if lane_id == Lane.INTERACTIVE and self.coalesce_s:
+            self._last_arrival[msg.session_key] = now
+        self._size += 1
+        self.high_water = max(self.high_water, self._size)
+        self._wakeup.set()
+
+    async def put(self, msg: InboundMessage) -> None:
+        """Queue a message, waiting for room if the queue is full."""
+        if lane_of(msg) != Lane.CONTROL:
+            await self.wait_for_space()
+        self.put_nowait(msg)
+
+    async def wait_for_space(self) -> None:
+        while self.full():
+            self._space.clear()
+            await self._space.wait()
+
+    async def get(self) -> InboundMessage:
+        """Wait for the next dispatchable message and mark its session active."""
+        while True:
+            msg = self.get_nowait()
+            if msg is not None:
+                return msg
+            self._wakeup.clear()
+            if self._next_ready is None:
+                await self._wakeup.wait()
+            else:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self._next_ready - time.monotonic())
+                except asyncio.TimeoutError:
+                    pass
+
+    def get_nowait(self) -> InboundMessage | None:
+        now = time.monotonic()
+        self._next_ready = None
+        if self.ttl_s:
+            self._expire(now)
+        for lane_id, lane in enumerate(self._lanes):
+            control = lane_id == Lane.CONTROL
+            if not control and self.max_active and len(self._active) >= self.max_active:
+                return None
+            for key in lane:
+                if not control and key in self._active:
+                    continue
+                if lane_id == Lane.INTERACTIVE and self.coalesce_s:
+                    ready = self._last_arrival.get(key, 0.0) + self.coalesce_s
+                    if ready > now:
+                        self._next_ready = min(ready, self._next_ready or ready)
+                        continue
+                return self._pop(Lane(lane_id), key)
+        return None
+
+    def _pop(self, lane_id: Lane, key: str) -> InboundMessage:
+        lane = self._lanes[lane_id]
+        pending = lane[key]
+        enqueued, msg = pending.popleft()
+        if lane_id == Lane.INTERACTIVE and self.coalesce_s and not _is_command(msg):
+            burst = [msg]
+            while pending and not _is_command(pending[0][1]):
+                burst.append(pending.popleft()[1])
+            self._size -= len(burst) - 1
+            msg = merge_messages(burst)
+        if pending:
+            lane.move_to_end(key)  # round-robin: this session goes to the back
+        else:
+            del lane[key]
+            if lane_id == Lane.INTERACTIVE:
+                self._last_arrival.pop(key, None)
+        self._size -= 1
+        self._space.set()
+        if lane_id != Lane.CONTROL:
+            self._active.add(key)
+        QUEUE_WAIT_SECONDS.observe(time.monotonic() - enqueued, lane=lane_id.name.lower())
+        return msg
+
+    def _expire(self, now: float) -> None:
+        """Drop interactive messages that have waited longer than ttl_s."""
+        lane = self._lanes[Lane.INTERACTIVE]
+        expired: list[InboundMessage] = []
+        for key in list(lane):
+            pending = lane[key]
+            while pending and now - pending[0][0] > self.ttl_s:
+                expired.append(pending.popleft()[1])
+            if not pending:
+                del lane[key]
+                self._last_arrival.pop(key, None)
+        if expired:
+            self._size -= len(expired)
+            self._space.set()
+            for msg in expired:
+                if self.on_expired:
+                    self.on_expired(msg)
+
+    def done(self, session_key: str) -> None:
+        """Mark the session's turn finished so its next message can be dispatched."""
+        if session_key in self._active:
+            self._active.discard(session_key)
+            self._wakeup.set()
+
+    def discard(self, session_key: str) -> list[InboundMessage]:
+        """Drop every queued (not yet dispatched) message for a session and return them."""
+        dropped: list[InboundMessage] = []
+        for lane_id, lane in enumerate(self._lanes):
+            if lane_id != Lane.CONTROL and (pending := lane.pop(session_key, None)):
+                dropped.extend(msg for _, msg in pending)
+        self._last_arrival.pop(session_key, None)
+        self._size -= len(dropped)
+        if dropped:
+            self._space.set()
+        return dropped
+
+    def qsize(self) -> int:
+        return self._size
+
+    @property
+    def active(self) -> int:
+        """Number of sessions with a turn in flight."""
+        return len(self._active)
@@ -0,0 +1,231 @@
+"""Multi-process gateway: agent workers sharded by session key over a Unix socket."""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import hashlib
+import json
+import multiprocessing
+from pathlib import Path
+from typing import Any, Callable
+
+from loguru import logger
+
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.bus.scheduler import Lane, lane_of
+
+# Marks messages that came from the parent, so the worker reports their completion.
+_REMOTE = "_worker_remote"
+
+
+class HashRing:
+    """Consistent hashing of keys onto nodes (adding a node moves only ~1/N of the keys)."""
+
+    def __init__(self, nodes: list[int], replicas: int = 100):
+        self._ring = sorted((self._hash(f"{node}:{i}"), node) for node in nodes for i in range(replicas))
+        self._hashes = [h for h, _ in self._ring]
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+    def node_for(self, key: str) -> int:
+        i = bisect.bisect(self._hashes, self._hash(key)) % len(self._ring)
+        return self._ring[i][1]
+
+
+def shard_key(msg: InboundMessage) -> str:
+    """Key that pins a message to a worker: system messages follow the session they report to."""
+    if msg.channel == "system" and ":" in msg.chat_id:
+        return msg.chat_id
+    return msg.session_key
+
+
+async def _send(writer: asyncio.StreamWriter, frame: dict[str, Any]) -> None:
+    writer.write(json.dumps(frame, ensure_ascii=False, default=str).encode("utf-8") + b"\n")
+    await writer.drain()
+
+
+class WorkerPool:
+    """
+    Parent side: routes inbound messages from the bus to N worker processes.
+
+    Each worker runs its own AgentLoop against a local bus and connects back
+    over a Unix socket. Messages go to the worker that owns ``shard_key(msg)``
+    on a consistent-hash ring, so a session is always handled by the same
+    process. Workers stream outbound messages back and report when a turn is
+    done, which releases the session in the parent's scheduler. A worker that
+    dies is restarted and its unfinished messages are queued again.
+    """
+
+    def __init__(self, bus: MessageBus, socket_path: Path, size: int, target: Callable[..., None], args: tuple = ()):
+        self.bus = bus
+        self.socket_path = socket_path
+        self.size = size
+        self.target = target
+        self.args = args
+        self.ring = HashRing(list(range(size)))
+        self._ctx = multiprocessing.get_context("spawn")
+        self._processes: dict[int, multiprocessing.process.BaseProcess] = {}
+        self._writers: dict[int, asyncio.StreamWriter] = {}
+        self._connected: dict[int, asyncio.Event] = {i: asyncio.Event() for i in range(size)}
+        self._in_flight: dict[int, dict[str, InboundMessage]] = {i: {} for i in range(size)}
+        self._server: asyncio.base_events.Server | None = None
+        self._running = False
+
+    async def start(self) -> None:
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self.socket_path.unlink(missing_ok=True)
+        self._server = await asyncio.start_unix_server(self._handle_worker, path=str(self.socket_path))
+        self._running = True
+        for index in range(self.size):
+            self._spawn(index)
+
+    def _spawn(self, index: int) -> None:
+        process = self._ctx.Process(
+            target=self.target, args=(index, str(self.socket_path), *self.args),
+            name=f"nanobot-worker-{index}", daemon=True,
+        )
+        process.start()
+        self._processes[index] = process
+        logger.info("Started agent worker {} (pid {})", index, process.pid)
+
+    async def run(self) -> None:
+        """Route inbound messages to workers until stopped."""
+        await self.start()
+        supervisor = asyncio.create_task(self._supervise())
+        try:
+            while self._running:
+                try:
+                    msg = await asyncio.wait_for(self.bus.consume_inbound(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    continue
+                await self._route(msg)
+        finally:
+            supervisor.cancel()
+
+    async def _route(self, msg: InboundMessage) -> None:
+        index = self.ring.node_for(shard_key(msg))
+        if lane_of(msg) == Lane.CONTROL:
+            self.bus.drop_pending(msg.session_key)
+        else:
+            self._in_flight[index][msg.session_key] = msg
+        await self._connected[index].wait()
+        writer = self._writers.get(index)
+        try:
+            if writer is None:
+                raise ConnectionError("worker disconnected")
+            await _send(writer, {"type": "inbound", "msg": msg.to_dict()})
+        except ConnectionError:
+            logger.warning("Worker {} unavailable; re-queueing message for {}", index, msg.session_key)
+            if writer is not None and self._writers.get(index) is writer:
+                writer.close()
+                self._lost(index)
+            self._requeue(index, msg)
+
+    def _requeue(self, index: int, msg: InboundMessage) -> None:
+        """Queue a message that never reached its worker again, unless _lost already did."""
+        if lane_of(msg) == Lane.CONTROL:
+            self.bus.inbound.requeue(msg)
+        elif self._in_flight[index].get(msg.session_key) is msg:
+            del self._in_flight[index][msg.session_key]
+            self.bus.inbound.done(msg.session_key)
+            self.bus.inbound.requeue(msg)
+
+    async def _handle_worker(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        index: int | None = None
+        try:
+            while line := await reader.readline():
+                frame = json.loads(line)
+                kind = frame.get("type")
+                if kind == "hello":
+                    index = frame["worker"]
+                    self._writers[index] = writer
+                    self._connected[index].set()
+                elif kind == "outbound":
+                    await self.bus.publish_outbound(OutboundMessage.from_dict(frame["msg"]))
+                elif kind == "done" and index is not None:
+                    msg = InboundMessage.from_dict(frame["msg"])
+                    self._in_flight[index].pop(msg.session_key, None)
+                    self.bus.inbound_done(msg)
+        except (ConnectionError, json.JSONDecodeError) as e:
+            logger.warning("Worker connection error: {}", e)
+        finally:
+            writer.close()
+            if index is not None and self._writers.get(index) is writer:  # not already replaced or dropped
+                self._lost(index)
+
+    def _lost(self, index: int) -> None:
+        """Forget a disconnected worker and queue its unfinished messages again."""
+        self._connected[index].clear()
+        self._writers.pop(index, None)
+        pending = self._in_flight[index]
+        self._in_flight[index] = {}
+        for msg in pending.values():
+            self.bus.inbound.done(msg.session_key)
+            self.bus.inbound.requeue(msg)
+        if pending:
+            logger.warning("Worker {} disconnected; re-queued {} message(s)", index, len(pending))
+
+    async def _supervise(self) -> None:
+        while self._running:
+            await asyncio.sleep(1.0)
+            for index, process in list(self._processes.items()):
+                if not process.is_alive() and self._running:
+                    logger.error("Agent worker {} exited with code {}; restarting", index, process.exitcode)
+                    self._spawn(index)
+
+    async def stop(self) -> None:
+        self._running = False
+        for writer in list(self._writers.values()):
+            writer.close()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        for process in self._processes.values():
+            process.terminate()
+        for process in self._processes.values():
+            await asyncio.to_thread(process.join, 5)
+        self.socket_path.unlink(missing_ok=True)
+
+
+class WorkerBus(MessageBus):
+    """Worker side: a local bus whose turns and replies are reported to the parent."""
+
+    def __init__(self, index: int):
+        super().__init__()
+        self.index = index
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def connect(self, socket_path: str) -> asyncio.StreamReader:
+        reader, self._writer = await asyncio.open_unix_connection(socket_path)
+        await _send(self._writer, {"type": "hello", "worker": self.index})
+        return reader
+
+    async def pump(self, reader: asyncio.StreamReader) -> None:
+        """Feed parent messages into the local bus and forward local replies, until disconnected."""
+        forward = asyncio.create_task(self._forward_outbound())
+        try:
+            while line := await reader.readline():
+                frame = json.loads(line)
+                if frame.get("type") == "inbound":
+                    msg = InboundMessage.from_dict(frame["msg"])
+                    msg.metadata[_REMOTE] = True
+                    await self.publish_inbound(msg)
+        finally:
+            forward.cancel()
+
+    async def _forward_outbound(self) -> None:
+        while True:
+            msg = await self.consume_outbound()
+            msg.metadata = {k: v for k, v in msg.metadata.items() if k != _REMOTE}
+            await _send(self._writer, {"type": "outbound", "msg": msg.to_dict()})
+
+    def inbound_done(self, msg: InboundMessage) -> None:
+        super().inbound_done(msg)
+        if msg.metadata.get(_REMOTE) and self._writer:
+            done = {k: v for k, v in msg.metadata.items() if k != _REMOTE}
+            frame = {"type": "done", "msg": {**msg.to_dict(), "metadata": done}}
+            self._writer.write(json.dumps(frame, ensure_ascii=False, default=str).encode("utf-8") + b"\n")
@@ -18,6 +18,7 @@ class BaseChannel(ABC):
     """
 
     name: str = "base"
+    supports_streaming: bool = False  # Can edit a sent message in place for partial replies
 
     def __init__(self, config: Any, bus: MessageBus):
         """
@@ -53,6 +54,16 @@ class BaseChannel(ABC):
         """
         Send a message through this channel.
 
+        Channels with ``supports_streaming`` also receive partial replies marked
+        with ``metadata["_stream"]``; each carries the full text so far and should
+        replace the previous partial with the same stream id. The final reply
+        names the stream it completes in ``metadata["_replaces_stream"]``.
+
+        Raise if the message could not be delivered (including while
+        disconnected): only a send that returns is counted as delivered and
+        acked in the bus journal. Return quietly only for messages that can
+        never be delivered, such as an invalid chat id.
+
         Args:
             msg: The message to send.
         """
@@ -195,7 +195,7 @@ class DingTalkChannel(BaseChannel):
         """Send a message through DingTalk."""
         token = await self._get_access_token()
         if not token:
-            return
+            raise RuntimeError("DingTalk access token unavailable")
 
         # oToMessages/batchSend: sends to individual users (private chat)
         # https://open.dingtalk.com/document/orgapp/robot-batch-send-messages
@@ -214,17 +214,16 @@ class DingTalkChannel(BaseChannel):
         }
 
         if not self._http:
-            logger.warning("DingTalk HTTP client not initialized, cannot send")
-            return
+            raise RuntimeError("DingTalk HTTP client not initialized")
 
         try:
             resp = await self._http.post(url, json=data, headers=headers)
-            if resp.status_code != 200:
-                logger.error("DingTalk send failed: {}", resp.text)
-            else:
-                logger.debug("DingTalk message sent to {}", msg.chat_id)
         except Exception as e:
             logger.error("Error sending DingTalk message: {}", e)
+            raise
+        if resp.status_code != 200:
+            raise RuntimeError(f"DingTalk send failed: HTTP {resp.status_code}: {resp.text[:200]}")
+        logger.debug("DingTalk message sent to {}", msg.chat_id)
 
     async def _on_message(self, content: str, sender_id: str, sender_name: str) -> None:
         """Handle incoming message (called by NanobotDingTalkHandler).
@@ -97,8 +97,7 @@ class DiscordChannel(BaseChannel):
     async def send(self, msg: OutboundMessage) -> None:
         """Send a message through Discord REST API."""
         if not self._http:
-            logger.warning("Discord HTTP client not initialized")
-            return
+            raise RuntimeError("Discord HTTP client not initialized")
 
         url = f"{DISCORD_API_BASE}/channels/{msg.chat_id}/messages"
         headers = {"Authorization": f"Bot {self.config.token}"}
@@ -117,7 +116,7 @@ class DiscordChannel(BaseChannel):
                     payload["allowed_mentions"] = {"replied_user": False}
 
                 if not await self._send_payload(url, headers, payload):
-                    break  # Abort remaining chunks on failure
+                    raise RuntimeError(f"Discord message to {msg.chat_id} was not sent")  # Abort remaining chunks
         finally:
             await self._stop_typing(msg.chat_id)
 
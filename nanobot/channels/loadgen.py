@@ -0,0 +1,165 @@
+"""Synthetic load generator channel for gateway capacity testing."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import random
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from loguru import logger
+
+from nanobot.bench.harness import percentile
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.base import BaseChannel
+from nanobot.config.schema import LoadgenConfig
+
+SEQ_KEY = "_loadgen_seq"  # metadata id of a generated message; replies carry it back
+
+
+@dataclass
+class LoadPoint:
+    """Result of one stage: ``concurrency`` virtual chats for ``duration_s``. Latencies in seconds."""
+
+    concurrency: int
+    duration_s: float
+    sent: int = 0
+    answered: int = 0
+    shed: int = 0  # answered with the bus's busy reply
+    stopped: int = 0  # turns cancelled by a scripted /stop
+    unanswered: int = 0  # no reply by the end of the drain period
+    throughput: float = 0.0  # answered messages per second
+    p50: float = 0.0
+    p95: float = 0.0
+    p99: float = 0.0
+
+
+@dataclass
+class _Stage:
+    concurrency: int
+    pending: dict[str, OrderedDict[int, float]] = field(default_factory=dict)  # chat -> seq -> sent at
+    latencies: list[float] = field(default_factory=list)
+    sent: int = 0
+    shed: int = 0
+    stopped: int = 0
+
+    def outstanding(self) -> int:
+        return sum(len(p) for p in self.pending.values())
+
+
+class LoadgenChannel(BaseChannel):
+    """
+    Virtual chats that replay a scripted conversation at a Poisson arrival rate.
+
+    Runs one stage per entry in ``config.concurrency``, measuring the time from
+    ``_handle_message`` to the matching reply in ``send``, and writes the
+    resulting throughput/latency curve to ``report_path`` as JSON. Only
+    enabled by the gateway's benchmark profile (``nanobot gateway --bench``).
+    """
+
+    name = "loadgen"
+
+    def __init__(self, config: LoadgenConfig, bus: MessageBus, busy_reply: str = "", report_path: Path | None = None):
+        super().__init__(config, bus)
+        self.config: LoadgenConfig = config
+        self.busy_reply = busy_reply
+        self.report_path = report_path
+        self.results: list[LoadPoint] = []
+        self.finished = asyncio.Event()
+        self._random = random.Random(config.seed)
+        self._seq = itertools.count(1)
+        self._stage: _Stage | None = None
+
+    async def start(self) -> None:
+        self._running = True
+        try:
+            for index, concurrency in enumerate(self.config.concurrency):
+                if not self._running:
+                    break
+                point = await self._run_stage(index, concurrency)
+                self.results.append(point)
+                logger.info(
+                    "loadgen: {} chats -> {:.1f} msg/s, p50 {:.0f} ms, p95 {:.0f} ms, p99 {:.0f} ms "
+                    "({} shed, {} unanswered)",
+                    point.concurrency, point.throughput, point.p50 * 1000, point.p95 * 1000, point.p99 * 1000,
+                    point.shed, point.unanswered,
+                )
+            self._write_report()
+        finally:
+            self.finished.set()
+        while self._running:
+            await asyncio.sleep(1)
+
+    async def stop(self) -> None:
+        self._running = False
+
+    async def _run_stage(self, index: int, concurrency: int) -> LoadPoint:
+        stage = self._stage = _Stage(concurrency)
+        chats = [asyncio.create_task(self._virtual_chat(stage, f"{index}-{i}")) for i in range(concurrency)]
+        started = time.monotonic()
+        try:
+            await asyncio.sleep(self.config.stage_duration_s)
+        finally:
+            for task in chats:
+                task.cancel()
+            await asyncio.gather(*chats, return_exceptions=True)
+        deadline = time.monotonic() + self.config.drain_s
+        while stage.outstanding() and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        elapsed = time.monotonic() - started
+        self._stage = None
+        return LoadPoint(
+            concurrency=concurrency, duration_s=round(elapsed, 3), sent=stage.sent,
+            answered=len(stage.latencies), shed=stage.shed, stopped=stage.stopped, unanswered=stage.outstanding(),
+            throughput=len(stage.latencies) / elapsed if elapsed > 0 else 0.0,
+            p50=percentile(stage.latencies, 50), p95=percentile(stage.latencies, 95),
+            p99=percentile(stage.latencies, 99),
+        )
+
+    async def _virtual_chat(self, stage: _Stage, chat_id: str) -> None:
+        pending = stage.pending.setdefault(chat_id, OrderedDict())
+        for step in itertools.cycle(self.config.script):
+            await asyncio.sleep(self._random.expovariate(self.config.arrival_rate))
+            if step.content.strip().lower() == "/stop":
+                stage.stopped += len(pending)  # the running turn and anything queued are cancelled
+                pending.clear()
+            seq = next(self._seq)
+            pending[seq] = time.monotonic()
+            stage.sent += 1
+            await self._handle_message(
+                sender_id=f"loadgen-{chat_id}", chat_id=chat_id, content=step.content,
+                media=list(step.media), metadata={SEQ_KEY: seq},
+            )
+
+    async def send(self, msg: OutboundMessage) -> None:
+        stage = self._stage
+        if stage is None or msg.metadata.get("_progress") or msg.metadata.get("_stream"):
+            return
+        pending = stage.pending.get(msg.chat_id)
+        if not pending:
+            return  # late reply to a message from an earlier stage, or to a stopped turn
+        seq = msg.metadata.get(SEQ_KEY)
+        if seq is None:
+            # Slash-command and /stop replies carry no metadata: match them to the oldest open message.
+            sent_at = pending.popitem(last=False)[1]
+        elif seq in pending:
+            sent_at = pending.pop(seq)
+        else:
+            return  # reply to a stopped turn
+        if self.busy_reply and msg.content == self.busy_reply:
+            stage.shed += 1
+        else:
+            stage.latencies.append(time.monotonic() - sent_at)
+
+    def _write_report(self) -> None:
+        if self.report_path is None or not self.results:
+            return
+        self.report_path.parent.mkdir(parents=True, exist_ok=True)
+        report = {"arrival_rate": self.config.arrival_rate, "points": [asdict(p) for p in self.results]}
+        self.report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        logger.info("loadgen report written to {}", self.report_path)
@@ -9,6 +9,7 @@ from loguru import logger
 
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
+from nanobot.channels.outbox import ChannelOutbox
 from nanobot.config.schema import Config
 
 
@@ -26,9 +27,19 @@ class ChannelManager:
         self.config = config
         self.bus = bus
         self.channels: dict[str, BaseChannel] = {}
+        self.outboxes: dict[str, ChannelOutbox] = {}
         self._dispatch_task: asyncio.Task | None = None
 
         self._init_channels()
+        self.outboxes = {
+            name: ChannelOutbox(
+                channel,
+                concurrency=config.channels.send_concurrency,
+                on_sent=bus.outbound_done,
+                maxsize=config.bus.outbound_max,
+            )
+            for name, channel in self.channels.items()
+        }
 
     @staticmethod
     def _warn_if_open(channel_name: str, cfg) -> None:
@@ -188,6 +199,20 @@ class ChannelManager:
             except ImportError as e:
                 logger.warning("Matrix channel not available: {}", e)
 
+        # Load generator (benchmark profile only)
+        if self.config.channels.loadgen.enabled:
+            import time
+            from pathlib import Path
+
+            from nanobot.channels.loadgen import LoadgenChannel
+            from nanobot.config.loader import get_data_dir
+            cfg = self.config.channels.loadgen
+            report = Path(cfg.report).expanduser() if cfg.report else (
+                get_data_dir() / "loadgen" / f"report-{time.strftime('%Y%m%d-%H%M%S')}.json"
+            )
+            self.channels["loadgen"] = LoadgenChannel(cfg, self.bus, busy_reply=self.config.bus.busy_reply, report_path=report)
+            logger.info("Loadgen channel enabled: {} virtual chat stages", len(cfg.concurrency))
+
     async def _start_channel(self, name: str, channel: BaseChannel) -> None:
         """Start a channel and log any exceptions."""
         try:
@@ -201,7 +226,9 @@ class ChannelManager:
             logger.warning("No channels enabled")
             return
 
-        # Start outbound dispatcher
+        # Start per-channel send workers and the outbound dispatcher
+        for outbox in self.outboxes.values():
+            outbox.start()
         self._dispatch_task = asyncio.create_task(self._dispatch_outbound())
 
         # Start channels
@@ -224,6 +251,8 @@ class ChannelManager:
                 await self._dispatch_task
             except asyncio.CancelledError:
                 pass
+        for outbox in self.outboxes.values():
+            await outbox.stop()
 
         # Stop all channels
         for name, channel in self.channels.items():
@@ -234,7 +263,12 @@ class ChannelManager:
                 logger.error("Error stopping {}: {}", name, e)
 
     async def _dispatch_outbound(self) -> None:
-        """Dispatch outbound messages to the appropriate channel."""
+        """
+        Route outbound messages to each channel's outbox (sending happens in its workers).
+
+        Waiting on a full outbox pauses routing, so the backlog stays in the bus's bounded
+        outbound queue where progress updates are shed and publishers wait.
+        """
         logger.info("Outbound dispatcher started")
 
         while True:
@@ -244,20 +278,23 @@ class ChannelManager:
                     timeout=1.0
                 )
 
-                if msg.metadata.get("_progress"):
+                channel = self.channels.get(msg.channel)
+
+                if msg.metadata.get("_stream"):
+                    # Partial replies only make sense where the message can be edited in place
+                    if not (channel and channel.supports_streaming):
+                        continue
+                elif msg.metadata.get("_progress"):
                     if msg.metadata.get("_tool_hint") and not self.config.channels.send_tool_hints:
                         continue
                     if not msg.metadata.get("_tool_hint") and not self.config.channels.send_progress:
                         continue
 
-                channel = self.channels.get(msg.channel)
                 if channel:
-                    try:
-                        await channel.send(msg)
-                    except Exception as e:
-                        logger.error("Error sending to {}: {}", msg.channel, e)
+                    await self.outboxes[msg.channel].put(msg)
                 else:
                     logger.warning("Unknown channel: {}", msg.channel)
+                    self.bus.outbound_done(msg)
 
             except asyncio.TimeoutError:
                 continue
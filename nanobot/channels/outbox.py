@@ -0,0 +1,111 @@
+"""Per-channel outbound queue drained by its own send workers."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Callable
+
+from loguru import logger
+
+from nanobot.bus.events import OutboundMessage
+from nanobot.channels.base import BaseChannel
+from nanobot.metrics.registry import (
+    BUS_DROPPED,
+    CHANNEL_OUTBOX_DEPTH,
+    CHANNEL_SEND_FAILURES,
+    CHANNEL_SEND_SECONDS,
+)
+
+
+class ChannelOutbox:
+    """
+    Outbound queue for one channel.
+
+    Up to ``concurrency`` sends run at once, but never two for the same chat,
+    so replies within a chat keep their order while a slow chat (uploads,
+    rate-limit sleeps) does not hold up the others, or other channels.
+
+    With a ``maxsize``, a full outbox drops progress updates and makes final
+    replies wait in ``put``, so a channel that falls behind pushes back on
+    the bus's outbound queue instead of buffering without limit.
+    """
+
+    def __init__(
+        self,
+        channel: BaseChannel,
+        concurrency: int = 1,
+        on_sent: Callable[[OutboundMessage], None] | None = None,
+        maxsize: int = 0,
+    ):
+        self.channel = channel
+        self.concurrency = max(1, concurrency)
+        self.on_sent = on_sent
+        self.maxsize = maxsize
+        self._pending: dict[str, deque[OutboundMessage]] = {}
+        self._ready: asyncio.Queue[str] = asyncio.Queue()  # chats with a message to send, each at most once
+        self._size = 0
+        self._space = asyncio.Condition()
+        self._workers: list[asyncio.Task] = []
+
+    def full(self) -> bool:
+        return 0 < self.maxsize <= self._size
+
+    async def put(self, msg: OutboundMessage) -> None:
+        """Queue a message, dropping progress updates and waiting for room when full."""
+        if self.full():
+            if msg.metadata.get("_progress"):
+                BUS_DROPPED.inc(queue="outbox", reason="progress")
+                return
+            async with self._space:
+                await self._space.wait_for(lambda: not self.full())
+        pending = self._pending.get(msg.chat_id)
+        if pending is None:
+            pending = self._pending[msg.chat_id] = deque()
+            self._ready.put_nowait(msg.chat_id)
+        pending.append(msg)
+        self._size += 1
+        CHANNEL_OUTBOX_DEPTH.set(self._size, channel=self.channel.name)
+
+    def start(self) -> None:
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    async def stop(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def __len__(self) -> int:
+        return self._size
+
+    async def _worker(self) -> None:
+        while True:
+            chat_id = await self._ready.get()
+            pending = self._pending[chat_id]
+            msg = pending.popleft()
+            self._size -= 1
+            CHANNEL_OUTBOX_DEPTH.set(self._size, channel=self.channel.name)
+            async with self._space:
+                self._space.notify()
+            try:
+                await self._send(msg)
+            finally:
+                # The chat goes back to the ready queue only after this send, preserving order.
+                if pending:
+                    self._ready.put_nowait(chat_id)
+                else:
+                    del self._pending[chat_id]
+
+    async def _send(self, msg: OutboundMessage) -> None:
+        started = time.monotonic()
+        try:
+            await self.channel.send(msg)
+            if self.on_sent:
+                self.on_sent(msg)
+        except Exception as e:
+            logger.error("Error sending to {}: {}", msg.channel, e)
+            CHANNEL_SEND_FAILURES.inc(channel=msg.channel)
+        finally:
+            CHANNEL_SEND_SECONDS.observe(time.monotonic() - started, channel=msg.channel)
@@ -20,6 +20,7 @@ class SlackChannel(BaseChannel):
     """Slack channel using Socket Mode."""
 
     name = "slack"
+    supports_streaming = True
 
     def __init__(self, config: SlackConfig, bus: MessageBus):
         super().__init__(config, bus)
@@ -27,6 +28,7 @@ class SlackChannel(BaseChannel):
         self._web_client: AsyncWebClient | None = None
         self._socket_client: SocketModeClient | None = None
         self._bot_user_id: str | None = None
+        self._streams: dict[str, tuple[str, str, str]] = {}  # chat_id -> (stream_id, ts, text)
 
     async def start(self) -> None:
         """Start the Slack Socket Mode client."""
@@ -74,8 +76,7 @@ class SlackChannel(BaseChannel):
     async def send(self, msg: OutboundMessage) -> None:
         """Send a message through Slack."""
         if not self._web_client:
-            logger.warning("Slack client not running")
-            return
+            raise RuntimeError("Slack client not running")
         try:
             slack_meta = msg.metadata.get("slack", {}) if msg.metadata else {}
             thread_ts = slack_meta.get("thread_ts")
@@ -84,7 +85,18 @@ class SlackChannel(BaseChannel):
             use_thread = thread_ts and channel_type != "im"
             thread_ts_param = thread_ts if use_thread else None
 
-            if msg.content:
+            if stream_id := msg.metadata.get("_stream"):
+                await self._send_stream_update(msg.chat_id, stream_id, msg.content, thread_ts_param)
+                return
+
+            # A final reply replaces the partial reply of the stream it completes;
+            # any other final reply drops a leftover partial (e.g. one the message tool superseded)
+            stream = None if msg.metadata.get("_progress") else self._streams.pop(msg.chat_id, None)
+            if msg.content and stream and stream[0] == msg.metadata.get("_replaces_stream"):
+                await self._web_client.chat_update(
+                    channel=msg.chat_id, ts=stream[1], text=self._to_mrkdwn(msg.content),
+                )
+            elif msg.content:
                 await self._web_client.chat_postMessage(
                     channel=msg.chat_id,
                     text=self._to_mrkdwn(msg.content),
@@ -102,6 +114,21 @@ class SlackChannel(BaseChannel):
                     logger.error("Failed to upload file {}: {}", media_path, e)
         except Exception as e:
             logger.error("Error sending Slack message: {}", e)
+            raise
+
+    async def _send_stream_update(
+        self, chat_id: str, stream_id: str, text: str, thread_ts: str | None,
+    ) -> None:
+        """Post or update the single message that shows a streamed partial reply."""
+        current = self._streams.get(chat_id)
+        if current and current[0] == stream_id:
+            if current[2] != text:
+                await self._web_client.chat_update(channel=chat_id, ts=current[1], text=text)
+                self._streams[chat_id] = (stream_id, current[1], text)
+            return
+        resp = await self._web_client.chat_postMessage(channel=chat_id, text=text, thread_ts=thread_ts)
+        if ts := resp.get("ts"):
+            self._streams[chat_id] = (stream_id, ts, text)
 
     async def _on_socket_request(
         self,
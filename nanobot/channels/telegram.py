@@ -107,6 +107,7 @@ class TelegramChannel(BaseChannel):
     """
 
     name = "telegram"
+    supports_streaming = True
 
     # Commands registered with Telegram's command menu
     BOT_COMMANDS = [
@@ -130,6 +131,7 @@ class TelegramChannel(BaseChannel):
         self._typing_tasks: dict[str, asyncio.Task] = {}  # chat_id -> typing loop task
         self._media_group_buffers: dict[str, dict] = {}
         self._media_group_tasks: dict[str, asyncio.Task] = {}
+        self._streams: dict[str, tuple[str, int, str]] = {}  # chat_id -> (stream_id, message_id, text)
 
     async def start(self) -> None:
         """Start the Telegram bot with long polling."""
@@ -222,8 +224,7 @@ class TelegramChannel(BaseChannel):
     async def send(self, msg: OutboundMessage) -> None:
         """Send a message through Telegram."""
         if not self._app:
-            logger.warning("Telegram bot not running")
-            return
+            raise RuntimeError("Telegram bot not running")
 
         self._stop_typing(msg.chat_id)
 
@@ -242,6 +243,10 @@ class TelegramChannel(BaseChannel):
                     allow_sending_without_reply=True
                 )
 
+        if stream_id := msg.metadata.get("_stream"):
+            await self._send_stream_update(chat_id, msg.chat_id, stream_id, msg.content, reply_params)
+            return
+
         # Send media files
         for media_path in (msg.media or []):
             try:
@@ -269,7 +274,13 @@ class TelegramChannel(BaseChannel):
 
         # Send text content
         if msg.content and msg.content != "[empty message]":
-            for chunk in _split_message(msg.content):
+            chunks = _split_message(msg.content)
+            # A final reply replaces the partial reply of the stream it completes;
+            # any other final reply drops a leftover partial (e.g. one the message tool superseded)
+            stream = None if msg.metadata.get("_progress") else self._streams.pop(msg.chat_id, None)
+            if stream and stream[0] == msg.metadata.get("_replaces_stream") and await self._edit_text(chat_id, stream[1], chunks[0]):
+                chunks = chunks[1:]
+            for chunk in chunks:
                 try:
                     html = _markdown_to_telegram_html(chunk)
                     await self._app.bot.send_message(
@@ -288,6 +299,51 @@ class TelegramChannel(BaseChannel):
                         )
                     except Exception as e2:
                         logger.error("Error sending Telegram message: {}", e2)
+                        raise
+
+    async def _send_stream_update(
+        self, chat_id: int, key: str, stream_id: str, text: str, reply_params: ReplyParameters | None,
+    ) -> None:
+        """Send or edit the single message that shows a streamed partial reply."""
+        text = text[:4000]  # Overflow is delivered with the final reply
+        current = self._streams.get(key)
+        if current and current[0] == stream_id:
+            if current[2] == text:
+                return
+            try:
+                await self._app.bot.edit_message_text(chat_id=chat_id, message_id=current[1], text=text)
+            except Exception as e:
+                logger.debug("Telegram stream edit failed: {}", e)
+                return
+            self._streams[key] = (stream_id, current[1], text)
+            return
+        try:
+            sent = await self._app.bot.send_message(chat_id=chat_id, text=text, reply_parameters=reply_params)
+        except Exception as e:
+            logger.warning("Telegram stream send failed: {}", e)
+            return
+        self._streams[key] = (stream_id, sent.message_id, text)
+
+    async def _edit_text(self, chat_id: int, message_id: int, text: str) -> bool:
+        """Replace a message's text with formatted content. Returns False if it could not be edited."""
+        try:
+            await self._app.bot.edit_message_text(
+                chat_id=chat_id, message_id=message_id,
+                text=_markdown_to_telegram_html(text), parse_mode="HTML",
+            )
+            return True
+        except Exception as e:
+            if "not modified" in str(e).lower():
+                return True
+            logger.warning("HTML edit failed, falling back to plain text: {}", e)
+        try:
+            await self._app.bot.edit_message_text(chat_id=chat_id, message_id=message_id, text=text)
+            return True
+        except Exception as e:
+            if "not modified" in str(e).lower():
+                return True
+            logger.error("Error editing Telegram message: {}", e)
+            return False
 
     async def _on_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /start command."""
@@ -77,8 +77,7 @@ class WhatsAppChannel(BaseChannel):
     async def send(self, msg: OutboundMessage) -> None:
         """Send a message through WhatsApp."""
         if not self._ws or not self._connected:
-            logger.warning("WhatsApp bridge not connected")
-            return
+            raise RuntimeError("WhatsApp bridge not connected")
 
         try:
             payload = {
@@ -89,6 +88,7 @@ class WhatsAppChannel(BaseChannel):
             await self._ws.send(json.dumps(payload, ensure_ascii=False))
         except Exception as e:
             logger.error("Error sending WhatsApp message: {}", e)
+            raise
 
     async def _handle_bridge_message(self, raw: str) -> None:
         """Handle a message from the bridge."""
@@ -198,13 +198,80 @@ def onboard():
 
 
 
-def _make_provider(config: Config):
-    """Create the appropriate LLM provider from config."""
+def _make_usage_ledger(config: Config):
+    """Open the LLM usage ledger, or None when usage tracking is off."""
+    if not config.usage.enabled:
+        return None
+    from nanobot.config.loader import get_data_dir
+    from nanobot.usage.ledger import ModelPrice, UsageLedger
+
+    return UsageLedger(
+        get_data_dir() / "usage" / "usage.db",
+        prices={k: ModelPrice(**v.model_dump()) for k, v in config.usage.prices.items()},
+        session_budget_usd=config.usage.session_budget_usd,
+        daily_budget_usd=config.usage.daily_budget_usd,
+    )
+
+
+def _make_provider(config: Config, record_to: Path | None = None):
+    """
+    Create the LLM provider from config, wrapped with retries, the fallback chain and usage metering.
+
+    With ``record_to``, every response is also appended to that replay fixture file.
+    """
+    from nanobot.providers.metered import BudgetedProvider, MeteredProvider
+    from nanobot.providers.ratelimit import RateLimitedProvider, RateLimiters
+    from nanobot.providers.resilient import ResilientProvider
+
+    defaults = config.agents.defaults
+    limiters = RateLimiters({k: v.model_dump() for k, v in defaults.rate_limits.items()})
+    ledger = _make_usage_ledger(config)
+
+    def build(model: str):
+        provider = _make_model_provider(config, model)
+        if provider is not None and limiters.limits:
+            provider = RateLimitedProvider(provider, limiters, config.get_provider_name(model))
+        if provider is not None and ledger is not None:
+            provider = MeteredProvider(provider, ledger)
+        return provider
+
+    primary = build(defaults.model)
+    if primary is None:
+        console.print("[red]Error: No API key configured.[/red]")
+        console.print("Set one in ~/.nanobot/config.json under providers section")
+        raise typer.Exit(1)
+
+    fallbacks = []
+    for model in defaults.fallback_models:
+        provider = build(model)
+        if provider is None:
+            console.print(f"[yellow]Warning: no API key for fallback model {model}, skipping[/yellow]")
+            continue
+        fallbacks.append((provider, model))
+    provider = ResilientProvider(primary, fallbacks, max_retries=defaults.llm_retries)
+
+    budget_model = config.usage.budget_model
+    if ledger is not None and budget_model and (config.usage.session_budget_usd or config.usage.daily_budget_usd):
+        budget_provider = build(budget_model)
+        if budget_provider is None:
+            console.print(f"[yellow]Warning: no API key for budget model {budget_model}, budgets not enforced[/yellow]")
+        else:
+            provider = BudgetedProvider(
+                provider, ledger,
+                ResilientProvider(budget_provider, [], max_retries=defaults.llm_retries), budget_model,
+            )
+    if record_to is not None:
+        from nanobot.providers.replay import RecordingProvider
+        provider = RecordingProvider(provider, record_to)
+    return provider
+
+
+def _make_model_provider(config: Config, model: str):
+    """Create the LLM provider serving one model, or None if it has no API key."""
     from nanobot.providers.custom_provider import CustomProvider
     from nanobot.providers.litellm_provider import LiteLLMProvider
     from nanobot.providers.openai_codex_provider import OpenAICodexProvider
 
-    model = config.agents.defaults.model
     provider_name = config.get_provider_name(model)
     p = config.get_provider(model)
 
@@ -223,9 +290,7 @@ def _make_provider(config: Config):
     from nanobot.providers.registry import find_by_name
     spec = find_by_name(provider_name)
     if not model.startswith("bedrock/") and not (p and p.api_key) and not (spec and spec.is_oauth):
-        console.print("[red]Error: No API key configured.[/red]")
-        console.print("Set one in ~/.nanobot/config.json under providers section")
-        raise typer.Exit(1)
+        return None
 
     return LiteLLMProvider(
         api_key=p.api_key if p else None,
@@ -236,6 +301,143 @@ def _make_provider(config: Config):
     )
 
 
+def _make_session_manager(config: Config):
+    """Create the session manager for the configured storage backend."""
+    defaults = config.agents.defaults
+    cache_options = {
+        "max_cached": defaults.session_cache_size,
+        "max_cached_bytes": defaults.session_cache_mb * 1024 * 1024,
+    }
+    if defaults.session_backend == "sqlite":
+        from nanobot.session.sqlite import SQLiteSessionManager
+        return SQLiteSessionManager(config.workspace_path, **cache_options)
+
+    from nanobot.session.manager import SessionManager
+    return SessionManager(config.workspace_path, **cache_options)
+
+
+def _make_bus(config: Config, durable: bool = False):
+    """Create the message bus with the configured scheduling and queue limits."""
+    from nanobot.bus.queue import MessageBus
+
+    journal = None
+    if durable and config.bus.journal:
+        from nanobot.bus.journal import MessageJournal
+        from nanobot.config.loader import get_data_dir
+        journal = MessageJournal(get_data_dir() / "bus" / "journal.db")
+
+    return MessageBus(
+        max_concurrent_turns=config.agents.defaults.max_concurrent_turns,
+        coalesce_ms=config.channels.coalesce_ms,
+        inbound_maxsize=config.bus.inbound_max,
+        outbound_maxsize=config.bus.outbound_max,
+        inbound_ttl_s=config.bus.inbound_ttl_s,
+        publish_timeout_s=config.bus.publish_timeout_s,
+        busy_reply=config.bus.busy_reply,
+        journal=journal,
+    )
+
+
+def _make_agent_loop(config: Config, bus, provider, session_manager, cron):
+    """Create the gateway's AgentLoop (also used by each worker process)."""
+    from nanobot.agent.loop import AgentLoop
+
+    return AgentLoop(
+        bus=bus,
+        provider=provider,
+        workspace=config.workspace_path,
+        model=config.agents.defaults.model,
+        temperature=config.agents.defaults.temperature,
+        max_tokens=config.agents.defaults.max_tokens,
+        max_iterations=config.agents.defaults.max_tool_iterations,
+        memory_window=config.agents.defaults.memory_window,
+        context_window_tokens=config.agents.defaults.context_window_tokens,
+        model_context_windows=config.agents.defaults.model_context_windows,
+        brave_api_key=config.tools.web.search.api_key or None,
+        exec_config=config.tools.exec,
+        cron_service=cron,
+        restrict_to_workspace=config.tools.restrict_to_workspace,
+        session_manager=session_manager,
+        mcp_servers=config.tools.mcp_servers,
+        channels_config=config.channels,
+        kaizen_review_interval_days=config.agents.defaults.kaizen_review_interval_days,
+        vision_config=config.tools.vision,
+        max_parallel_tools=config.tools.max_parallel_calls,
+    )
+
+
+def _apply_bench_profile(config: Config, workspace: Path) -> None:
+    """Benchmark profile: only the loadgen channel, a throwaway workspace, no heartbeat, journal or ledger."""
+    for name in type(config.channels).model_fields:
+        channel = getattr(config.channels, name)
+        if hasattr(channel, "enabled"):
+            channel.enabled = False
+    config.channels.loadgen.enabled = True
+    config.agents.defaults.workspace = str(workspace)
+    config.gateway.heartbeat.enabled = False
+    config.bus.journal = False
+    config.usage.enabled = False
+
+
+def _make_bench_provider(config: Config):
+    """Stub LLM for the benchmark profile, or the real provider when loadgen.llmLatencyMs is negative."""
+    from nanobot.providers.replay import ReplayProvider, synthetic_script
+
+    loadgen = config.channels.loadgen
+    if loadgen.llm_latency_ms < 0:
+        return _make_provider(config)
+    return ReplayProvider(default=synthetic_script(), latency_s=loadgen.llm_latency_ms / 1000, seed=loadgen.seed)
+
+
+def _agent_worker_main(
+    index: int, socket_path: str, verbose: bool = False, record: str | None = None, bench_workspace: str | None = None,
+) -> None:
+    """Entry point of a gateway worker process (``gateway --workers N``)."""
+    from loguru import logger
+
+    from nanobot.bus.workers import WorkerBus
+    from nanobot.config.loader import get_data_dir, load_config
+    from nanobot.cron.service import CronService
+    from nanobot.net import HTTP_CLIENTS
+
+    if verbose:
+        import logging
+        logging.basicConfig(level=logging.DEBUG)
+
+    config = load_config()
+    if bench_workspace:
+        _apply_bench_profile(config, Path(bench_workspace))
+    HTTP_CLIENTS.configure(config.http)
+    bus = WorkerBus(index)
+    session_manager = _make_session_manager(config)
+    # Jobs added here land in jobs.json; the gateway process runs the timers.
+    cron_dir = config.workspace_path if bench_workspace else get_data_dir()
+    cron = CronService(cron_dir / "cron" / "jobs.json")
+    record_to = None
+    if record:  # one fixture file per worker, e.g. calls.worker0.jsonl
+        path = Path(record)
+        record_to = path.with_name(f"{path.stem}.worker{index}{path.suffix}")
+    provider = _make_bench_provider(config) if bench_workspace else _make_provider(config, record_to)
+    agent = _make_agent_loop(config, bus, provider, session_manager, cron)
+
+    async def run():
+        reader = await bus.connect(socket_path)
+        agent_task = asyncio.create_task(agent.run())
+        logger.info("Agent worker {} ready", index)
+        try:
+            await bus.pump(reader)
+        finally:
+            agent.stop()
+            agent_task.cancel()
+            await agent.close_mcp()
+            await HTTP_CLIENTS.aclose()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
 # ============================================================================
 # Gateway / Server
 # ============================================================================
@@ -243,18 +445,26 @@ def _make_provider(config: Config):
 
 @app.command()
 def gateway(
-    port: int = typer.Option(18790, "--port", "-p", help="Gateway port"),
+    port: int | None = typer.Option(None, "--port", "-p", help="Gateway port (default: gateway.port)"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
+    workers: int | None = typer.Option(
+        None, "--workers", "-w", help="Agent worker processes (default: gateway.workers; 0 = in-process)",
+    ),
+    record: Path | None = typer.Option(None, "--record", help="Append every LLM response to this replay fixture"),
+    bench: bool = typer.Option(False, "--bench", help="Benchmark profile: drive the loadgen channel, then exit"),
 ):
     """Start the nanobot gateway."""
-    from nanobot.agent.loop import AgentLoop
-    from nanobot.bus.queue import MessageBus
+    from loguru import logger
+
     from nanobot.channels.manager import ChannelManager
     from nanobot.config.loader import get_data_dir, load_config
     from nanobot.cron.service import CronService
     from nanobot.cron.types import CronJob
     from nanobot.heartbeat.service import HeartbeatService
-    from nanobot.session.manager import SessionManager
+    from nanobot.metrics import MetricsServer
+    from nanobot.net import HTTP_CLIENTS
+    from nanobot.providers.ratelimit import Priority, llm_priority
+    from nanobot.usage.ledger import usage_context
 
     if verbose:
         import logging
@@ -269,48 +479,38 @@ def gateway(
         if not os.environ.get("NANOBOT_ALLOW_ROOT"):
             raise SystemExit(1)
 
+    config = load_config()
+    bench_workspace = None
+    if bench:
+        import tempfile
+        bench_workspace = Path(tempfile.mkdtemp(prefix="nanobot-loadgen-"))
+        _apply_bench_profile(config, bench_workspace)
+    HTTP_CLIENTS.configure(config.http)
+    port = port or config.gateway.port
     console.print(f"{__logo__} Starting nanobot gateway on port {port}...")
 
-    config = load_config()
     sync_workspace_templates(config.workspace_path)
-    bus = MessageBus()
-    provider = _make_provider(config)
-    session_manager = SessionManager(config.workspace_path)
+    bus = _make_bus(config, durable=True)
+    provider = _make_bench_provider(config) if bench else _make_provider(config, record)
+    session_manager = _make_session_manager(config)
 
     # Create cron service first (callback set after agent creation)
-    cron_store_path = get_data_dir() / "cron" / "jobs.json"
+    cron_store_path = (bench_workspace or get_data_dir()) / "cron" / "jobs.json"
     cron = CronService(cron_store_path)
 
     # Create agent with cron service
-    agent = AgentLoop(
-        bus=bus,
-        provider=provider,
-        workspace=config.workspace_path,
-        model=config.agents.defaults.model,
-        temperature=config.agents.defaults.temperature,
-        max_tokens=config.agents.defaults.max_tokens,
-        max_iterations=config.agents.defaults.max_tool_iterations,
-        memory_window=config.agents.defaults.memory_window,
-        brave_api_key=config.tools.web.search.api_key or None,
-        exec_config=config.tools.exec,
-        cron_service=cron,
-        restrict_to_workspace=config.tools.restrict_to_workspace,
-        session_manager=session_manager,
-        mcp_servers=config.tools.mcp_servers,
-        channels_config=config.channels,
-        kaizen_review_interval_days=config.agents.defaults.kaizen_review_interval_days,
-        vision_config=config.tools.vision,
-    )
+    agent = _make_agent_loop(config, bus, provider, session_manager, cron)
 
     # Set cron callback (needs agent)
     async def on_cron_job(job: CronJob) -> str | None:
         """Execute a cron job through the agent."""
-        response = await agent.process_direct(
-            job.payload.message,
-            session_key=f"cron:{job.id}",
-            channel=job.payload.channel or "cli",
-            chat_id=job.payload.to or "direct",
-        )
+        with llm_priority(Priority.BACKGROUND), usage_context(site="cron"):
+            response = await agent.process_direct(
+                job.payload.message,
+                session_key=f"cron:{job.id}",
+                channel=job.payload.channel or "cli",
+                chat_id=job.payload.to or "direct",
+            )
         if job.payload.deliver and job.payload.to:
             from nanobot.bus.events import OutboundMessage
             await bus.publish_outbound(OutboundMessage(
@@ -386,22 +586,67 @@ def gateway(
 
     console.print(f"[green]✓[/green] Heartbeat: every {hb_cfg.interval_s}s")
 
+    metrics = MetricsServer(config.gateway.host, port, bus=bus, sessions=session_manager)
+
+    workers = config.gateway.workers if workers is None else workers
+    pool = None
+    if workers > 0:
+        from nanobot.bus.workers import WorkerPool
+        pool = WorkerPool(
+            bus, get_data_dir() / "run" / "gateway.sock", workers, _agent_worker_main,
+            args=(verbose, str(record) if record else None, str(bench_workspace) if bench_workspace else None),
+        )
+        console.print(f"[green]✓[/green] Agent workers: {workers}")
+
+    async def watch_cron_store():
+        """Workers add jobs through their own CronService; pick them up here."""
+        while True:
+            await asyncio.sleep(5)
+            cron.refresh()
+
     async def run():
         try:
+            if config.gateway.metrics:
+                await metrics.start()
+            replayed = await bus.replay_journal()
+            if any(replayed):
+                logger.info("Replayed {} inbound and {} outbound messages from the journal", *replayed)
             await cron.start()
-            await heartbeat.start()
-            await asyncio.gather(
-                agent.run(),
-                channels.start_all(),
-            )
+            with llm_priority(Priority.BACKGROUND), usage_context(site="heartbeat"):
+                await heartbeat.start()  # the heartbeat task inherits the background LLM priority
+            if pool:
+                # Workers consume the bus; the local agent only serves cron and heartbeat turns.
+                serving = asyncio.gather(pool.run(), channels.start_all(), watch_cron_store())
+            else:
+                serving = asyncio.gather(
+                    agent.run(),
+                    channels.start_all(),
+                )
+            if bench:
+                finished = asyncio.create_task(channels.get_channel("loadgen").finished.wait())
+                await asyncio.wait([serving, finished], return_when=asyncio.FIRST_COMPLETED)
+                serving.cancel()
+                await asyncio.gather(serving, return_exceptions=True)
+            else:
+                await serving
         except KeyboardInterrupt:
             console.print("\nShutting down...")
         finally:
+            if pool:
+                await pool.stop()
             await agent.close_mcp()
             heartbeat.stop()
             cron.stop()
             agent.stop()
             await channels.stop_all()
+            await metrics.stop()
+            await HTTP_CLIENTS.aclose()
+            if bus.journal:
+                bus.journal.close()
+            logger.info("Session cache stats: {}", session_manager.cache_stats())
+            if bench_workspace:
+                import shutil
+                shutil.rmtree(bench_workspace, ignore_errors=True)
 
     asyncio.run(run())
 
@@ -419,20 +664,22 @@ def agent(
     session_id: str = typer.Option("cli:direct", "--session", "-s", help="Session ID"),
     markdown: bool = typer.Option(True, "--markdown/--no-markdown", help="Render assistant output as Markdown"),
     logs: bool = typer.Option(False, "--logs/--no-logs", help="Show nanobot runtime logs during chat"),
+    record: Path | None = typer.Option(None, "--record", help="Append every LLM response to this replay fixture"),
 ):
     """Interact with the agent directly."""
     from loguru import logger
 
     from nanobot.agent.loop import AgentLoop
-    from nanobot.bus.queue import MessageBus
     from nanobot.config.loader import get_data_dir, load_config
     from nanobot.cron.service import CronService
+    from nanobot.net import HTTP_CLIENTS
 
     config = load_config()
     sync_workspace_templates(config.workspace_path)
+    HTTP_CLIENTS.configure(config.http)
 
-    bus = MessageBus()
-    provider = _make_provider(config)
+    bus = _make_bus(config)
+    provider = _make_provider(config, record)
 
     # Create cron service for tool usage (no callback needed for CLI unless running)
     cron_store_path = get_data_dir() / "cron" / "jobs.json"
@@ -452,14 +699,18 @@ def agent(
         max_tokens=config.agents.defaults.max_tokens,
         max_iterations=config.agents.defaults.max_tool_iterations,
         memory_window=config.agents.defaults.memory_window,
+        context_window_tokens=config.agents.defaults.context_window_tokens,
+        model_context_windows=config.agents.defaults.model_context_windows,
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
         cron_service=cron,
         restrict_to_workspace=config.tools.restrict_to_workspace,
+        session_manager=_make_session_manager(config),
         mcp_servers=config.tools.mcp_servers,
         channels_config=config.channels,
         kaizen_review_interval_days=config.agents.defaults.kaizen_review_interval_days,
         vision_config=config.tools.vision,
+        max_parallel_tools=config.tools.max_parallel_calls,
     )
 
     # Show spinner when logs are off (no output to miss); skip when logs are on
@@ -470,7 +721,9 @@ def agent(
         # Animated spinner is safe to use with prompt_toolkit input handling
         return console.status("[dim]nanobot is thinking...[/dim]", spinner="dots")
 
-    async def _cli_progress(content: str, *, tool_hint: bool = False) -> None:
+    async def _cli_progress(content: str, *, tool_hint: bool = False, stream: str | None = None) -> None:
+        if stream:
+            return  # Partial replies are not rendered in the terminal
         ch = agent_loop.channels_config
         if ch and tool_hint and not ch.send_tool_hints:
             return
@@ -485,6 +738,7 @@ def agent(
                 response = await agent_loop.process_direct(message, session_id, on_progress=_cli_progress)
             _print_agent_response(response, render_markdown=markdown)
             await agent_loop.close_mcp()
+            await HTTP_CLIENTS.aclose()
 
         asyncio.run(run_once())
     else:
@@ -515,6 +769,8 @@ def agent(
                 while True:
                     try:
                         msg = await asyncio.wait_for(bus.consume_outbound(), timeout=1.0)
+                        if msg.metadata.get("_stream"):
+                            continue
                         if msg.metadata.get("_progress"):
                             is_tool_hint = msg.metadata.get("_tool_hint", False)
                             ch = agent_loop.channels_config
@@ -580,6 +836,7 @@ def agent(
                 outbound_task.cancel()
                 await asyncio.gather(bus_task, outbound_task, return_exceptions=True)
                 await agent_loop.close_mcp()
+                await HTTP_CLIENTS.aclose()
 
         asyncio.run(run_interactive())
 
@@ -942,36 +1199,18 @@ def cron_run(
     """Manually run a job."""
     from loguru import logger
 
-    from nanobot.agent.loop import AgentLoop
-    from nanobot.bus.queue import MessageBus
     from nanobot.config.loader import get_data_dir, load_config
     from nanobot.cron.service import CronService
     from nanobot.cron.types import CronJob
+    from nanobot.net import HTTP_CLIENTS
     logger.disable("nanobot")
 
     config = load_config()
+    HTTP_CLIENTS.configure(config.http)
     provider = _make_provider(config)
-    bus = MessageBus()
-    agent_loop = AgentLoop(
-        bus=bus,
-        provider=provider,
-        workspace=config.workspace_path,
-        model=config.agents.defaults.model,
-        temperature=config.agents.defaults.temperature,
-        max_tokens=config.agents.defaults.max_tokens,
-        max_iterations=config.agents.defaults.max_tool_iterations,
-        memory_window=config.agents.defaults.memory_window,
-        brave_api_key=config.tools.web.search.api_key or None,
-        exec_config=config.tools.exec,
-        restrict_to_workspace=config.tools.restrict_to_workspace,
-        mcp_servers=config.tools.mcp_servers,
-        channels_config=config.channels,
-        kaizen_review_interval_days=config.agents.defaults.kaizen_review_interval_days,
-        vision_config=config.tools.vision,
-    )
-
-    store_path = get_data_dir() / "cron" / "jobs.json"
-    service = CronService(store_path)
+    bus = _make_bus(config)
+    service = CronService(get_data_dir() / "cron" / "jobs.json")
+    agent_loop = _make_agent_loop(config, bus, provider, _make_session_manager(config), service)
 
     result_holder = []
 
@@ -988,7 +1227,10 @@ def cron_run(
     service.on_job = on_job
 
     async def run():
-        return await service.run_job(job_id, force=force)
+        try:
+            return await service.run_job(job_id, force=force)
+        finally:
+            await HTTP_CLIENTS.aclose()
 
     if asyncio.run(run()):
         console.print("[green]✓[/green] Job executed")
@@ -1010,10 +1252,9 @@ app.add_typer(sessions_app, name="sessions")
 def sessions_list():
     """List all saved conversation sessions."""
     from nanobot.config.loader import load_config
-    from nanobot.session.manager import SessionManager
 
     config = load_config()
-    sm = SessionManager(config.workspace_path)
+    sm = _make_session_manager(config)
     items = sm.list_sessions()
     if not items:
         console.print("[dim]No sessions found.[/dim]")
@@ -1033,10 +1274,9 @@ def sessions_cleanup(
     from datetime import datetime, timezone
 
     from nanobot.config.loader import load_config
-    from nanobot.session.manager import SessionManager
 
     config = load_config()
-    sm = SessionManager(config.workspace_path)
+    sm = _make_session_manager(config)
     items = sm.list_sessions()
     now = datetime.now(tz=timezone.utc)
     deleted = 0
@@ -1053,18 +1293,15 @@ def sessions_cleanup(
             age_days = days + 1  # Treat unparseable dates as old
 
         if age_days >= days:
-            path = item.get("path")
-            if path:
-                if dry_run:
-                    console.print(f"[dim]Would delete:[/dim] {item['key']} (last updated {age_days}d ago)")
-                else:
-                    try:
-                        import os
-                        os.remove(path)
+            if dry_run:
+                console.print(f"[dim]Would delete:[/dim] {item['key']} (last updated {age_days}d ago)")
+            else:
+                try:
+                    if sm.delete(item["key"]):
                         console.print(f"[red]Deleted:[/red] {item['key']} (last updated {age_days}d ago)")
                         deleted += 1
-                    except Exception as e:
-                        console.print(f"[yellow]Warning:[/yellow] could not delete {path}: {e}")
+                except Exception as e:
+                    console.print(f"[yellow]Warning:[/yellow] could not delete {item['key']}: {e}")
         else:
             skipped += 1
 
@@ -1074,6 +1311,129 @@ def sessions_cleanup(
         console.print(f"\n[green]Done.[/green] Deleted {deleted} session(s), kept {skipped}.")
 
 
+@sessions_app.command("migrate")
+def sessions_migrate(
+    overwrite: bool = typer.Option(False, "--overwrite", help="Replace sessions already in the database"),
+):
+    """Import JSONL session files into the SQLite backend."""
+    from nanobot.config.loader import load_config
+    from nanobot.session.sqlite import SQLiteSessionManager
+
+    config = load_config()
+    sm = SQLiteSessionManager(config.workspace_path)
+    try:
+        imported = sm.migrate_from_jsonl(overwrite=overwrite)
+    finally:
+        sm.close()
+    console.print(f"[green]✓[/green] Imported {imported} session(s) into {sm.db_path}")
+    if config.agents.defaults.session_backend != "sqlite":
+        console.print('[dim]Set agents.defaults.sessionBackend to "sqlite" to use it.[/dim]')
+
+
+# ============================================================================
+# Usage Commands
+# ============================================================================
+
+
+@app.command()
+def usage(
+    by: str = typer.Option("day", "--by", "-b", help="Group by session, model, site or day"),
+    days: int = typer.Option(7, "--days", "-d", help="Only count the last N days (0 = all time)"),
+    limit: int = typer.Option(20, "--limit", "-n", help="Rows to show"),
+):
+    """Show LLM token usage and estimated cost."""
+    from datetime import date, timedelta
+
+    from nanobot.config.loader import get_data_dir
+    from nanobot.usage.ledger import GROUPINGS, UsageLedger
+
+    if by not in GROUPINGS:
+        console.print(f"[red]--by must be one of: {', '.join(GROUPINGS)}[/red]")
+        raise typer.Exit(1)
+    path = get_data_dir() / "usage" / "usage.db"
+    if not path.exists():
+        console.print("[dim]No usage recorded yet.[/dim]")
+        return
+
+    since = (date.today() - timedelta(days=days - 1)).isoformat() if days > 0 else None
+    ledger = UsageLedger(path)
+    try:
+        rows = ledger.summary(by=by, since_day=since, limit=limit)
+    finally:
+        ledger.close()
+    if not rows:
+        console.print("[dim]No usage in this period.[/dim]")
+        return
+
+    table = Table(title=f"LLM usage by {by}" + (f" (last {days} days)" if days > 0 else ""))
+    table.add_column(by.capitalize(), style="cyan")
+    for column in ("Calls", "Prompt", "Cache read", "Cache write", "Completion", "Cost (USD)"):
+        table.add_column(column, justify="right")
+    for row in rows:
+        table.add_row(
+            row[by] or "-", str(row["calls"]), f"{row['prompt_tokens']:,}", f"{row['cached_tokens']:,}",
+            f"{row['cache_write_tokens']:,}", f"{row['completion_tokens']:,}", f"{row['cost']:.4f}",
+        )
+    total = sum(row["cost"] for row in rows)
+    console.print(table)
+    console.print(f"Total shown: [bold]${total:.4f}[/bold]")
+
+
+# ============================================================================
+# Benchmark
+# ============================================================================
+
+
+@app.command()
+def bench(
+    sessions: int = typer.Option(10, "--sessions", "-n", help="Concurrent synthetic chat sessions"),
+    turns: int = typer.Option(5, "--turns", "-t", help="Messages per session"),
+    latency_ms: float = typer.Option(200.0, "--latency-ms", help="Simulated LLM latency per call"),
+    jitter_ms: float = typer.Option(0.0, "--jitter-ms", help="Extra random LLM latency (seeded) per call"),
+    fixture: Path | None = typer.Option(None, "--fixture", "-f", help="Replay responses recorded with --record"),
+    tools: bool = typer.Option(True, "--tools/--no-tools", help="Synthetic turns make one tool call before replying"),
+    logs: bool = typer.Option(False, "--logs/--no-logs", help="Show nanobot runtime logs"),
+):
+    """Benchmark the agent loop against a replayed LLM (no API calls)."""
+    import tempfile
+
+    from loguru import logger
+
+    from nanobot.bench.harness import run_bench
+    from nanobot.config.loader import load_config
+    from nanobot.providers.replay import ReplayProvider, load_fixture, synthetic_script
+
+    if not logs:
+        logger.disable("nanobot")
+
+    config = load_config()
+    records = load_fixture(fixture) if fixture else []
+    prompts = [r["prompt"] for r in records if r.get("step") == 0 and r.get("prompt")] or None
+    provider = ReplayProvider(
+        records, default=synthetic_script(tools), latency_s=latency_ms / 1000, jitter_s=jitter_ms / 1000,
+    )
+
+    with tempfile.TemporaryDirectory(prefix="nanobot-bench-") as workspace:
+        config.agents.defaults.workspace = workspace  # keep benchmark sessions out of the real workspace
+        sync_workspace_templates(config.workspace_path, silent=True)
+        bus = _make_bus(config)
+        agent_loop = _make_agent_loop(config, bus, provider, _make_session_manager(config), None)
+        console.print(f"{__logo__} Benchmarking {sessions} sessions x {turns} turns...")
+        result = asyncio.run(run_bench(agent_loop, bus, sessions=sessions, turns=turns, prompts=prompts))
+
+    table = Table(title="Agent benchmark")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right")
+    table.add_row("Turns", f"{result.turns} ({result.timeouts} timed out)")
+    table.add_row("LLM calls", str(result.llm_calls))
+    table.add_row("Throughput", f"{result.throughput:.1f} turns/s")
+    for q in (50, 95, 99):
+        table.add_row(f"p{q} turn latency", f"{result.percentile(q) * 1000:.1f} ms")
+    for stage, seconds in result.stage_breakdown().items():
+        table.add_row(f"{stage} / turn", f"{seconds * 1000:.1f} ms")
+    console.print(table)
+
+
 # ============================================================================
 # Status Commands
 # ============================================================================
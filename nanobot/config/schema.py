@@ -194,11 +194,46 @@ class QQConfig(Base):
     allow_from: list[str] = Field(default_factory=list)  # Allowed user openids (empty = public access)
     model: str = ""  # Per-channel model override; empty = use agent default
 
+class LoadgenStep(Base):
+    """One scripted message of the load generator."""
+
+    content: str = ""
+    media: list[str] = Field(default_factory=list)  # Local file paths attached to the message
+
+
+def _default_loadgen_script() -> list[LoadgenStep]:
+    return [
+        LoadgenStep(content="Hi! What can you help me with?"),
+        LoadgenStep(content="List the files in my workspace."),
+        LoadgenStep(content="/help"),
+        LoadgenStep(content="Summarise what we talked about so far."),
+        LoadgenStep(content="/stop"),
+    ]
+
+
+class LoadgenConfig(Base):
+    """Synthetic load generator channel, enabled only by the benchmark profile (gateway --bench)."""
+
+    enabled: bool = False
+    concurrency: list[int] = Field(default_factory=lambda: [1, 5, 10, 25, 50])  # Virtual chats in each stage
+    stage_duration_s: float = 30.0  # How long each stage sends messages
+    drain_s: float = 30.0  # Extra time a stage waits for outstanding replies
+    arrival_rate: float = 0.2  # Messages per second per virtual chat (Poisson)
+    seed: int = 0
+    llm_latency_ms: float = 500.0  # Stub LLM latency in the benchmark profile (negative = use the real provider)
+    report: str = ""  # Where to write the JSON report (default: <data dir>/loadgen/report-<timestamp>.json)
+    script: list[LoadgenStep] = Field(default_factory=_default_loadgen_script)  # Replayed in order by every chat
+
+
 class ChannelsConfig(Base):
     """Configuration for chat channels."""
 
     send_progress: bool = True    # stream agent's text progress to the channel
     send_tool_hints: bool = False  # stream tool-call hints (e.g. read_file("…"))
+    stream_replies: bool = False  # edit the reply in place as tokens arrive (channels that support it)
+    stream_interval_ms: int = 1000  # minimum gap between partial reply updates
+    send_concurrency: int = 4  # concurrent sends per channel (messages to the same chat stay in order)
+    coalesce_ms: int = 0  # merge a chat's messages sent within this window (or while it waits) into one turn; 0 = off
     whatsapp: WhatsAppConfig = Field(default_factory=WhatsAppConfig)
     telegram: TelegramConfig = Field(default_factory=TelegramConfig)
     discord: DiscordConfig = Field(default_factory=DiscordConfig)
@@ -209,6 +244,14 @@ class ChannelsConfig(Base):
     slack: SlackConfig = Field(default_factory=SlackConfig)
     qq: QQConfig = Field(default_factory=QQConfig)
     matrix: MatrixConfig = Field(default_factory=MatrixConfig)
+    loadgen: LoadgenConfig = Field(default_factory=LoadgenConfig)
+
+
+class RateLimitConfig(Base):
+    """Client-side request budget for one model or provider (0 = unlimited)."""
+
+    rpm: int = 0  # Requests per minute
+    tpm: int = 0  # Tokens per minute (prompt + completion, estimated before each call)
 
 
 class AgentDefaults(Base):
@@ -221,7 +264,16 @@ class AgentDefaults(Base):
     temperature: float = 0.1
     max_tool_iterations: int = 40
     memory_window: int = 100
+    context_window_tokens: int = 0  # > 0 trims history and triggers consolidation by estimated tokens instead of memoryWindow
+    model_context_windows: dict[str, int] = Field(default_factory=dict)  # Per-model overrides, e.g. {"openai/gpt-4o-mini": 128000}
     kaizen_review_interval_days: int = 1  # How often (in days) to review KAIZEN.md and pick tasks to automate
+    session_backend: Literal["jsonl", "sqlite"] = "jsonl"  # "sqlite" keeps all sessions in sessions/sessions.db
+    session_cache_size: int = 1000  # Max sessions kept in memory (0 = unlimited)
+    session_cache_mb: int = 256  # Approximate memory budget for cached sessions (0 = unlimited)
+    max_concurrent_turns: int = 8  # Turns processed at once across all sessions (0 = unlimited)
+    fallback_models: list[str] = Field(default_factory=list)  # Tried in order when the primary model keeps failing
+    llm_retries: int = 2  # Retries per model for rate limits, 5xx and network errors
+    rate_limits: dict[str, RateLimitConfig] = Field(default_factory=dict)  # Keyed by model or provider name, e.g. {"anthropic": {"rpm": 50, "tpm": 40000}}
 
 
 class AgentsConfig(Base):
@@ -267,11 +319,54 @@ class HeartbeatConfig(Base):
     interval_s: int = 30 * 60  # 30 minutes
 
 
+class BusConfig(Base):
+    """Message bus limits and overload handling."""
+
+    inbound_max: int = 1000  # Max queued inbound messages (0 = unbounded)
+    outbound_max: int = 1000  # Max queued outbound messages (0 = unbounded)
+    inbound_ttl_s: int = 600  # Drop inbound messages that waited longer than this (0 = never)
+    publish_timeout_s: float = 5.0  # How long a channel waits for room before the message is shed
+    busy_reply: str = "I'm busy right now, please try again shortly."
+    journal: bool = False  # Journal messages to <data dir>/bus/journal.db and replay them after a restart
+
+
+class ModelPriceConfig(Base):
+    """Price of one model in USD per million tokens."""
+
+    input: float = 0.0
+    output: float = 0.0
+    cached_input: float | None = None  # Prompt-cache reads (None = same as input)
+    cache_write_input: float | None = None  # Prompt-cache writes (None = same as input)
+
+
+class UsageConfig(Base):
+    """LLM usage ledger and spend budgets (USD, 0 = no budget)."""
+
+    enabled: bool = True  # Record every LLM call to <data dir>/usage/usage.db
+    session_budget_usd: float = 0.0  # Per-session spend before switching to budget_model
+    daily_budget_usd: float = 0.0  # Spend per calendar day before switching to budget_model
+    budget_model: str = ""  # Cheaper model used once a budget is spent (empty = budgets are not enforced)
+    prices: dict[str, ModelPriceConfig] = Field(default_factory=dict)  # Overrides LiteLLM's price table, keyed by model
+
+
+class HttpConfig(Base):
+    """Shared HTTP connection pools used by web tools, vision, transcription and the Codex provider."""
+
+    proxy: str | None = None  # HTTP/SOCKS5 proxy URL, e.g. "http://127.0.0.1:7890" or "socks5://127.0.0.1:1080"
+    http2: bool = True  # Negotiate HTTP/2 where the server supports it (needs the h2 package)
+    max_connections: int = 20  # Per host
+    max_keepalive_connections: int = 10  # Idle connections kept open per host
+    keepalive_expiry_s: float = 60.0  # Close idle connections after this long
+    max_hosts: int = 64  # Hosts with a pool of their own; further hosts share one pool
+
+
 class GatewayConfig(Base):
     """Gateway/server configuration."""
 
     host: str = "0.0.0.0"
     port: int = 18790
+    metrics: bool = True  # Serve /metrics and /health on host:port
+    workers: int = 0  # Agent worker processes sharded by session (0 = run the agent in the gateway process)
     heartbeat: HeartbeatConfig = Field(default_factory=HeartbeatConfig)
 
 
@@ -321,6 +416,7 @@ class ToolsConfig(Base):
     exec: ExecToolConfig = Field(default_factory=ExecToolConfig)
     vision: VisionConfig = Field(default_factory=VisionConfig)
     restrict_to_workspace: bool = False  # If true, restrict all tool access to workspace directory
+    max_parallel_calls: int = 4  # Max read-only tool calls run concurrently per iteration (1 = sequential)
     mcp_servers: dict[str, MCPServerConfig] = Field(default_factory=dict)
 
 
@@ -331,7 +427,10 @@ class Config(BaseSettings):
     channels: ChannelsConfig = Field(default_factory=ChannelsConfig)
     providers: ProvidersConfig = Field(default_factory=ProvidersConfig)
     gateway: GatewayConfig = Field(default_factory=GatewayConfig)
+    bus: BusConfig = Field(default_factory=BusConfig)
     tools: ToolsConfig = Field(default_factory=ToolsConfig)
+    usage: UsageConfig = Field(default_factory=UsageConfig)
+    http: HttpConfig = Field(default_factory=HttpConfig)
 
     @property
     def workspace_path(self) -> Path:
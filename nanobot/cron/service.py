@@ -4,13 +4,16 @@ import asyncio
 import json
 import time
 import uuid
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Coroutine
+from typing import Any, Callable, ContextManager, Coroutine, Iterator
 
 from loguru import logger
 
 from nanobot.cron.types import CronJob, CronJobState, CronPayload, CronSchedule, CronStore
+from nanobot.metrics.registry import CRON_JOB_SECONDS
+from nanobot.utils.helpers import file_lock, file_signature
 
 
 def _now_ms() -> int:
@@ -71,17 +74,39 @@ class CronService:
         self.store_path = store_path
         self.on_job = on_job  # Callback to execute job, returns response text
         self._store: CronStore | None = None
+        self._store_signature: tuple[int, int] | None = None
         self._timer_task: asyncio.Task | None = None
         self._running = False
+        self._lock_held = False
+
+    def _file_lock(self) -> ContextManager[None]:
+        return nullcontext() if self._lock_held else file_lock(self.store_path)
+
+    @contextmanager
+    def _locked_store(self) -> Iterator[CronStore]:
+        """
+        Hold the store's file lock across a load-modify-save.
+
+        Other processes (gateway workers) write the same jobs.json, so any change
+        must be applied to a fresh read under the lock, or it would overwrite theirs.
+        """
+        with file_lock(self.store_path):
+            self._lock_held = True
+            try:
+                yield self._load_store()
+            finally:
+                self._lock_held = False
 
     def _load_store(self) -> CronStore:
-        """Load jobs from disk."""
-        if self._store:
+        """Load jobs from disk, re-reading the file if another process changed it."""
+        if self._store and file_signature(self.store_path) == self._store_signature:
             return self._store
 
         if self.store_path.exists():
             try:
-                data = json.loads(self.store_path.read_text(encoding="utf-8"))
+                with self._file_lock():
+                    self._store_signature = file_signature(self.store_path)
+                    data = json.loads(self.store_path.read_text(encoding="utf-8"))
                 jobs = []
                 for j in data.get("jobs", []):
                     jobs.append(CronJob(
@@ -163,14 +188,22 @@ class CronService:
             ]
         }
 
-        self.store_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        with self._file_lock():
+            self.store_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+            self._store_signature = file_signature(self.store_path)
+
+    def refresh(self) -> None:
+        """Pick up jobs another process wrote to the store and re-arm the timer."""
+        if self._running and file_signature(self.store_path) != self._store_signature:
+            self._load_store()
+            self._arm_timer()
 
     async def start(self) -> None:
         """Start the cron service."""
         self._running = True
-        self._load_store()
-        self._recompute_next_runs()
-        self._save_store()
+        with self._locked_store():
+            self._recompute_next_runs()
+            self._save_store()
         self._arm_timer()
         logger.info("Cron service started with {} jobs", len(self._store.jobs if self._store else []))
 
@@ -231,9 +264,21 @@ class CronService:
         for job in due_jobs:
             await self._execute_job(job)
 
-        self._save_store()
+        self._record_runs(due_jobs)
         self._arm_timer()
 
+    def _record_runs(self, jobs: list[CronJob]) -> None:
+        """Write executed jobs back into a fresh read of the store, keeping jobs added meanwhile."""
+        ran = {j.id: j for j in jobs}
+        with self._locked_store() as store:
+            updated = []
+            for job in store.jobs:
+                job = ran.get(job.id, job)  # a job removed elsewhere while running stays removed
+                if not (job.id in ran and job.schedule.kind == "at" and job.delete_after_run):
+                    updated.append(job)
+            store.jobs = updated
+            self._save_store()
+
     async def _execute_job(self, job: CronJob) -> None:
         """Execute a single job."""
         start_ms = _now_ms()
@@ -254,12 +299,11 @@ class CronService:
 
         job.state.last_run_at_ms = start_ms
         job.updated_at_ms = _now_ms()
+        CRON_JOB_SECONDS.observe((job.updated_at_ms - start_ms) / 1000, status=job.state.last_status)
 
-        # Handle one-shot jobs
+        # Handle one-shot jobs (deleted ones are dropped by _record_runs)
         if job.schedule.kind == "at":
-            if job.delete_after_run:
-                self._store.jobs = [j for j in self._store.jobs if j.id != job.id]
-            else:
+            if not job.delete_after_run:
                 job.enabled = False
                 job.state.next_run_at_ms = None
         else:
@@ -285,7 +329,6 @@ class CronService:
         delete_after_run: bool = False,
     ) -> CronJob:
         """Add a new job."""
-        store = self._load_store()
         _validate_schedule_for_add(schedule)
         now = _now_ms()
 
@@ -307,8 +350,9 @@ class CronService:
             delete_after_run=delete_after_run,
         )
 
-        store.jobs.append(job)
-        self._save_store()
+        with self._locked_store() as store:
+            store.jobs.append(job)
+            self._save_store()
         self._arm_timer()
 
         logger.info("Cron: added job '{}' ({})", name, job.id)
@@ -316,13 +360,14 @@ class CronService:
 
     def remove_job(self, job_id: str) -> bool:
         """Remove a job by ID."""
-        store = self._load_store()
-        before = len(store.jobs)
-        store.jobs = [j for j in store.jobs if j.id != job_id]
-        removed = len(store.jobs) < before
+        with self._locked_store() as store:
+            before = len(store.jobs)
+            store.jobs = [j for j in store.jobs if j.id != job_id]
+            removed = len(store.jobs) < before
+            if removed:
+                self._save_store()
 
         if removed:
-            self._save_store()
             self._arm_timer()
             logger.info("Cron: removed job {}", job_id)
 
@@ -330,19 +375,19 @@ class CronService:
 
     def enable_job(self, job_id: str, enabled: bool = True) -> CronJob | None:
         """Enable or disable a job."""
-        store = self._load_store()
-        for job in store.jobs:
-            if job.id == job_id:
-                job.enabled = enabled
-                job.updated_at_ms = _now_ms()
-                if enabled:
-                    job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
-                else:
-                    job.state.next_run_at_ms = None
-                self._save_store()
-                self._arm_timer()
-                return job
-        return None
+        with self._locked_store() as store:
+            job = next((j for j in store.jobs if j.id == job_id), None)
+            if job is None:
+                return None
+            job.enabled = enabled
+            job.updated_at_ms = _now_ms()
+            if enabled:
+                job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
+            else:
+                job.state.next_run_at_ms = None
+            self._save_store()
+        self._arm_timer()
+        return job
 
     async def run_job(self, job_id: str, force: bool = False) -> bool:
         """Manually run a job."""
@@ -352,7 +397,7 @@ class CronService:
                 if not force and not job.enabled:
                     return False
                 await self._execute_job(job)
-                self._save_store()
+                self._record_runs([job])
                 self._arm_timer()
                 return True
         return False
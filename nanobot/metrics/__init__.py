@@ -0,0 +1,6 @@
+"""Runtime metrics and the gateway's HTTP metrics endpoint."""
+
+from nanobot.metrics.registry import METRICS, Counter, Gauge, Histogram, MetricsRegistry
+from nanobot.metrics.server import MetricsServer
+
+__all__ = ["METRICS", "Counter", "Gauge", "Histogram", "MetricsRegistry", "MetricsServer"]
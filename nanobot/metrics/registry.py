@@ -0,0 +1,233 @@
+"""In-process metrics in the Prometheus text exposition format."""
+
+import math
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable
+
+# Latency buckets in seconds, from fast tool calls to slow LLM turns.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labels)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self._samples()]
+
+    @abstractmethod
+    def _samples(self) -> list[str]:
+        pass
+
+
+class Counter(_Metric):
+    """A monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labels, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """A value that can go up and down, either set directly or read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._function: Callable[[], float] | None = None
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, fn: Callable[[], float] | Callable[[], dict[tuple[str, ...], float]] | None) -> None:
+        """Read the value from fn on every scrape; a labelled gauge's fn returns {label values: value}."""
+        self._function = fn
+
+    def _samples(self) -> list[str]:
+        if self._function is not None:
+            if not self.labels:
+                return [f"{self.name} {_format_value(self._function())}"]
+            items = sorted(self._function().items())
+            return [f"{self.name}{_format_labels(self.labels, k)} {_format_value(v)}" for k, v in items]
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labels, k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values (e.g. latencies) in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple[str, ...], list[float]] = {}  # bucket counts..., sum, count
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return int(series[-1]) if series else 0
+
+    def total(self) -> tuple[float, int]:
+        """(sum, count) of observations across all label values."""
+        with self._lock:
+            return sum(s[-2] for s in self._series.values()), int(sum(s[-1] for s in self._series.values()))
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        lines = []
+        for key, series in items:
+            for bound, n in zip((*self.buckets, math.inf), (*series[:-2], series[-1])):
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {_format_value(n)}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {_format_value(series[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """A named collection of metrics, rendered together for a scrape."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def _get_or_create(self, cls: type, name: str, *args, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, *args, **kwargs)
+        elif not isinstance(metric, cls):
+            raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+        return metric
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labels)
+
+    def gauge(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help, labels)
+
+    def histogram(
+        self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labels, buckets)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format."""
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+METRICS = MetricsRegistry()
+
+# Agent
+TURN_SECONDS = METRICS.histogram(
+    "nanobot_turn_seconds", "Time to process one inbound message, by channel.", ("channel",))
+LLM_REQUEST_SECONDS = METRICS.histogram(
+    "nanobot_llm_request_seconds", "LLM call latency, by model.", ("model",))
+LLM_TOKENS = METRICS.counter(
+    "nanobot_llm_tokens_total",
+    "Tokens reported by the provider, by model and kind (prompt, completion, cached, cache_write).",
+    ("model", "kind"))
+LLM_ERRORS = METRICS.counter(
+    "nanobot_llm_errors_total", "LLM calls that returned an error, by model.", ("model",))
+LLM_TIER_CALLS = METRICS.counter(
+    "nanobot_llm_tier_calls_total", "Successful LLM calls by serving tier (primary/fallbackN) and model.",
+    ("tier", "model"))
+LLM_RETRIES = METRICS.counter(
+    "nanobot_llm_retries_total", "LLM calls retried after a transient error, by model.", ("model",))
+LLM_CIRCUIT_OPEN = METRICS.gauge(
+    "nanobot_llm_circuit_open", "1 while a model's circuit breaker is open.", ("model",))
+LLM_THROTTLE_SECONDS = METRICS.histogram(
+    "nanobot_llm_throttle_seconds", "Time LLM calls waited for client-side rate limit budget.",
+    ("model", "priority"))
+TOOL_SECONDS = METRICS.histogram(
+    "nanobot_tool_seconds", "Tool execution latency, by tool.", ("tool",))
+TOOL_ERRORS = METRICS.counter(
+    "nanobot_tool_errors_total", "Tool calls that returned an error, by tool.", ("tool",))
+CONSOLIDATION_SECONDS = METRICS.histogram(
+    "nanobot_consolidation_seconds", "Memory consolidation duration, by outcome.", ("outcome",))
+
+# Bus
+QUEUE_WAIT_SECONDS = METRICS.histogram(
+    "nanobot_inbound_wait_seconds", "Time an inbound message waited before dispatch, by lane.", ("lane",))
+BUS_DROPPED = METRICS.counter(
+    "nanobot_bus_dropped_total", "Messages shed or expired instead of delivered.", ("queue", "reason"))
+
+# Services
+CRON_JOB_SECONDS = METRICS.histogram(
+    "nanobot_cron_job_seconds", "Cron job run time, by status.", ("status",))
+CHANNEL_SEND_FAILURES = METRICS.counter(
+    "nanobot_channel_send_failures_total", "Outbound messages a channel failed to send.", ("channel",))
+CHANNEL_SEND_SECONDS = METRICS.histogram(
+    "nanobot_channel_send_seconds", "Time spent in channel.send, by channel.", ("channel",))
+CHANNEL_OUTBOX_DEPTH = METRICS.gauge(
+    "nanobot_channel_outbox_depth", "Messages waiting in a channel's outbound queue.", ("channel",))
+
+# HTTP
+HTTP_CONNECTIONS = METRICS.gauge(
+    "nanobot_http_connections", "Pooled HTTP connections by host and state (active/idle).", ("host", "state"))
+HTTP_REQUESTS = METRICS.counter(
+    "nanobot_http_requests_total", "HTTP requests sent through the shared pools, by host.", ("host",))
@@ -0,0 +1,99 @@
+"""Minimal HTTP server exposing /metrics and /health on the gateway port."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from nanobot.metrics.registry import METRICS, MetricsRegistry
+
+if TYPE_CHECKING:
+    from nanobot.bus.queue import MessageBus
+    from nanobot.session.manager import SessionManager
+
+
+class MetricsServer:
+    """
+    Serve Prometheus metrics and a health check over plain HTTP/1.1.
+
+    Only GET /metrics and GET /health are handled; each connection answers
+    one request and closes, which is all a scraper or load balancer needs.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        bus: MessageBus | None = None,
+        sessions: SessionManager | None = None,
+        registry: MetricsRegistry = METRICS,
+    ):
+        self.host = host
+        self.port = port
+        self.registry = registry
+        self._server: asyncio.base_events.Server | None = None
+        self._started_at = time.monotonic()
+
+        if bus is not None:
+            registry.gauge("nanobot_bus_inbound_depth", "Messages waiting for the agent.").set_function(
+                lambda: bus.inbound_size)
+            registry.gauge("nanobot_bus_outbound_depth", "Replies waiting for channels.").set_function(
+                lambda: bus.outbound_size)
+            registry.gauge("nanobot_active_turns", "Sessions with a turn in flight.").set_function(
+                lambda: bus.inbound.active)
+            registry.gauge("nanobot_bus_inbound_high_water", "Most inbound messages queued at once.").set_function(
+                lambda: bus.inbound.high_water)
+            registry.gauge("nanobot_bus_outbound_high_water", "Most outbound messages queued at once.").set_function(
+                lambda: bus.outbound_high_water)
+        if sessions is not None:
+            for stat in ("entries", "bytes", "hits", "misses", "evictions"):
+                registry.gauge(f"nanobot_session_cache_{stat}", f"Session cache {stat}.").set_function(
+                    lambda stat=stat: sessions.cache_stats()[stat])
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        if self.port == 0:
+            self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("Metrics endpoint listening on http://{}:{}/metrics", self.host, self.port)
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5.0)
+            # Drain headers; the request body (if any) is ignored.
+            while (await asyncio.wait_for(reader.readline(), timeout=5.0)) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request_line.decode("latin-1").split()
+            method, path = (parts[0], parts[1].split("?", 1)[0]) if len(parts) >= 2 else ("", "")
+
+            if method != "GET":
+                status, ctype, body = "405 Method Not Allowed", "text/plain", "method not allowed\n"
+            elif path == "/metrics":
+                status, ctype, body = "200 OK", "text/plain; version=0.0.4", self.registry.render()
+            elif path in ("/health", "/healthz"):
+                payload = {"status": "ok", "uptime_s": round(time.monotonic() - self._started_at, 1)}
+                status, ctype, body = "200 OK", "application/json", json.dumps(payload)
+            else:
+                status, ctype, body = "404 Not Found", "text/plain", "not found\n"
+
+            data = body.encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {ctype}\r\nContent-Length: {len(data)}\r\n"
+                f"Connection: close\r\n\r\n".encode("latin-1") + data
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        except Exception as e:
+            logger.warning("Metrics request failed: {}", e)
+        finally:
+            writer.close()
@@ -0,0 +1,5 @@
+"""Shared HTTP connection pools."""
+
+from nanobot.net.clients import HTTP_CLIENTS, HttpClients
+
+__all__ = ["HTTP_CLIENTS", "HttpClients"]
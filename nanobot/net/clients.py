@@ -0,0 +1,116 @@
+"""Process-wide pooled HTTP clients, one connection pool per host."""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+from loguru import logger
+
+from nanobot.config.schema import HttpConfig
+from nanobot.metrics.registry import HTTP_CONNECTIONS, HTTP_REQUESTS
+
+MAX_REDIRECTS = 5  # Limit redirects to prevent DoS attacks
+HAS_H2 = importlib.util.find_spec("h2") is not None  # httpx only speaks HTTP/2 with the optional h2 package
+OTHER_HOSTS = "*"  # pool key shared by hosts beyond config.max_hosts
+
+
+def _host(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+class HttpClients:
+    """
+    Long-lived ``httpx.AsyncClient`` instances keyed by host, so repeated
+    searches, fetches, uploads and LLM calls reuse open TCP/TLS connections.
+
+    Each host gets its own pool with ``config``'s limits, keep-alive and proxy.
+    Once ``config.max_hosts`` pools exist, further hosts share a single pool,
+    which keeps fetches of arbitrary URLs from growing the registry without
+    bound. Per-request options (timeout, redirects) are passed by the caller.
+    Clients belong to the event loop that created them; a new loop (e.g. a
+    second ``asyncio.run``) starts with fresh clients.
+    """
+
+    def __init__(self, config: HttpConfig | None = None):
+        self.config = config or HttpConfig()
+        self._clients: dict[tuple[str, bool], httpx.AsyncClient] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        HTTP_CONNECTIONS.set_function(self.connection_counts)
+
+    def configure(self, config: HttpConfig) -> None:
+        """Use ``config`` for clients created from now on."""
+        self.config = config
+
+    def get(self, url: str, verify: bool = True) -> httpx.AsyncClient:
+        """The pooled client for ``url``'s host."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._clients = {}
+        host = _host(url)
+        if (host, verify) not in self._clients and len(self._clients) >= self.config.max_hosts:
+            host = OTHER_HOSTS
+        client = self._clients.get((host, verify))
+        if client is None:
+            client = self._clients[(host, verify)] = self._create(verify)
+        return client
+
+    def _create(self, verify: bool) -> httpx.AsyncClient:
+        config = self.config
+        return httpx.AsyncClient(
+            verify=verify,
+            http2=config.http2 and HAS_H2,
+            proxy=config.proxy or None,
+            max_redirects=MAX_REDIRECTS,
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry_s,
+            ),
+            event_hooks={"request": [_count_request]},
+        )
+
+    def connection_counts(self) -> dict[tuple[str, str], float]:
+        """{(host, "active" | "idle"): open connections} across all pools."""
+        counts: dict[tuple[str, str], float] = {}
+        for (host, _), client in list(self._clients.items()):
+            active, idle = _pool_usage(client)
+            counts[(host, "active")] = counts.get((host, "active"), 0) + active
+            counts[(host, "idle")] = counts.get((host, "idle"), 0) + idle
+        return counts
+
+    async def aclose(self) -> None:
+        """Close every pooled connection; called on shutdown."""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.debug("Error closing HTTP client: {}", e)
+
+
+async def _count_request(request: httpx.Request) -> None:
+    HTTP_REQUESTS.inc(host=request.url.host)
+
+
+def _pool_usage(client: httpx.AsyncClient) -> tuple[int, int]:
+    """(active, idle) connections of a client's transports; reads httpcore's pool state."""
+    active = idle = 0
+    transports: list[Any] = [client._transport, *client._mounts.values()]
+    for transport in transports:
+        for conn in getattr(getattr(transport, "_pool", None), "connections", ()):
+            if conn.is_closed():
+                continue
+            if conn.is_idle():
+                idle += 1
+            else:
+                active += 1
+    return active, idle
+
+
+HTTP_CLIENTS = HttpClients()
@@ -2,7 +2,9 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, AsyncIterator
+
+import json_repair
 
 
 @dataclass
@@ -21,6 +23,8 @@ class LLMResponse:
     finish_reason: str = "stop"
     usage: dict[str, int] = field(default_factory=dict)
     reasoning_content: str | None = None  # Kimi, DeepSeek-R1 etc.
+    error_status: int | None = None  # HTTP status of a failed call, when known
+    retry_after: float | None = None  # Seconds the provider asked us to wait before retrying
 
     @property
     def has_tool_calls(self) -> bool:
@@ -28,6 +32,152 @@ class LLMResponse:
         return len(self.tool_calls) > 0
 
 
+class ProviderHTTPError(RuntimeError):
+    """Non-2xx reply from a provider API, with the details needed to decide on a retry."""
+
+    def __init__(self, message: str, status_code: int, retry_after: float | None = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Any) -> float | None:
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None  # HTTP-date form is rare for LLM APIs; fall back to our own backoff
+
+
+def error_response(message: str, exc: Exception) -> LLMResponse:
+    """
+    Build the ``finish_reason="error"`` response providers return instead of raising.
+
+    Picks up the HTTP status and Retry-After header from OpenAI/LiteLLM/httpx
+    style exceptions so a retry layer can tell transient failures apart.
+    """
+    status = getattr(exc, "status_code", None)
+    retry_after = parse_retry_after(getattr(exc, "retry_after", None))
+    response = getattr(exc, "response", None)
+    if status is None and response is not None:
+        status = getattr(response, "status_code", None)
+    if retry_after is None and (headers := getattr(response, "headers", None)) is not None:
+        try:
+            retry_after = parse_retry_after(headers.get("retry-after"))
+        except Exception:
+            retry_after = None
+    return LLMResponse(
+        content=message,
+        finish_reason="error",
+        error_status=status if isinstance(status, int) else None,
+        retry_after=retry_after,
+    )
+
+
+def _get(obj: Any, name: str) -> Any:
+    return obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+
+
+def parse_usage(u: Any) -> dict[str, int]:
+    """
+    Normalise an OpenAI/LiteLLM usage object (or dict) into ``LLMResponse.usage``.
+
+    ``cached_tokens`` counts prompt tokens served from the provider's prompt
+    cache and ``cache_write_tokens`` those written to it; both are included
+    in ``prompt_tokens``.
+    """
+    if not u:
+        return {}
+    usage = {
+        "prompt_tokens": _get(u, "prompt_tokens") or 0,
+        "completion_tokens": _get(u, "completion_tokens") or 0,
+        "total_tokens": _get(u, "total_tokens") or 0,
+    }
+    details = _get(u, "prompt_tokens_details")
+    cached = (_get(details, "cached_tokens") if details else None) or _get(u, "cache_read_input_tokens")
+    if isinstance(cached, int) and cached:
+        usage["cached_tokens"] = cached
+    written = (
+        (_get(details, "cache_write_tokens") or _get(details, "cache_creation_tokens") if details else None)
+        or _get(u, "cache_creation_input_tokens")
+    )
+    if isinstance(written, int) and written:
+        usage["cache_write_tokens"] = written
+    return usage
+
+
+@dataclass
+class StreamChunk:
+    """
+    Incremental piece of a streamed chat completion.
+
+    Text arrives as ``content`` deltas, each completed tool call as ``tool_call``,
+    and the last chunk carries the fully assembled ``response``.
+    """
+    content: str = ""
+    tool_call: ToolCallRequest | None = None
+    response: LLMResponse | None = None
+
+
+class StreamAccumulator:
+    """Assemble OpenAI-style chat completion chunks into an LLMResponse."""
+
+    def __init__(self):
+        self._content: list[str] = []
+        self._reasoning: list[str] = []
+        self._tool_calls: dict[int, dict[str, str]] = {}
+        self.finish_reason = "stop"
+        self.usage: dict[str, int] = {}
+
+    def add(self, chunk: Any) -> str:
+        """Consume one chunk and return the text delta it carried."""
+        if u := getattr(chunk, "usage", None):
+            self.usage = parse_usage(u)
+        if not getattr(chunk, "choices", None):
+            return ""
+        choice = chunk.choices[0]
+        if choice.finish_reason:
+            self.finish_reason = choice.finish_reason
+        delta = choice.delta
+        if delta is None:
+            return ""
+        if reasoning := getattr(delta, "reasoning_content", None):
+            self._reasoning.append(reasoning)
+        for tc in getattr(delta, "tool_calls", None) or []:
+            index = tc.index if tc.index is not None else len(self._tool_calls)
+            buf = self._tool_calls.setdefault(index, {"id": "", "name": "", "arguments": ""})
+            if tc.id:
+                buf["id"] = tc.id
+            if fn := tc.function:
+                if fn.name:
+                    buf["name"] = fn.name
+                if fn.arguments:
+                    buf["arguments"] += fn.arguments
+        text = delta.content or ""
+        if text:
+            self._content.append(text)
+        return text
+
+    def tool_calls(self) -> list[ToolCallRequest]:
+        """Return the tool calls assembled so far, in index order."""
+        return [
+            ToolCallRequest(
+                id=buf["id"], name=buf["name"],
+                arguments=json_repair.loads(buf["arguments"]) if buf["arguments"] else {},
+            )
+            for _, buf in sorted(self._tool_calls.items())
+        ]
+
+    def build(self) -> LLMResponse:
+        """Build the final response from everything consumed."""
+        return LLMResponse(
+            content="".join(self._content) or None,
+            tool_calls=self.tool_calls(),
+            finish_reason=self.finish_reason,
+            usage=self.usage,
+            reasoning_content="".join(self._reasoning) or None,
+        )
+
+
 class LLMProvider(ABC):
     """
     Abstract base class for LLM providers.
@@ -47,38 +197,38 @@ class LLMProvider(ABC):
         Empty content can appear when MCP tools return nothing. Most providers
         reject empty-string content or empty text blocks in list content.
         """
-        result: list[dict[str, Any]] = []
-        for msg in messages:
-            content = msg.get("content")
+        return [LLMProvider._sanitize_empty_message(msg) for msg in messages]
+
+    @staticmethod
+    def _sanitize_empty_message(msg: dict[str, Any]) -> dict[str, Any]:
+        """One message of ``_sanitize_empty_content``: a fixed copy, or ``msg`` itself when it is fine."""
+        content = msg.get("content")
+
+        if isinstance(content, str) and not content:
+            clean = dict(msg)
+            clean["content"] = None if (msg.get("role") == "assistant" and msg.get("tool_calls")) else "(empty)"
+            return clean
 
-            if isinstance(content, str) and not content:
+        if isinstance(content, list):
+            filtered = [
+                item for item in content
+                if not (
+                    isinstance(item, dict)
+                    and item.get("type") in ("text", "input_text", "output_text")
+                    and not item.get("text")
+                )
+            ]
+            if len(filtered) != len(content):
                 clean = dict(msg)
-                clean["content"] = None if (msg.get("role") == "assistant" and msg.get("tool_calls")) else "(empty)"
-                result.append(clean)
-                continue
-
-            if isinstance(content, list):
-                filtered = [
-                    item for item in content
-                    if not (
-                        isinstance(item, dict)
-                        and item.get("type") in ("text", "input_text", "output_text")
-                        and not item.get("text")
-                    )
-                ]
-                if len(filtered) != len(content):
-                    clean = dict(msg)
-                    if filtered:
-                        clean["content"] = filtered
-                    elif msg.get("role") == "assistant" and msg.get("tool_calls"):
-                        clean["content"] = None
-                    else:
-                        clean["content"] = "(empty)"
-                    result.append(clean)
-                    continue
-
-            result.append(msg)
-        return result
+                if filtered:
+                    clean["content"] = filtered
+                elif msg.get("role") == "assistant" and msg.get("tool_calls"):
+                    clean["content"] = None
+                else:
+                    clean["content"] = "(empty)"
+                return clean
+
+        return msg
 
     @abstractmethod
     async def chat(
@@ -104,6 +254,25 @@ class LLMProvider(ABC):
         """
         pass
 
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamChunk]:
+        """
+        Stream a chat completion as text and tool-call deltas.
+
+        Providers without native streaming fall back to a single final chunk.
+        """
+        response = await self.chat(
+            messages=messages, tools=tools, model=model,
+            max_tokens=max_tokens, temperature=temperature,
+        )
+        yield StreamChunk(response=response)
+
     @abstractmethod
     def get_default_model(self) -> str:
         """Get the default model for this provider."""
@@ -1,19 +1,110 @@
 """LiteLLM provider implementation for multi-provider support."""
 
 import os
-from typing import Any
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator
 
 import json_repair
 import litellm
 from litellm import acompletion
 
-from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.base import (
+    LLMProvider,
+    LLMResponse,
+    StreamAccumulator,
+    StreamChunk,
+    ToolCallRequest,
+    error_response,
+    parse_usage,
+)
 from nanobot.providers.registry import find_by_model, find_gateway
 
 # Standard OpenAI chat-completion message keys plus reasoning_content for
 # thinking-enabled models (Kimi k2.5, DeepSeek-R1, etc.).
 _ALLOWED_MSG_KEYS = frozenset({"role", "content", "tool_calls", "tool_call_id", "name", "reasoning_content"})
 
+# Anthropic accepts at most four cache_control breakpoints per request.
+_CACHE_BREAKPOINTS = 4
+_EPHEMERAL = {"type": "ephemeral"}
+
+# Message lists whose sanitized form is kept between calls, roughly one per turn in flight.
+_PREPARED_LISTS = 64
+
+
+@dataclass
+class _ModelInfo:
+    """Registry lookups for one requested model string, done once per provider."""
+
+    litellm_model: str
+    cache_control: bool
+    overrides: dict[str, Any] = field(default_factory=dict)
+
+
+class _PreparedMessages:
+    """
+    Sanitized copy of one message list that grows between calls.
+
+    The agent loop appends to the same list on every iteration of a turn, so
+    only the messages added since the previous call are sanitized. If the
+    already-prepared prefix has changed, the whole list is prepared again.
+    """
+
+    def __init__(self, source: list[dict[str, Any]]):
+        self.source = source
+        self._seen: list[dict[str, Any]] = []
+        self._prepared: list[dict[str, Any]] = []
+
+    def update(self) -> list[dict[str, Any]]:
+        source, done = self.source, len(self._seen)
+        if len(source) < done or source[:done] != self._seen:
+            self._seen, self._prepared, done = [], [], 0
+        for msg in source[done:]:
+            self._seen.append(msg)
+            self._prepared.append(LiteLLMProvider._sanitize_message(msg))
+        return list(self._prepared)
+
+
+def _cacheable(msg: dict[str, Any]) -> bool:
+    """Whether a cache_control block can be attached (the message has text or parts)."""
+    content = msg.get("content")
+    return bool(content) and (isinstance(content, str) or isinstance(content[-1], dict))
+
+
+def _with_cache_control(msg: dict[str, Any]) -> dict[str, Any]:
+    """Copy of ``msg`` whose last content block carries an ephemeral cache_control."""
+    content = msg["content"]
+    if isinstance(content, str):
+        new_content = [{"type": "text", "text": content, "cache_control": _EPHEMERAL}]
+    else:
+        new_content = list(content)
+        new_content[-1] = {**new_content[-1], "cache_control": _EPHEMERAL}
+    return {**msg, "content": new_content}
+
+
+def _history_breakpoints(messages: list[dict[str, Any]], start: int, budget: int) -> list[int]:
+    """
+    Up to ``budget`` history positions after ``start`` to mark, newest first.
+
+    The first is the last message that can carry a breakpoint; each further
+    one is the last such message before the assistant reply that follows the
+    previous breakpoint's request, stepping back one agent-loop call at a time.
+    """
+    points: list[int] = []
+    i = len(messages) - 1
+    while budget > 0 and i >= start:
+        while i >= start and not _cacheable(messages[i]):
+            i -= 1
+        if i < start:
+            break
+        points.append(i)
+        budget -= 1
+        # Step back to the input of the previous call: everything before the latest assistant reply.
+        while i >= start and messages[i].get("role") != "assistant":
+            i -= 1
+        i -= 1
+    return points
+
 
 class LiteLLMProvider(LLMProvider):
     """
@@ -35,6 +126,8 @@ class LiteLLMProvider(LLMProvider):
         super().__init__(api_key, api_base)
         self.default_model = default_model
         self.extra_headers = extra_headers or {}
+        self._models: dict[str, _ModelInfo] = {}
+        self._prepared: OrderedDict[int, _PreparedMessages] = OrderedDict()
 
         # Detect gateway / local deployment.
         # provider_name (from config key) is the primary signal;
@@ -119,24 +212,32 @@ class LiteLLMProvider(LLMProvider):
         messages: list[dict[str, Any]],
         tools: list[dict[str, Any]] | None,
     ) -> tuple[list[dict[str, Any]], list[dict[str, Any]] | None]:
-        """Return copies of messages and tools with cache_control injected."""
-        new_messages = []
-        for msg in messages:
-            if msg.get("role") == "system":
-                content = msg["content"]
-                if isinstance(content, str):
-                    new_content = [{"type": "text", "text": content, "cache_control": {"type": "ephemeral"}}]
-                else:
-                    new_content = list(content)
-                    new_content[-1] = {**new_content[-1], "cache_control": {"type": "ephemeral"}}
-                new_messages.append({**msg, "content": new_content})
-            else:
-                new_messages.append(msg)
+        """
+        Return copies of messages and tools with cache_control breakpoints.
+
+        Breakpoints go on the system prompt and the last tool definition, and
+        the rest of the budget on the history: the end of this request (cached
+        for the next call) and the end of each earlier request in the turn,
+        i.e. the message before each assistant reply, where the previous calls
+        wrote their cache. Only the marked messages are copied.
+        """
+        new_messages = list(messages)
+        budget = _CACHE_BREAKPOINTS
 
         new_tools = tools
         if tools:
             new_tools = list(tools)
-            new_tools[-1] = {**new_tools[-1], "cache_control": {"type": "ephemeral"}}
+            new_tools[-1] = {**new_tools[-1], "cache_control": _EPHEMERAL}
+            budget -= 1
+
+        start = 0
+        while start < len(new_messages) and new_messages[start].get("role") == "system" and budget:
+            new_messages[start] = _with_cache_control(new_messages[start])
+            start += 1
+            budget -= 1
+
+        for i in _history_breakpoints(new_messages, start, budget):
+            new_messages[i] = _with_cache_control(new_messages[i])
 
         return new_messages, new_tools
 
@@ -150,43 +251,51 @@ class LiteLLMProvider(LLMProvider):
                     kwargs.update(overrides)
                     return
 
+    def _model_info(self, model: str) -> _ModelInfo:
+        """Resolved name, prompt-caching support and overrides of ``model``, memoized."""
+        info = self._models.get(model)
+        if info is None:
+            resolved = self._resolve_model(model)
+            info = _ModelInfo(resolved, self._supports_cache_control(model))
+            self._apply_model_overrides(resolved, info.overrides)
+            self._models[model] = info
+        return info
+
     @staticmethod
-    def _sanitize_messages(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        """Strip non-standard keys and ensure assistant messages have a content key."""
-        sanitized = []
-        for msg in messages:
-            clean = {k: v for k, v in msg.items() if k in _ALLOWED_MSG_KEYS}
-            # Strict providers require "content" even when assistant only has tool_calls
-            if clean.get("role") == "assistant" and "content" not in clean:
-                clean["content"] = None
-            sanitized.append(clean)
-        return sanitized
+    def _sanitize_message(msg: dict[str, Any]) -> dict[str, Any]:
+        """Fix empty content, strip non-standard keys and ensure assistant messages have a content key."""
+        msg = LLMProvider._sanitize_empty_message(msg)
+        clean = {k: v for k, v in msg.items() if k in _ALLOWED_MSG_KEYS}
+        # Strict providers require "content" even when assistant only has tool_calls
+        if clean.get("role") == "assistant" and "content" not in clean:
+            clean["content"] = None
+        return clean
+
+    def _prepare_messages(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Sanitized copy of ``messages``, reusing the work done for earlier calls with the same list."""
+        key = id(messages)
+        prepared = self._prepared.get(key)
+        if prepared is None or prepared.source is not messages:
+            prepared = self._prepared[key] = _PreparedMessages(messages)
+            if len(self._prepared) > _PREPARED_LISTS:
+                self._prepared.popitem(last=False)
+        else:
+            self._prepared.move_to_end(key)
+        return prepared.update()
 
-    async def chat(
+    def _build_kwargs(
         self,
         messages: list[dict[str, Any]],
-        tools: list[dict[str, Any]] | None = None,
-        model: str | None = None,
-        max_tokens: int = 4096,
-        temperature: float = 0.7,
-    ) -> LLMResponse:
-        """
-        Send a chat completion request via LiteLLM.
-
-        Args:
-            messages: List of message dicts with 'role' and 'content'.
-            tools: Optional list of tool definitions in OpenAI format.
-            model: Model identifier (e.g., 'anthropic/claude-sonnet-4-5').
-            max_tokens: Maximum tokens in response.
-            temperature: Sampling temperature.
-
-        Returns:
-            LLMResponse with content and/or tool calls.
-        """
-        original_model = model or self.default_model
-        model = self._resolve_model(original_model)
-
-        if self._supports_cache_control(original_model):
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+        max_tokens: int,
+        temperature: float,
+    ) -> dict[str, Any]:
+        """Build the acompletion() keyword arguments for one request."""
+        info = self._model_info(model or self.default_model)
+        messages = self._prepare_messages(messages)
+
+        if info.cache_control:
             messages, tools = self._apply_cache_control(messages, tools)
 
         # Clamp max_tokens to at least 1 — negative or zero values cause
@@ -194,14 +303,14 @@ class LiteLLMProvider(LLMProvider):
         max_tokens = max(1, max_tokens)
 
         kwargs: dict[str, Any] = {
-            "model": model,
-            "messages": self._sanitize_messages(self._sanitize_empty_content(messages)),
+            "model": info.litellm_model,
+            "messages": messages,
             "max_tokens": max_tokens,
             "temperature": temperature,
         }
 
         # Apply model-specific overrides (e.g. kimi-k2.5 temperature)
-        self._apply_model_overrides(model, kwargs)
+        kwargs.update(info.overrides)
 
         # Pass api_key directly — more reliable than env vars alone
         if self.api_key:
@@ -219,15 +328,61 @@ class LiteLLMProvider(LLMProvider):
             kwargs["tools"] = tools
             kwargs["tool_choice"] = "auto"
 
+        return kwargs
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        """
+        Send a chat completion request via LiteLLM.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'.
+            tools: Optional list of tool definitions in OpenAI format.
+            model: Model identifier (e.g., 'anthropic/claude-sonnet-4-5').
+            max_tokens: Maximum tokens in response.
+            temperature: Sampling temperature.
+
+        Returns:
+            LLMResponse with content and/or tool calls.
+        """
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature)
         try:
             response = await acompletion(**kwargs)
             return self._parse_response(response)
         except Exception as e:
             # Return error as content for graceful handling
-            return LLMResponse(
-                content=f"Error calling LLM: {str(e)}",
-                finish_reason="error",
-            )
+            return error_response(f"Error calling LLM: {str(e)}", e)
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamChunk]:
+        """Stream a chat completion via LiteLLM, yielding text deltas as they arrive."""
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature)
+        kwargs["stream"] = True
+        kwargs["stream_options"] = {"include_usage": True}
+        acc = StreamAccumulator()
+        try:
+            async for chunk in await acompletion(**kwargs):
+                if text := acc.add(chunk):
+                    yield StreamChunk(content=text)
+        except Exception as e:
+            yield StreamChunk(response=error_response(f"Error calling LLM: {str(e)}", e))
+            return
+        response = acc.build()
+        for tc in response.tool_calls:
+            yield StreamChunk(tool_call=tc)
+        yield StreamChunk(response=response)
 
     def _parse_response(self, response: Any) -> LLMResponse:
         """Parse LiteLLM response into our standard format."""
@@ -248,13 +403,7 @@ class LiteLLMProvider(LLMProvider):
                     arguments=args,
                 ))
 
-        usage = {}
-        if hasattr(response, "usage") and response.usage:
-            usage = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens,
-            }
+        usage = parse_usage(getattr(response, "usage", None))
 
         reasoning_content = getattr(message, "reasoning_content", None) or None
 
@@ -0,0 +1,118 @@
+"""Usage accounting and spend budgets around any LLMProvider."""
+
+from __future__ import annotations
+
+from typing import Any, AsyncIterator
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider, LLMResponse, StreamChunk
+from nanobot.usage.ledger import UsageLedger, current_usage_context
+
+
+class MeteredProvider(LLMProvider):
+    """Records the token usage and estimated cost of every call in a UsageLedger."""
+
+    def __init__(self, provider: LLMProvider, ledger: UsageLedger):
+        super().__init__(provider.api_key, provider.api_base)
+        self.provider = provider
+        self.ledger = ledger
+
+    def get_default_model(self) -> str:
+        return self.provider.get_default_model()
+
+    def _record(self, model: str, response: LLMResponse) -> None:
+        if not response.usage:
+            return
+        try:
+            self.ledger.record(model, response.usage)
+        except Exception:
+            logger.exception("Failed to record LLM usage")  # accounting must never fail a turn
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        model = model or self.get_default_model()
+        response = await self.provider.chat(
+            messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature,
+        )
+        self._record(model, response)
+        return response
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamChunk]:
+        model = model or self.get_default_model()
+        async for chunk in self.provider.chat_stream(
+            messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature,
+        ):
+            if chunk.response is not None:
+                self._record(model, chunk.response)
+            yield chunk
+
+
+class BudgetedProvider(LLMProvider):
+    """
+    Sends calls to a cheaper model once the caller's session or the day is over budget.
+
+    The session comes from the current usage context; budgets are the
+    ledger's. Calls within budget go to ``provider`` unchanged.
+    """
+
+    def __init__(self, provider: LLMProvider, ledger: UsageLedger, budget_provider: LLMProvider, budget_model: str):
+        super().__init__(provider.api_key, provider.api_base)
+        self.provider = provider
+        self.ledger = ledger
+        self.budget_provider = budget_provider
+        self.budget_model = budget_model
+        self._warned: set[tuple[str, str]] = set()
+
+    def get_default_model(self) -> str:
+        return self.provider.get_default_model()
+
+    def _route(self, model: str | None) -> tuple[LLMProvider, str | None]:
+        _, session = current_usage_context()
+        exceeded = self.ledger.over_budget(session)
+        if exceeded is None:
+            return self.provider, model
+        if (exceeded, session) not in self._warned:
+            self._warned.add((exceeded, session))
+            logger.warning("{} LLM budget used up (session {}), switching to {}", exceeded, session, self.budget_model)
+        return self.budget_provider, self.budget_model
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        provider, model = self._route(model)
+        return await provider.chat(
+            messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature,
+        )
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamChunk]:
+        provider, model = self._route(model)
+        async for chunk in provider.chat_stream(
+            messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature,
+        ):
+            yield chunk
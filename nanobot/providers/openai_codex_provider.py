@@ -5,24 +5,66 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import json
-from typing import Any, AsyncGenerator
+import time
+from typing import Any, AsyncGenerator, AsyncIterator
 
 import httpx
 from loguru import logger
 from oauth_cli_kit import get_token as get_codex_token
 
-from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.net import HTTP_CLIENTS
+from nanobot.providers.base import (
+    LLMProvider,
+    LLMResponse,
+    ProviderHTTPError,
+    StreamChunk,
+    ToolCallRequest,
+    error_response,
+    parse_retry_after,
+)
+from nanobot.usage.ledger import current_usage_context
 
 DEFAULT_CODEX_URL = "https://chatgpt.com/backend-api/codex/responses"
 DEFAULT_ORIGINATOR = "nanobot"
+TOKEN_REFRESH_MARGIN_S = 120  # refresh the OAuth token this long before it expires
 
 
 class OpenAICodexProvider(LLMProvider):
-    """Use Codex OAuth to call the Responses API."""
+    """
+    Use Codex OAuth to call the Responses API.
+
+    Requests go through the shared HTTP connection pool, and the OAuth token
+    is kept across calls; it is refreshed shortly before it expires or after a 401.
+    """
 
     def __init__(self, default_model: str = "openai-codex/gpt-5.1-codex"):
         super().__init__(api_key=None, api_base=None)
         self.default_model = default_model
+        self._token: Any = None
+        self._token_lock = asyncio.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def _get_token(self, refresh: bool = False) -> Any:
+        """
+        Cached OAuth token. ``get_codex_token`` (a file read, plus a refresh when
+        close to expiry) only runs when the cached token is about to expire or
+        after Codex rejected it. A rejected token may still look valid for
+        hours, so ``refresh`` asks for more lifetime than it has left, which
+        makes the kit refresh it instead of returning it again.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:  # an asyncio.Lock belongs to the loop that first used it
+            self._loop, self._token_lock = loop, asyncio.Lock()
+        async with self._token_lock:
+            token = self._token
+            remaining_s = token.expires / 1000 - time.time() if token is not None else 0
+            if refresh or remaining_s < TOKEN_REFRESH_MARGIN_S:
+                min_ttl = max(int(remaining_s), 0) + TOKEN_REFRESH_MARGIN_S if refresh else TOKEN_REFRESH_MARGIN_S
+                token = self._token = await asyncio.to_thread(get_codex_token, min_ttl_seconds=min_ttl)
+            return token
+
+    def _client(self, verify: bool) -> httpx.AsyncClient:
+        return HTTP_CLIENTS.get(DEFAULT_CODEX_URL, verify=verify)
 
     async def chat(
         self,
@@ -32,11 +74,23 @@ class OpenAICodexProvider(LLMProvider):
         max_tokens: int = 4096,
         temperature: float = 0.7,
     ) -> LLMResponse:
+        response = LLMResponse(content=None)
+        async for chunk in self.chat_stream(messages, tools, model, max_tokens, temperature):
+            if chunk.response is not None:
+                response = chunk.response
+        return response
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamChunk]:
         model = model or self.default_model
         system_prompt, input_items = _convert_messages(messages)
-
-        token = await asyncio.to_thread(get_codex_token)
-        headers = _build_headers(token.account_id, token.access)
+        converted_tools = _convert_tools(tools) if tools else None
 
         body: dict[str, Any] = {
             "model": _strip_model_prefix(model),
@@ -46,34 +100,39 @@ class OpenAICodexProvider(LLMProvider):
             "input": input_items,
             "text": {"verbosity": "medium"},
             "include": ["reasoning.encrypted_content"],
-            "prompt_cache_key": _prompt_cache_key(messages),
+            "prompt_cache_key": _prompt_cache_key(system_prompt, converted_tools, current_usage_context()[1]),
             "tool_choice": "auto",
             "parallel_tool_calls": True,
         }
 
-        if tools:
-            body["tools"] = _convert_tools(tools)
+        if converted_tools:
+            body["tools"] = converted_tools
 
-        url = DEFAULT_CODEX_URL
+        def stream(token: Any, verify: bool = True) -> AsyncGenerator[StreamChunk, None]:
+            headers = _build_headers(token.account_id, token.access)
+            return _stream_codex(self._client(verify), DEFAULT_CODEX_URL, headers, body)
 
         try:
+            token = await self._get_token()
+            started = False
             try:
-                content, tool_calls, finish_reason = await _request_codex(url, headers, body, verify=True)
+                async for chunk in stream(token):
+                    started = True
+                    yield chunk
+            except ProviderHTTPError as e:
+                if started or e.status_code != 401:
+                    raise
+                logger.info("Codex rejected the cached OAuth token; refreshing it")
+                async for chunk in stream(await self._get_token(refresh=True)):
+                    yield chunk
             except Exception as e:
-                if "CERTIFICATE_VERIFY_FAILED" not in str(e):
+                if started or "CERTIFICATE_VERIFY_FAILED" not in str(e):
                     raise
                 logger.warning("SSL certificate verification failed for Codex API; retrying with verify=False")
-                content, tool_calls, finish_reason = await _request_codex(url, headers, body, verify=False)
-            return LLMResponse(
-                content=content,
-                tool_calls=tool_calls,
-                finish_reason=finish_reason,
-            )
+                async for chunk in stream(token, verify=False):
+                    yield chunk
         except Exception as e:
-            return LLMResponse(
-                content=f"Error calling Codex: {str(e)}",
-                finish_reason="error",
-            )
+            yield StreamChunk(response=error_response(f"Error calling Codex: {str(e)}", e))
 
     def get_default_model(self) -> str:
         return self.default_model
@@ -97,18 +156,22 @@ def _build_headers(account_id: str, token: str) -> dict[str, str]:
     }
 
 
-async def _request_codex(
+async def _stream_codex(
+    client: httpx.AsyncClient,
     url: str,
     headers: dict[str, str],
     body: dict[str, Any],
-    verify: bool,
-) -> tuple[str, list[ToolCallRequest], str]:
-    async with httpx.AsyncClient(timeout=60.0, verify=verify) as client:
-        async with client.stream("POST", url, headers=headers, json=body) as response:
-            if response.status_code != 200:
-                text = await response.aread()
-                raise RuntimeError(_friendly_error(response.status_code, text.decode("utf-8", "ignore")))
-            return await _consume_sse(response)
+) -> AsyncGenerator[StreamChunk, None]:
+    async with client.stream("POST", url, headers=headers, json=body, timeout=60.0) as response:
+        if response.status_code != 200:
+            text = await response.aread()
+            raise ProviderHTTPError(
+                _friendly_error(response.status_code, text.decode("utf-8", "ignore")),
+                response.status_code,
+                parse_retry_after(response.headers.get("retry-after")),
+            )
+        async for chunk in _stream_sse(response):
+            yield chunk
 
 
 def _convert_tools(tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
@@ -217,9 +280,18 @@ def _split_tool_call_id(tool_call_id: Any) -> tuple[str, str | None]:
     return "call_0", None
 
 
-def _prompt_cache_key(messages: list[dict[str, Any]]) -> str:
-    raw = json.dumps(messages, ensure_ascii=True, sort_keys=True)
-    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+def _prompt_cache_key(system_prompt: str, tools: list[dict[str, Any]] | None, session: str) -> str:
+    """
+    Key for server-side prompt caching, built from the parts of a request that
+    stay the same across a session's turns (system prompt, tools, session).
+
+    Hashing the whole history would give every turn a new key and defeat the cache.
+    """
+    digest = hashlib.sha256()
+    for part in (session, system_prompt, json.dumps(tools or [], ensure_ascii=True, sort_keys=True)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
 
 
 async def _iter_sse(response: httpx.Response) -> AsyncGenerator[dict[str, Any], None]:
@@ -242,11 +314,12 @@ async def _iter_sse(response: httpx.Response) -> AsyncGenerator[dict[str, Any],
         buffer.append(line)
 
 
-async def _consume_sse(response: httpx.Response) -> tuple[str, list[ToolCallRequest], str]:
+async def _stream_sse(response: httpx.Response) -> AsyncGenerator[StreamChunk, None]:
     content = ""
     tool_calls: list[ToolCallRequest] = []
     tool_call_buffers: dict[str, dict[str, Any]] = {}
     finish_reason = "stop"
+    usage: dict[str, int] = {}
 
     async for event in _iter_sse(response):
         event_type = event.get("type")
@@ -262,7 +335,10 @@ async def _consume_sse(response: httpx.Response) -> tuple[str, list[ToolCallRequ
                     "arguments": item.get("arguments") or "",
                 }
         elif event_type == "response.output_text.delta":
-            content += event.get("delta") or ""
+            delta = event.get("delta") or ""
+            if delta:
+                content += delta
+                yield StreamChunk(content=delta)
         elif event_type == "response.function_call_arguments.delta":
             call_id = event.get("call_id")
             if call_id and call_id in tool_call_buffers:
@@ -283,20 +359,23 @@ async def _consume_sse(response: httpx.Response) -> tuple[str, list[ToolCallRequ
                     args = json.loads(args_raw)
                 except Exception:
                     args = {"raw": args_raw}
-                tool_calls.append(
-                    ToolCallRequest(
-                        id=f"{call_id}|{buf.get('id') or item.get('id') or 'fc_0'}",
-                        name=buf.get("name") or item.get("name"),
-                        arguments=args,
-                    )
+                tool_call = ToolCallRequest(
+                    id=f"{call_id}|{buf.get('id') or item.get('id') or 'fc_0'}",
+                    name=buf.get("name") or item.get("name"),
+                    arguments=args,
                 )
+                tool_calls.append(tool_call)
+                yield StreamChunk(tool_call=tool_call)
         elif event_type == "response.completed":
-            status = (event.get("response") or {}).get("status")
-            finish_reason = _map_finish_reason(status)
+            completed = event.get("response") or {}
+            finish_reason = _map_finish_reason(completed.get("status"))
+            usage = _map_usage(completed.get("usage"))
         elif event_type in {"error", "response.failed"}:
             raise RuntimeError("Codex response failed")
 
-    return content, tool_calls, finish_reason
+    yield StreamChunk(response=LLMResponse(
+        content=content, tool_calls=tool_calls, finish_reason=finish_reason, usage=usage,
+    ))
 
 
 _FINISH_REASON_MAP = {"completed": "stop", "incomplete": "length", "failed": "error", "cancelled": "error"}
@@ -306,6 +385,22 @@ def _map_finish_reason(status: str | None) -> str:
     return _FINISH_REASON_MAP.get(status or "completed", "stop")
 
 
+def _map_usage(usage: dict[str, Any] | None) -> dict[str, int]:
+    """Responses API usage -> the chat-completions keys used by ``LLMResponse.usage``."""
+    if not usage:
+        return {}
+    prompt = usage.get("input_tokens") or 0
+    completion = usage.get("output_tokens") or 0
+    mapped = {
+        "prompt_tokens": prompt,
+        "completion_tokens": completion,
+        "total_tokens": usage.get("total_tokens") or prompt + completion,
+    }
+    if cached := (usage.get("input_tokens_details") or {}).get("cached_tokens"):
+        mapped["cached_tokens"] = cached
+    return mapped
+
+
 def _friendly_error(status_code: int, raw: str) -> str:
     if status_code == 429:
         return "ChatGPT usage quota exceeded or rate limit triggered. Please try again later."
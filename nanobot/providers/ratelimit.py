@@ -0,0 +1,235 @@
+"""Client-side LLM rate limiting shared by every caller of a provider."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, AsyncIterator, Callable, Iterator
+
+from nanobot.metrics.registry import LLM_THROTTLE_SECONDS
+from nanobot.providers.base import LLMProvider, LLMResponse, StreamChunk
+from nanobot.utils.tokens import estimate_message_tokens, estimate_tokens
+
+
+class Priority(IntEnum):
+    """Admission order when callers wait for rate limit budget (lower goes first)."""
+
+    INTERACTIVE = 0  # turns a person is waiting on
+    SUBAGENT = 1  # spawned subagent work
+    BACKGROUND = 2  # consolidation, kaizen, heartbeat, cron
+
+
+_priority: ContextVar[Priority] = ContextVar("llm_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def llm_priority(priority: Priority) -> Iterator[None]:
+    """Run LLM calls made in this block (and tasks created in it) at ``priority``."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> Priority:
+    return _priority.get()
+
+
+class TokenBucket:
+    """Refills ``per_minute`` units evenly over a minute, holding at most a minute's worth."""
+
+    def __init__(self, per_minute: int, clock: Callable[[], float] = time.monotonic):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.clock = clock
+        self.updated = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` can be taken (0 if available now)."""
+        self._refill()
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.level -= amount  # may go negative: an oversized call is paid back before the next one
+
+    def adjust(self, amount: float) -> None:
+        """Correct an earlier estimate once the real usage is known."""
+        self._refill()
+        self.level = min(self.capacity, self.level - amount)
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute budget for one provider or model.
+
+    Callers queue in (priority, arrival) order and only the head of the queue
+    may take budget, so an interactive turn never waits behind a batch of
+    background consolidations that arrived first.
+    """
+
+    def __init__(self, name: str, rpm: int = 0, tpm: int = 0, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.clock = clock
+        self.requests = TokenBucket(rpm, clock) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm, clock) if tpm > 0 else None
+        self._waiters: list[tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._changed = asyncio.Condition()
+
+    def _wait_time(self, tokens: int) -> float:
+        wait = 0.0
+        if self.requests:
+            wait = self.requests.wait_time(1)
+        if self.tokens:
+            wait = max(wait, self.tokens.wait_time(tokens))
+        return wait
+
+    async def acquire(self, tokens: int, priority: Priority = Priority.INTERACTIVE) -> float:
+        """Wait until a call of about ``tokens`` tokens fits the budget; returns seconds waited."""
+        if not self.requests and not self.tokens:
+            return 0.0
+        started = self.clock()
+        ticket = (int(priority), next(self._seq))
+        heapq.heappush(self._waiters, ticket)
+        try:
+            async with self._changed:
+                while True:
+                    timeout = None
+                    if self._waiters[0] == ticket:
+                        timeout = self._wait_time(tokens)
+                        if timeout <= 0:
+                            break
+                    try:
+                        await asyncio.wait_for(self._changed.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                if self.requests:
+                    self.requests.take(1)
+                if self.tokens:
+                    self.tokens.take(tokens)
+        finally:
+            self._waiters.remove(ticket)
+            heapq.heapify(self._waiters)
+            async with self._changed:
+                self._changed.notify_all()
+        return self.clock() - started
+
+    def settle(self, estimated: int, actual: int) -> None:
+        """Charge the difference between the estimated and reported token usage."""
+        if self.tokens and actual:
+            self.tokens.adjust(actual - estimated)
+
+
+class RateLimiters:
+    """
+    Limiters keyed by config entry, so every provider wrapper shares them.
+
+    ``limits`` maps a model name ("anthropic/claude-opus-4-5") or a provider
+    name ("anthropic") to {"rpm": ..., "tpm": ...}. A model entry wins over its
+    provider's; all models under a provider entry share one budget.
+    """
+
+    def __init__(
+        self, limits: dict[str, dict[str, int]] | None = None, clock: Callable[[], float] = time.monotonic,
+    ):
+        self.limits = limits or {}
+        self.clock = clock
+        self._limiters: dict[str, RateLimiter] = {}
+
+    def get(self, model: str, provider_name: str | None = None) -> RateLimiter | None:
+        key = model if model in self.limits else provider_name
+        if key not in self.limits:
+            return None
+        if key not in self._limiters:
+            limit = self.limits[key]
+            self._limiters[key] = RateLimiter(
+                key, rpm=limit.get("rpm", 0), tpm=limit.get("tpm", 0), clock=self.clock,
+            )
+        return self._limiters[key]
+
+
+def estimate_request_tokens(
+    messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None, max_tokens: int,
+) -> int:
+    """Upper-bound guess of a call's token usage: the prompt plus the full completion budget."""
+    prompt = sum(estimate_message_tokens(m) for m in messages)
+    if tools:
+        prompt += sum(estimate_tokens(str(t)) for t in tools)
+    return prompt + max_tokens
+
+
+class RateLimitedProvider(LLMProvider):
+    """Waits for rate limit budget before each call to the wrapped provider."""
+
+    def __init__(self, provider: LLMProvider, limiters: RateLimiters, provider_name: str | None = None):
+        super().__init__(provider.api_key, provider.api_base)
+        self.provider = provider
+        self.limiters = limiters
+        self.provider_name = provider_name
+
+    def get_default_model(self) -> str:
+        return self.provider.get_default_model()
+
+    async def _admit(
+        self, model: str, messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None, max_tokens: int,
+    ) -> tuple[RateLimiter | None, int]:
+        limiter = self.limiters.get(model, self.provider_name)
+        if limiter is None:
+            return None, 0
+        estimated = estimate_request_tokens(messages, tools, max_tokens)
+        priority = current_priority()
+        waited = await limiter.acquire(estimated, priority)
+        LLM_THROTTLE_SECONDS.observe(waited, model=model, priority=priority.name.lower())
+        return limiter, estimated
+
+    @staticmethod
+    def _settle(limiter: RateLimiter | None, estimated: int, response: LLMResponse) -> None:
+        if limiter is not None:
+            limiter.settle(estimated, response.usage.get("total_tokens", 0))
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        model = model or self.get_default_model()
+        limiter, estimated = await self._admit(model, messages, tools, max_tokens)
+        response = await self.provider.chat(
+            messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature,
+        )
+        self._settle(limiter, estimated, response)
+        return response
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamChunk]:
+        model = model or self.get_default_model()
+        limiter, estimated = await self._admit(model, messages, tools, max_tokens)
+        async for chunk in self.provider.chat_stream(
+            messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature,
+        ):
+            if chunk.response is not None:
+                self._settle(limiter, estimated, chunk.response)
+            yield chunk
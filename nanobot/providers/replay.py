@@ -0,0 +1,207 @@
+"""Deterministic LLM replay for benchmarks and tests, and the recorder that captures fixtures."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import random
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+from nanobot.providers.base import LLMProvider, LLMResponse, StreamChunk, ToolCallRequest
+
+# Prefix of the runtime metadata message ContextBuilder puts before each user message.
+_RUNTIME_CONTEXT_PREFIX = "[Runtime Context"
+
+
+def _text(content: Any) -> str:
+    if isinstance(content, list):
+        return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content or ""
+
+
+def turn_position(messages: list[dict[str, Any]]) -> tuple[str, int]:
+    """
+    (user text, step) of the call being made.
+
+    The user text is the latest real user message; the step counts the
+    assistant replies already made to it, so a turn with two tool rounds
+    makes calls at steps 0, 1 and 2.
+    """
+    for i in range(len(messages) - 1, -1, -1):
+        msg = messages[i]
+        if msg.get("role") != "user":
+            continue
+        text = _text(msg.get("content"))
+        if text.startswith(_RUNTIME_CONTEXT_PREFIX):
+            continue
+        step = sum(1 for m in messages[i + 1:] if m.get("role") == "assistant")
+        return text, step
+    return "", sum(1 for m in messages if m.get("role") == "assistant")
+
+
+def turn_key(messages: list[dict[str, Any]]) -> str:
+    """Fixture key of a call: a digest of the user text and the step within its turn."""
+    text, step = turn_position(messages)
+    return f"{hashlib.sha1(text.encode()).hexdigest()[:16]}:{step}"
+
+
+def response_to_dict(response: LLMResponse) -> dict[str, Any]:
+    return {
+        "content": response.content,
+        "tool_calls": [{"id": tc.id, "name": tc.name, "arguments": tc.arguments} for tc in response.tool_calls],
+        "finish_reason": response.finish_reason,
+        "usage": response.usage,
+        "reasoning_content": response.reasoning_content,
+    }
+
+
+def response_from_dict(data: dict[str, Any]) -> LLMResponse:
+    return LLMResponse(
+        content=data.get("content"),
+        tool_calls=[ToolCallRequest(**tc) for tc in data.get("tool_calls") or []],
+        finish_reason=data.get("finish_reason") or "stop",
+        usage=dict(data.get("usage") or {}),
+        reasoning_content=data.get("reasoning_content"),
+    )
+
+
+def load_fixture(path: Path) -> list[dict[str, Any]]:
+    """Records of a fixture file written by RecordingProvider (one JSON object per line)."""
+    records = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line.strip():
+            records.append(json.loads(line))
+    return records
+
+
+def synthetic_script(tools: bool = True) -> list[LLMResponse]:
+    """Default replies for unrecorded turns: optionally list the workspace, then answer."""
+    script = [LLMResponse(content="Done.")]
+    if tools:
+        script.insert(0, LLMResponse(
+            content=None, finish_reason="tool_calls",
+            tool_calls=[ToolCallRequest(id="call_bench", name="list_dir", arguments={"path": "."})],
+        ))
+    return script
+
+
+class ReplayProvider(LLMProvider):
+    """
+    Serves recorded responses instead of calling an LLM.
+
+    Each call is matched to a record by ``turn_key``; a key recorded more than
+    once is served in recorded order, wrapping around. Calls with no record get
+    ``default[step]`` (the last entry for later steps), so a short script such
+    as "call a tool, then answer" drives any number of synthetic turns.
+    Replies are returned after ``latency_s`` plus up to ``jitter_s`` of seeded
+    random delay.
+    """
+
+    def __init__(
+        self,
+        records: list[dict[str, Any]] | None = None,
+        default: list[LLMResponse] | None = None,
+        latency_s: float = 0.0,
+        jitter_s: float = 0.0,
+        seed: int = 0,
+        model: str = "replay",
+    ):
+        super().__init__()
+        self._responses: dict[str, list[LLMResponse]] = defaultdict(list)
+        for record in records or []:
+            self._responses[record["key"]].append(response_from_dict(record["response"]))
+        self._served: dict[str, int] = defaultdict(int)
+        self.default = default or [LLMResponse(content="ok")]
+        self.latency_s = latency_s
+        self.jitter_s = jitter_s
+        self._random = random.Random(seed)
+        self.model = model
+        self.calls = 0
+
+    @classmethod
+    def from_fixture(cls, path: Path, **kwargs: Any) -> ReplayProvider:
+        return cls(load_fixture(path), **kwargs)
+
+    def get_default_model(self) -> str:
+        return self.model
+
+    def _next(self, messages: list[dict[str, Any]]) -> LLMResponse:
+        key = turn_key(messages)
+        if recorded := self._responses.get(key):
+            response = recorded[self._served[key] % len(recorded)]
+            self._served[key] += 1
+        else:
+            _, step = turn_position(messages)
+            response = self.default[min(step, len(self.default) - 1)]
+        self.calls += 1
+        return response_from_dict(response_to_dict(response))  # callers may mutate what they get
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        response = self._next(messages)
+        delay = self.latency_s + (self._random.uniform(0, self.jitter_s) if self.jitter_s else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return response
+
+
+class RecordingProvider(LLMProvider):
+    """Passes calls through to ``provider`` and appends each (key, response) to a fixture file."""
+
+    def __init__(self, provider: LLMProvider, path: Path):
+        super().__init__(provider.api_key, provider.api_base)
+        self.provider = provider
+        self.path = path
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+    def get_default_model(self) -> str:
+        return self.provider.get_default_model()
+
+    def _record(self, messages: list[dict[str, Any]], response: LLMResponse) -> None:
+        if response.finish_reason == "error":
+            return
+        text, step = turn_position(messages)
+        record = {"key": turn_key(messages), "prompt": text, "step": step, "response": response_to_dict(response)}
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        response = await self.provider.chat(
+            messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature,
+        )
+        self._record(messages, response)
+        return response
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamChunk]:
+        async for chunk in self.provider.chat_stream(
+            messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature,
+        ):
+            if chunk.response is not None:
+                self._record(messages, chunk.response)
+            yield chunk
@@ -0,0 +1,191 @@
+"""Retry, circuit breaking and model fallback around any LLMProvider."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from typing import Any, AsyncIterator
+
+from loguru import logger
+
+from nanobot.metrics.registry import LLM_CIRCUIT_OPEN, LLM_RETRIES, LLM_TIER_CALLS
+from nanobot.providers.base import LLMProvider, LLMResponse, StreamChunk
+
+# Statuses worth retrying on the same model; anything else (bad request, auth)
+# goes straight to the next tier. No status means a network-level failure.
+RETRYABLE_STATUSES = frozenset({408, 409, 425, 429, 500, 502, 503, 504, 529})
+
+
+def is_retryable(response: LLMResponse) -> bool:
+    return response.error_status is None or response.error_status in RETRYABLE_STATUSES
+
+
+class CircuitBreaker:
+    """
+    Per-model breaker: opens after ``failure_threshold`` consecutive failed calls
+    and lets a single trial call through once ``reset_timeout_s`` has passed.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout_s: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self.failures = 0
+        self.opened_at: float | None = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.reset_timeout_s else "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "half_open":
+            self.opened_at = time.monotonic()  # one trial call per timeout window
+        return state != "open"
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class ResilientProvider(LLMProvider):
+    """
+    Wraps a primary provider with retries and an ordered fallback chain.
+
+    Each tier is a (provider, model) pair; the primary tier uses the model the
+    caller asked for. Retryable errors (429, 5xx, network) are retried with
+    full-jitter exponential backoff, honouring Retry-After; other errors and
+    exhausted retries move on to the next tier. A tier whose model's circuit
+    breaker is open is skipped. If every tier fails, the last error response
+    is returned, as the wrapped providers would have done.
+    """
+
+    def __init__(
+        self,
+        primary: LLMProvider,
+        fallbacks: list[tuple[LLMProvider, str]] | None = None,
+        max_retries: int = 2,
+        base_delay_s: float = 1.0,
+        max_delay_s: float = 30.0,
+        failure_threshold: int = 5,
+        reset_timeout_s: float = 30.0,
+    ):
+        super().__init__(primary.api_key, primary.api_base)
+        self.primary = primary
+        self.fallbacks = fallbacks or []
+        self.max_retries = max_retries
+        self.base_delay_s = base_delay_s
+        self.max_delay_s = max_delay_s
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get_default_model(self) -> str:
+        return self.primary.get_default_model()
+
+    def breaker(self, model: str) -> CircuitBreaker:
+        if model not in self._breakers:
+            self._breakers[model] = CircuitBreaker(self.failure_threshold, self.reset_timeout_s)
+        return self._breakers[model]
+
+    def _tiers(self, model: str | None) -> list[tuple[str, LLMProvider, str]]:
+        tiers = [("primary", self.primary, model or self.primary.get_default_model())]
+        tiers += [(f"fallback{i}", p, m) for i, (p, m) in enumerate(self.fallbacks, 1)]
+        return tiers
+
+    def _delay(self, attempt: int, response: LLMResponse) -> float:
+        if response.retry_after is not None:
+            return min(response.retry_after, self.max_delay_s)
+        return random.uniform(0, min(self.max_delay_s, self.base_delay_s * 2 ** attempt))
+
+    def _record(self, tier: str, model: str, response: LLMResponse) -> None:
+        breaker = self.breaker(model)
+        failed = response.finish_reason == "error"
+        # Only outages count against the model: a rejected request (say, one chat's
+        # oversized prompt) shows the model is up and must not open it for everyone.
+        if failed and is_retryable(response):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        if not failed:
+            LLM_TIER_CALLS.inc(tier=tier, model=model)
+        LLM_CIRCUIT_OPEN.set(1 if breaker.opened_at is not None else 0, model=model)
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        last: LLMResponse | None = None
+        for tier, provider, tier_model in self._tiers(model):
+            if not self.breaker(tier_model).allow():
+                continue
+            for attempt in range(self.max_retries + 1):
+                response = await provider.chat(
+                    messages=messages, tools=tools, model=tier_model,
+                    max_tokens=max_tokens, temperature=temperature,
+                )
+                self._record(tier, tier_model, response)
+                if response.finish_reason != "error":
+                    return response
+                last = response
+                if attempt == self.max_retries or not is_retryable(response):
+                    break
+                await self._backoff(tier_model, attempt, response)
+            logger.warning("LLM tier {} ({}) failed: {}", tier, tier_model, (last.content or "")[:200])
+        return last or LLMResponse(content="Error calling LLM: all models unavailable", finish_reason="error")
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamChunk]:
+        """Like chat, but a call can only be retried until it has streamed something."""
+        last: LLMResponse | None = None
+        for tier, provider, tier_model in self._tiers(model):
+            if not self.breaker(tier_model).allow():
+                continue
+            for attempt in range(self.max_retries + 1):
+                started = False
+                response: LLMResponse | None = None
+                async for chunk in provider.chat_stream(
+                    messages=messages, tools=tools, model=tier_model,
+                    max_tokens=max_tokens, temperature=temperature,
+                ):
+                    if chunk.response is not None:
+                        response = chunk.response
+                        break
+                    started = True
+                    yield chunk
+                response = response or LLMResponse(content=None)
+                self._record(tier, tier_model, response)
+                if response.finish_reason != "error" or started:
+                    yield StreamChunk(response=response)
+                    return
+                last = response
+                if attempt == self.max_retries or not is_retryable(response):
+                    break
+                await self._backoff(tier_model, attempt, response)
+            logger.warning("LLM tier {} ({}) failed: {}", tier, tier_model, (last.content or "")[:200])
+        yield StreamChunk(response=last or LLMResponse(
+            content="Error calling LLM: all models unavailable", finish_reason="error",
+        ))
+
+    async def _backoff(self, model: str, attempt: int, response: LLMResponse) -> None:
+        delay = self._delay(attempt, response)
+        LLM_RETRIES.inc(model=model)
+        logger.info("Retrying {} in {:.1f}s after error (status {})", model, delay, response.error_status)
+        await asyncio.sleep(delay)
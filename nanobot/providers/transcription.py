@@ -3,9 +3,10 @@
 import os
 from pathlib import Path
 
-import httpx
 from loguru import logger
 
+from nanobot.net import HTTP_CLIENTS
+
 
 class GroqTranscriptionProvider:
     """
@@ -38,26 +39,25 @@ class GroqTranscriptionProvider:
             return ""
 
         try:
-            async with httpx.AsyncClient() as client:
-                with open(path, "rb") as f:
-                    files = {
-                        "file": (path.name, f),
-                        "model": (None, "whisper-large-v3"),
-                    }
-                    headers = {
-                        "Authorization": f"Bearer {self.api_key}",
-                    }
+            with open(path, "rb") as f:
+                files = {
+                    "file": (path.name, f),
+                    "model": (None, "whisper-large-v3"),
+                }
+                headers = {
+                    "Authorization": f"Bearer {self.api_key}",
+                }
 
-                    response = await client.post(
-                        self.api_url,
-                        headers=headers,
-                        files=files,
-                        timeout=60.0
-                    )
+                response = await HTTP_CLIENTS.get(self.api_url).post(
+                    self.api_url,
+                    headers=headers,
+                    files=files,
+                    timeout=60.0
+                )
 
-                    response.raise_for_status()
-                    data = response.json()
-                    return data.get("text", "")
+                response.raise_for_status()
+                data = response.json()
+                return data.get("text", "")
 
         except Exception as e:
             logger.error("Groq transcription error: {}", e)
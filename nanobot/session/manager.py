@@ -1,15 +1,31 @@
 """Session management for conversation history."""
 
+import asyncio
 import json
+import os
 import shutil
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from loguru import logger
 
 from nanobot.utils.helpers import ensure_dir, safe_filename
+from nanobot.utils.tokens import estimate_message_tokens
+
+
+def _approx_size(messages: list[dict[str, Any] | None]) -> int:
+    """Rough in-memory footprint of messages: their content plus a fixed per-message overhead."""
+    size = 0
+    for msg in messages:
+        if msg is None:
+            size += 8
+            continue
+        content = msg.get("content")
+        size += 300 + (len(content) if isinstance(content, str) else len(str(content or "")))
+    return size
 
 
 @dataclass
@@ -30,6 +46,16 @@ class Session:
     updated_at: datetime = field(default_factory=datetime.now)
     metadata: dict[str, Any] = field(default_factory=dict)
     last_consolidated: int = 0  # Number of messages already consolidated to files
+    # Persistence bookkeeping (owned by SessionManager): messages already on disk
+    # (None = unknown, rewrite on next save) and trailing metadata records since the last rewrite.
+    _persisted: int | None = field(default=None, init=False, repr=False, compare=False)
+    _trailing_records: int = field(default=0, init=False, repr=False, compare=False)
+    # Tail-only loads leave messages[:_loaded_from] as None placeholders (all consolidated);
+    # _offsets maps unconsolidated message indexes to their byte offsets in the session file.
+    _loaded_from: int = field(default=0, init=False, repr=False, compare=False)
+    _offsets: dict[int, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # Token estimates by message index, filled lazily for token-budget history.
+    _tokens: dict[int, int] = field(default_factory=dict, init=False, repr=False, compare=False)
 
     def add_message(self, role: str, content: str, **kwargs: Any) -> None:
         """Add a message to the session."""
@@ -42,10 +68,37 @@ class Session:
         self.messages.append(msg)
         self.updated_at = datetime.now()
 
-    def get_history(self, max_messages: int = 500) -> list[dict[str, Any]]:
-        """Return unconsolidated messages for LLM input, aligned to a user turn."""
+    def estimate_tokens(self, index: int) -> int:
+        """Estimated prompt tokens of messages[index], cached per message."""
+        tokens = self._tokens.get(index)
+        if tokens is None:
+            tokens = self._tokens[index] = estimate_message_tokens(self.messages[index])
+        return tokens
+
+    def unconsolidated_tokens(self) -> int:
+        """Estimated prompt tokens of all unconsolidated messages."""
+        start = self.last_consolidated
+        if len(self._tokens) > 2 * (len(self.messages) - start) + 64:
+            self._tokens = {i: n for i, n in self._tokens.items() if i >= start}
+        return sum(self.estimate_tokens(i) for i in range(start, len(self.messages)))
+
+    def get_history(self, max_messages: int = 500, max_tokens: int | None = None) -> list[dict[str, Any]]:
+        """
+        Return unconsolidated messages for LLM input, aligned to a user turn.
+
+        With max_tokens, messages are packed newest first until the estimated
+        token budget is used up.
+        """
         unconsolidated = self.messages[self.last_consolidated:]
         sliced = unconsolidated[-max_messages:]
+        if max_tokens is not None:
+            used, keep = 0, 0
+            for i in range(len(self.messages) - 1, len(self.messages) - len(sliced) - 1, -1):
+                used += self.estimate_tokens(i)
+                if used > max_tokens:
+                    break
+                keep += 1
+            sliced = sliced[len(sliced) - keep:]
 
         # Drop leading non-user messages to avoid orphaned tool_result blocks
         for i, m in enumerate(sliced):
@@ -67,20 +120,53 @@ class Session:
         self.messages = []
         self.last_consolidated = 0
         self.updated_at = datetime.now()
+        self._persisted = None
+        self._loaded_from = 0
+        self._offsets = {}
+        self._tokens = {}
 
 
 class SessionManager:
     """
     Manages conversation sessions.
 
-    Sessions are stored as JSONL files in the sessions directory.
+    Sessions are stored as JSONL files in the sessions directory: a metadata
+    line, then one line per message. Saves append only the new messages plus a
+    trailing metadata record (the last record wins on load); once enough
+    trailing records pile up, the file is compacted in a worker thread.
+
+    Metadata records also carry the byte offset of the first unconsolidated
+    message, so loading a session parses only the tail the LLM will see.
+    Consolidated messages stay on disk until load_history() fetches them.
     """
 
-    def __init__(self, workspace: Path):
+    # Trailing metadata records tolerated before a background compaction.
+    COMPACT_AFTER = 50
+
+    def __init__(
+        self,
+        workspace: Path,
+        max_cached: int = 1000,
+        max_cached_bytes: int = 256 * 1024 * 1024,
+    ):
         self.workspace = workspace
         self.sessions_dir = ensure_dir(self.workspace / "sessions")
         self.legacy_sessions_dir = Path.home() / ".nanobot" / "sessions"
-        self._cache: dict[str, Session] = {}
+        self._compactions: dict[str, asyncio.Future] = {}
+
+        # LRU cache of loaded sessions, bounded by entries and approximate bytes (0 = no limit).
+        # in_use(key) vetoes evicting a session that is mid-turn; on_evict(key) lets the owner
+        # drop its per-session state along with it.
+        self.max_cached = max_cached
+        self.max_cached_bytes = max_cached_bytes
+        self.in_use: Callable[[str], bool] | None = None
+        self.on_evict: Callable[[str], None] | None = None
+        self._cache: OrderedDict[str, Session] = OrderedDict()
+        self._sizes: dict[str, tuple[int, int]] = {}  # key -> (messages counted, approx bytes)
+        self._cached_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
     def _get_session_path(self, key: str) -> Path:
         """Get the file path for a session."""
@@ -103,17 +189,74 @@ class SessionManager:
             The session.
         """
         if key in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(key)
             return self._cache[key]
 
+        self.misses += 1
         session = self._load(key)
         if session is None:
             session = Session(key=key)
 
-        self._cache[key] = session
+        self._remember(session)
         return session
 
+    def _remember(self, session: Session) -> None:
+        """Insert or refresh a session in the cache, then evict down to the budget."""
+        key = session.key
+        counted, size = self._sizes.get(key, (0, 0))
+        self._cached_bytes -= size
+        if counted > len(session.messages):
+            counted, size = 0, 0
+        size += _approx_size(session.messages[counted:])
+        self._sizes[key] = (len(session.messages), size)
+        self._cached_bytes += size
+
+        self._cache[key] = session
+        self._cache.move_to_end(key)
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used sessions that are idle until the cache fits its budget."""
+        def over_budget() -> bool:
+            return (
+                (self.max_cached > 0 and len(self._cache) > self.max_cached)
+                or (self.max_cached_bytes > 0 and self._cached_bytes > self.max_cached_bytes)
+            )
+
+        if not over_budget():
+            return
+        # Never evict the most recently used entry: its caller is holding it right now.
+        for key in list(self._cache)[:-1]:
+            if not over_budget():
+                break
+            if key in self._compactions or (self.in_use and self.in_use(key)):
+                continue
+            self._drop(key)
+            self.evictions += 1
+            if self.on_evict:
+                self.on_evict(key)
+        if over_budget():
+            logger.debug("Session cache over budget: {} entries, {} bytes all in use",
+                         len(self._cache), self._cached_bytes)
+
+    def _drop(self, key: str) -> None:
+        self._cache.pop(key, None)
+        _, size = self._sizes.pop(key, (0, 0))
+        self._cached_bytes -= size
+
+    def cache_stats(self) -> dict[str, int]:
+        """Return cache counters for sizing the session cache."""
+        return {
+            "entries": len(self._cache),
+            "bytes": self._cached_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
     def _load(self, key: str) -> Session | None:
-        """Load a session from disk."""
+        """Load a session from disk, parsing only its unconsolidated tail when possible."""
         path = self._get_session_path(key)
         if not path.exists():
             legacy_path = self._get_legacy_session_path(key)
@@ -128,59 +271,302 @@ class SessionManager:
             return None
 
         try:
-            messages = []
-            metadata = {}
-            created_at = None
-            last_consolidated = 0
-
-            with open(path, encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    data = json.loads(line)
-
-                    if data.get("_type") == "metadata":
-                        metadata = data.get("metadata", {})
-                        created_at = datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None
-                        last_consolidated = data.get("last_consolidated", 0)
-                    else:
-                        messages.append(data)
-
-            return Session(
-                key=key,
-                messages=messages,
-                created_at=created_at or datetime.now(),
-                metadata=metadata,
-                last_consolidated=last_consolidated
-            )
+            return self._load_tail(key, path) or self._load_full(key, path)
         except Exception as e:
             logger.warning("Failed to load session {}: {}", key, e)
             return None
 
+    def _load_tail(self, key: str, path: Path) -> Session | None:
+        """Load from the consolidation checkpoint; None if the file has no usable one."""
+        meta = self._read_last_metadata(path) or self._read_header(path)
+        if not meta or not meta.get("last_consolidated") or "consolidated_offset" not in meta:
+            return None
+        offset = meta["consolidated_offset"]
+        if not isinstance(offset, int) or offset <= 0:
+            return None
+        with open(path, "rb") as f:
+            f.seek(offset - 1)
+            if f.read(1) != b"\n":
+                return None
+        messages, offsets, metas, damaged = self._read_records(path, offset)
+        if damaged:
+            return None
+        return self._build_session(
+            key, meta, messages, offsets, base=meta["last_consolidated"], trailing=len(metas),
+        )
+
+    def _load_full(self, key: str, path: Path) -> Session:
+        messages, offsets, metas, damaged = self._read_records(path, 0)
+        if damaged:
+            # A torn append from a crash; the next save rewrites the file.
+            logger.warning("Session {} has unreadable lines; it will be rewritten on next save", key)
+        session = self._build_session(
+            key, metas[-1] if metas else {}, messages, offsets, base=0, trailing=max(0, len(metas) - 1),
+        )
+        if damaged:
+            session._persisted = None
+        return session
+
+    @staticmethod
+    def _build_session(
+        key: str,
+        meta: dict[str, Any],
+        messages: list[dict[str, Any]],
+        offsets: list[int],
+        base: int,
+        trailing: int,
+    ) -> Session:
+        created_at = meta.get("created_at")
+        updated_at = meta.get("updated_at")
+        session = Session(
+            key=key,
+            messages=[None] * base + messages,
+            created_at=datetime.fromisoformat(created_at) if created_at else datetime.now(),
+            updated_at=datetime.fromisoformat(updated_at) if updated_at else datetime.now(),
+            metadata=meta.get("metadata", {}),
+            last_consolidated=meta.get("last_consolidated", 0),
+        )
+        session._persisted = len(session.messages)
+        session._trailing_records = trailing
+        session._loaded_from = base
+        session._offsets = {
+            base + i: off for i, off in enumerate(offsets) if base + i >= session.last_consolidated
+        }
+        return session
+
+    @staticmethod
+    def _read_records(
+        path: Path, start: int,
+    ) -> tuple[list[dict[str, Any]], list[int], list[dict[str, Any]], bool]:
+        """Parse the file from byte start: (messages, their offsets, metadata records, damaged)."""
+        messages: list[dict[str, Any]] = []
+        offsets: list[int] = []
+        metas: list[dict[str, Any]] = []
+        damaged = False
+        pos = start
+        with open(path, "rb") as f:
+            f.seek(start)
+            for raw in f:
+                line_start, pos = pos, pos + len(raw)
+                if not raw.strip():
+                    continue
+                try:
+                    data = json.loads(raw)
+                except ValueError:
+                    damaged = True
+                    continue
+                if data.get("_type") == "metadata":
+                    metas.append(data)
+                else:
+                    messages.append(data)
+                    offsets.append(line_start)
+        return messages, offsets, metas, damaged
+
+    @staticmethod
+    def _read_prefix(path: Path, count: int) -> list[dict[str, Any]]:
+        """Read the first count messages of a session file."""
+        messages: list[dict[str, Any]] = []
+        with open(path, "rb") as f:
+            for raw in f:
+                if len(messages) >= count:
+                    break
+                if not raw.strip():
+                    continue
+                data = json.loads(raw)
+                if data.get("_type") != "metadata":
+                    messages.append(data)
+        if len(messages) < count:
+            raise ValueError(f"expected {count} messages, found {len(messages)}")
+        return messages
+
+    def load_history(self, session: Session) -> None:
+        """
+        Fetch the consolidated messages a tail-only load skipped.
+
+        Only needed when the whole history is required (export, migration or a
+        full rewrite); the agent itself never reads before last_consolidated.
+        """
+        count = session._loaded_from
+        if not count:
+            return
+        try:
+            session.messages[:count] = self._read_prefix(self._get_session_path(session.key), count)
+        except (OSError, ValueError) as e:
+            # The consolidated prefix is already summarised in MEMORY.md; drop it rather than fail.
+            logger.warning("Could not read history of session {}, dropping {} consolidated messages: {}",
+                           session.key, count, e)
+            del session.messages[:count]
+            session.last_consolidated = max(0, session.last_consolidated - count)
+            session._offsets = {}
+        session._loaded_from = 0
+
+    @staticmethod
+    def _encode(record: dict[str, Any]) -> bytes:
+        return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+    @staticmethod
+    def _metadata_record(session: Session, checkpoint: int | None = None) -> dict[str, Any]:
+        record = {
+            "_type": "metadata",
+            "key": session.key,
+            "created_at": session.created_at.isoformat(),
+            "updated_at": session.updated_at.isoformat(),
+            "metadata": session.metadata,
+            "last_consolidated": session.last_consolidated
+        }
+        if checkpoint is not None:
+            record["consolidated_offset"] = checkpoint
+        return record
+
+    @staticmethod
+    def _checkpoint(session: Session, end: int) -> int | None:
+        """Byte offset of the first unconsolidated message (end if everything is consolidated)."""
+        if not session.last_consolidated:
+            return None
+        if session.last_consolidated >= len(session.messages):
+            return end
+        return session._offsets.get(session.last_consolidated)
+
+    @classmethod
+    def _write_snapshot(cls, path: Path, header: dict[str, Any], messages: list[dict[str, Any]]) -> list[int]:
+        """Write a complete session file (metadata line + messages) to path; return message offsets."""
+        lines = [cls._encode(msg) for msg in messages]
+        consolidated = min(header.get("last_consolidated", 0), len(lines))
+        head = cls._encode(header)
+        if consolidated:
+            # The header's own length shifts the offset it records; settle on a fixed point.
+            before = sum(len(line) for line in lines[:consolidated])
+            checkpoint = 0
+            while len(head) + before != checkpoint:
+                checkpoint = len(head) + before
+                head = cls._encode({**header, "consolidated_offset": checkpoint})
+
+        offsets = []
+        pos = len(head)
+        with open(path, "wb") as f:
+            f.write(head)
+            for line in lines:
+                offsets.append(pos)
+                f.write(line)
+                pos += len(line)
+        return offsets
+
+    @staticmethod
+    def _prune_offsets(session: Session, offsets: dict[int, int]) -> None:
+        session._offsets = {i: off for i, off in offsets.items() if i >= session.last_consolidated}
+
     def save(self, session: Session) -> None:
-        """Save a session to disk."""
+        """Save a session to disk, appending only what changed since the last save."""
         path = self._get_session_path(session.key)
+        persisted = session._persisted
+
+        if persisted is None or persisted > len(session.messages) or not path.exists():
+            self._cancel_compaction(session.key)
+            self.load_history(session)
+            tmp = path.with_suffix(".jsonl.tmp")
+            offsets = self._write_snapshot(tmp, self._metadata_record(session), session.messages)
+            os.replace(tmp, path)
+            self._prune_offsets(session, dict(enumerate(offsets)))
+            session._trailing_records = 0
+        else:
+            offsets = session._offsets
+            with open(path, "ab") as f:
+                pos = f.seek(0, os.SEEK_END)
+                for i in range(persisted, len(session.messages)):
+                    line = self._encode(session.messages[i])
+                    offsets[i] = pos
+                    f.write(line)
+                    pos += len(line)
+                f.write(self._encode(self._metadata_record(session, self._checkpoint(session, pos))))
+            self._prune_offsets(session, offsets)
+            session._trailing_records += 1
+
+        session._persisted = len(session.messages)
+        self._remember(session)
+
+        if session._trailing_records >= self.COMPACT_AFTER:
+            self._schedule_compaction(session)
+
+    def _schedule_compaction(self, session: Session) -> None:
+        """Rewrite the session file without superseded metadata records, off the event loop."""
+        if session.key in self._compactions:
+            return
+        path = self._get_session_path(session.key)
+        tmp = path.with_suffix(".jsonl.compact")
+        count, records = len(session.messages), session._trailing_records
+        header = self._metadata_record(session)
+        snapshot = session.messages[:count]
+        skipped = session._loaded_from
+
+        def _write() -> list[int]:
+            # The consolidated prefix of a tail-only session is never rewritten by appends,
+            # so it can be read back from the live file while it grows.
+            messages = self._read_prefix(path, skipped) + snapshot[skipped:] if skipped else snapshot
+            return self._write_snapshot(tmp, header, messages)
 
-        with open(path, "w", encoding="utf-8") as f:
-            metadata_line = {
-                "_type": "metadata",
-                "key": session.key,
-                "created_at": session.created_at.isoformat(),
-                "updated_at": session.updated_at.isoformat(),
-                "metadata": session.metadata,
-                "last_consolidated": session.last_consolidated
-            }
-            f.write(json.dumps(metadata_line, ensure_ascii=False) + "\n")
-            for msg in session.messages:
-                f.write(json.dumps(msg, ensure_ascii=False) + "\n")
-
-        self._cache[session.key] = session
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._finish_compaction(session, tmp, count, records, _write())
+            return
+
+        future = loop.run_in_executor(None, _write)
+        self._compactions[session.key] = future
+
+        def _done(f: asyncio.Future) -> None:
+            if self._compactions.get(session.key) is not f:
+                return  # Cancelled by a full rewrite in the meantime
+            self._compactions.pop(session.key, None)
+            if f.cancelled() or f.exception():
+                logger.warning("Compaction of session {} failed: {}", session.key,
+                               None if f.cancelled() else f.exception())
+                tmp.unlink(missing_ok=True)
+                return
+            self._finish_compaction(session, tmp, count, records, f.result())
+
+        future.add_done_callback(_done)
+
+    def _finish_compaction(
+        self, session: Session, tmp: Path, count: int, records: int, offsets: list[int],
+    ) -> None:
+        """Swap in a compacted snapshot, first appending anything saved while it was written."""
+        if session._persisted is None or session._persisted < count:
+            tmp.unlink(missing_ok=True)
+            return
+        saved_since = session._trailing_records != records
+        new_offsets = dict(enumerate(offsets))
+        with open(tmp, "ab") as f:
+            pos = f.seek(0, os.SEEK_END)
+            for i in range(count, session._persisted):
+                line = self._encode(session.messages[i])
+                new_offsets[i] = pos
+                f.write(line)
+                pos += len(line)
+            if saved_since:
+                self._prune_offsets(session, new_offsets)
+                f.write(self._encode(self._metadata_record(session, self._checkpoint(session, pos))))
+        os.replace(tmp, self._get_session_path(session.key))
+        self._prune_offsets(session, new_offsets)
+        session._trailing_records = int(saved_since)
+        logger.debug("Compacted session {} ({} messages)", session.key, session._persisted)
+
+    def _cancel_compaction(self, key: str) -> None:
+        if future := self._compactions.pop(key, None):
+            future.cancel()
 
     def invalidate(self, key: str) -> None:
         """Remove a session from the in-memory cache."""
-        self._cache.pop(key, None)
+        self._drop(key)
+
+    def delete(self, key: str) -> bool:
+        """Delete a session from disk and the cache. Returns True if it existed."""
+        self._cancel_compaction(key)
+        self.invalidate(key)
+        path = self._get_session_path(key)
+        if not path.exists():
+            return False
+        path.unlink()
+        return True
 
     def list_sessions(self) -> list[dict[str, Any]]:
         """
@@ -193,20 +579,48 @@ class SessionManager:
 
         for path in self.sessions_dir.glob("*.jsonl"):
             try:
-                # Read just the metadata line
-                with open(path, encoding="utf-8") as f:
-                    first_line = f.readline().strip()
-                    if first_line:
-                        data = json.loads(first_line)
-                        if data.get("_type") == "metadata":
-                            key = data.get("key") or path.stem.replace("_", ":", 1)
-                            sessions.append({
-                                "key": key,
-                                "created_at": data.get("created_at"),
-                                "updated_at": data.get("updated_at"),
-                                "path": str(path)
-                            })
+                # Read just the metadata: the trailing record if present, else the first line
+                data = self._read_last_metadata(path) or self._read_header(path)
+                if data:
+                    key = data.get("key") or path.stem.replace("_", ":", 1)
+                    sessions.append({
+                        "key": key,
+                        "created_at": data.get("created_at"),
+                        "updated_at": data.get("updated_at"),
+                        "path": str(path)
+                    })
             except Exception:
                 continue
 
         return sorted(sessions, key=lambda x: x.get("updated_at", ""), reverse=True)
+
+    @staticmethod
+    def _read_header(path: Path) -> dict[str, Any] | None:
+        """Return the file's first line if it is a metadata record."""
+        with open(path, "rb") as f:
+            first_line = f.readline().strip()
+        if not first_line:
+            return None
+        data = json.loads(first_line)
+        return data if isinstance(data, dict) and data.get("_type") == "metadata" else None
+
+    @staticmethod
+    def _read_last_metadata(path: Path, block: int = 4096) -> dict[str, Any] | None:
+        """Return the file's last line if it is a metadata record, reading only its tail."""
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+            pos, tail = end, b""
+            while pos > 0 and tail.count(b"\n") < 2:
+                step = min(block, pos)
+                pos -= step
+                f.seek(pos)
+                tail = f.read(step) + tail
+        lines = tail.rstrip(b"\n").split(b"\n")
+        if not lines or not lines[-1]:
+            return None
+        try:
+            data = json.loads(lines[-1])
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) and data.get("_type") == "metadata" else None
@@ -0,0 +1,167 @@
+"""SQLite-backed session storage."""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.session.manager import Session, SessionManager
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    key TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    last_consolidated INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_updated_at ON sessions (updated_at);
+CREATE TABLE IF NOT EXISTS messages (
+    session_key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_key, seq)
+) WITHOUT ROWID;
+"""
+
+
+class SQLiteSessionManager(SessionManager):
+    """
+    Session manager that keeps all sessions in one SQLite database (WAL mode).
+
+    Same API as SessionManager; each save inserts only the messages added since
+    the previous save, and list_sessions is a single indexed query.
+    """
+
+    def __init__(self, workspace: Path, db_path: Path | None = None, **cache_options: int):
+        super().__init__(workspace, **cache_options)
+        self.db_path = db_path or self.sessions_dir / "sessions.db"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _load(self, key: str) -> Session | None:
+        """Load a session from the database, skipping already consolidated messages."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created_at, updated_at, metadata, last_consolidated FROM sessions WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            rows = self._conn.execute(
+                "SELECT data FROM messages WHERE session_key = ? AND seq >= ? ORDER BY seq", (key, row[3]),
+            ).fetchall()
+
+        session = Session(
+            key=key,
+            messages=[None] * row[3] + [json.loads(data) for (data,) in rows],
+            created_at=datetime.fromisoformat(row[0]),
+            updated_at=datetime.fromisoformat(row[1]),
+            metadata=json.loads(row[2]),
+            last_consolidated=row[3],
+        )
+        session._persisted = len(session.messages)
+        session._loaded_from = row[3]
+        return session
+
+    def load_history(self, session: Session) -> None:
+        """Fetch the consolidated messages a tail-only load skipped."""
+        count = session._loaded_from
+        if not count:
+            return
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM messages WHERE session_key = ? AND seq < ? ORDER BY seq", (session.key, count),
+            ).fetchall()
+        session.messages[:count] = [json.loads(data) for (data,) in rows]
+        session._loaded_from = 0
+
+    def save(self, session: Session) -> None:
+        """Save a session, inserting only messages added since the last save."""
+        persisted = session._persisted
+        rewrite = persisted is None or persisted > len(session.messages)
+        start = 0 if rewrite else persisted
+        if rewrite:
+            self.load_history(session)
+
+        with self._lock, self._conn:
+            if rewrite:
+                self._conn.execute("DELETE FROM messages WHERE session_key = ?", (session.key,))
+            self._conn.executemany(
+                "INSERT INTO messages (session_key, seq, data) VALUES (?, ?, ?)",
+                [
+                    (session.key, seq, json.dumps(msg, ensure_ascii=False))
+                    for seq, msg in enumerate(session.messages[start:], start)
+                ],
+            )
+            self._conn.execute(
+                "INSERT INTO sessions (key, created_at, updated_at, metadata, last_consolidated) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                "updated_at = excluded.updated_at, metadata = excluded.metadata, "
+                "last_consolidated = excluded.last_consolidated",
+                (
+                    session.key,
+                    session.created_at.isoformat(),
+                    session.updated_at.isoformat(),
+                    json.dumps(session.metadata, ensure_ascii=False),
+                    session.last_consolidated,
+                ),
+            )
+
+        session._persisted = len(session.messages)
+        self._remember(session)
+
+    def delete(self, key: str) -> bool:
+        """Delete a session and its messages."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM messages WHERE session_key = ?", (key,))
+            deleted = self._conn.execute("DELETE FROM sessions WHERE key = ?", (key,)).rowcount
+        self.invalidate(key)
+        return deleted > 0
+
+    def list_sessions(self) -> list[dict[str, Any]]:
+        """List all sessions, most recently updated first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, created_at, updated_at FROM sessions ORDER BY updated_at DESC"
+            ).fetchall()
+        return [{"key": k, "created_at": c, "updated_at": u} for k, c, u in rows]
+
+    def migrate_from_jsonl(self, overwrite: bool = False) -> int:
+        """
+        Import sessions from the JSONL files in the sessions directory.
+
+        Sessions already in the database are skipped unless overwrite is set.
+        The JSONL files are left in place. Returns the number of sessions imported.
+        """
+        source = SessionManager(self.workspace)
+        with self._lock:
+            existing = {k for (k,) in self._conn.execute("SELECT key FROM sessions")}
+
+        imported = 0
+        for item in source.list_sessions():
+            key = item["key"]
+            if key in existing and not overwrite:
+                continue
+            session = source._load(key)
+            if session is None:
+                logger.warning("Skipping unreadable session {}", key)
+                continue
+            source.load_history(session)
+            session._persisted = None
+            self.save(session)
+            self.invalidate(key)
+            imported += 1
+        return imported
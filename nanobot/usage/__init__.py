@@ -0,0 +1,11 @@
+"""LLM token and cost accounting."""
+
+from nanobot.usage.ledger import (
+    ModelPrice,
+    UsageLedger,
+    current_usage_context,
+    estimate_cost,
+    usage_context,
+)
+
+__all__ = ["ModelPrice", "UsageLedger", "current_usage_context", "estimate_cost", "usage_context"]
@@ -0,0 +1,200 @@
+"""Token and cost ledger for every LLM call, tagged by session and call site."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterator
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS calls (
+    ts REAL NOT NULL,
+    day TEXT NOT NULL,
+    session TEXT NOT NULL,
+    model TEXT NOT NULL,
+    site TEXT NOT NULL,
+    prompt_tokens INTEGER NOT NULL,
+    completion_tokens INTEGER NOT NULL,
+    cached_tokens INTEGER NOT NULL,
+    cost REAL NOT NULL,
+    cache_write_tokens INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_calls_session ON calls (session);
+CREATE INDEX IF NOT EXISTS idx_calls_day ON calls (day);
+"""
+
+# Columns `UsageLedger.summary` can group by.
+GROUPINGS = ("session", "model", "site", "day")
+
+_site: ContextVar[str] = ContextVar("usage_site", default="agent")
+_session: ContextVar[str] = ContextVar("usage_session", default="")
+
+
+@contextmanager
+def usage_context(site: str | None = None, session: str | None = None) -> Iterator[None]:
+    """Attribute LLM calls made in this block (and tasks created in it) to ``site`` and ``session``."""
+    tokens = []
+    if site is not None:
+        tokens.append((_site, _site.set(site)))
+    if session is not None:
+        tokens.append((_session, _session.set(session)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+def current_usage_context() -> tuple[str, str]:
+    """(site, session) the current LLM call is attributed to."""
+    return _site.get(), _session.get()
+
+
+@dataclass
+class ModelPrice:
+    """USD per million tokens."""
+
+    input: float = 0.0
+    output: float = 0.0
+    cached_input: float | None = None  # None = same as input
+    cache_write_input: float | None = None  # None = same as input
+
+
+@lru_cache(maxsize=256)
+def _litellm_price(model: str) -> ModelPrice | None:
+    try:
+        from litellm import model_cost
+    except Exception:
+        return None
+    candidates = [model, model.split("/", 1)[-1], model.rsplit("/", 1)[-1]]
+    for name in candidates:
+        if info := model_cost.get(name):
+            per_m = 1_000_000
+            cached = info.get("cache_read_input_token_cost")
+            written = info.get("cache_creation_input_token_cost")
+            return ModelPrice(
+                input=(info.get("input_cost_per_token") or 0) * per_m,
+                output=(info.get("output_cost_per_token") or 0) * per_m,
+                cached_input=cached * per_m if cached is not None else None,
+                cache_write_input=written * per_m if written is not None else None,
+            )
+    return None
+
+
+def estimate_cost(
+    model: str, usage: dict[str, int], prices: dict[str, ModelPrice] | None = None,
+) -> float:
+    """
+    Estimated USD cost of one call.
+
+    Uses ``prices`` (keyed by model name) when given, else LiteLLM's price
+    table; unknown models cost 0. Prompt-cache reads and writes are part of
+    ``prompt_tokens`` and billed at their own rates.
+    """
+    price = (prices or {}).get(model) or _litellm_price(model)
+    if price is None:
+        return 0.0
+    prompt = usage.get("prompt_tokens", 0)
+    cached = min(usage.get("cached_tokens", 0), prompt)
+    written = min(usage.get("cache_write_tokens", 0), prompt - cached)
+    cached_rate = price.input if price.cached_input is None else price.cached_input
+    write_rate = price.input if price.cache_write_input is None else price.cache_write_input
+    return ((prompt - cached - written) * price.input + cached * cached_rate + written * write_rate
+            + usage.get("completion_tokens", 0) * price.output) / 1_000_000
+
+
+class UsageLedger:
+    """
+    Append-only SQLite (WAL) record of LLM calls.
+
+    One row per call with its token counts and estimated cost; totals per
+    session, model, call site or day are computed on read. Gateway worker
+    processes share the database. Optional per-session and per-day budgets
+    (USD, 0 = none) are checked with ``over_budget``.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        prices: dict[str, ModelPrice] | None = None,
+        session_budget_usd: float = 0.0,
+        daily_budget_usd: float = 0.0,
+    ):
+        self.path = path
+        self.prices = prices or {}
+        self.session_budget_usd = session_budget_usd
+        self.daily_budget_usd = daily_budget_usd
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=10.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(calls)")}
+        if "cache_write_tokens" not in columns:  # ledgers created before cache writes were recorded
+            self._conn.execute("ALTER TABLE calls ADD COLUMN cache_write_tokens INTEGER NOT NULL DEFAULT 0")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def today() -> str:
+        return time.strftime("%Y-%m-%d")
+
+    def record(self, model: str, usage: dict[str, int], site: str | None = None, session: str | None = None) -> float:
+        """Record one call (attributed to the current usage context by default). Returns its cost."""
+        ctx_site, ctx_session = current_usage_context()
+        cost = estimate_cost(model, usage, self.prices)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO calls (ts, day, session, model, site, prompt_tokens, completion_tokens, "
+                "cached_tokens, cache_write_tokens, cost) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    time.time(), self.today(), session if session is not None else ctx_session,
+                    model, site or ctx_site,
+                    usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0),
+                    usage.get("cached_tokens", 0), usage.get("cache_write_tokens", 0), cost,
+                ),
+            )
+        return cost
+
+    def _cost(self, where: str, arg: str) -> float:
+        with self._lock:
+            row = self._conn.execute(f"SELECT COALESCE(SUM(cost), 0) FROM calls WHERE {where} = ?", (arg,)).fetchone()
+        return row[0]
+
+    def session_cost(self, session: str) -> float:
+        return self._cost("session", session)
+
+    def day_cost(self, day: str | None = None) -> float:
+        return self._cost("day", day or self.today())
+
+    def over_budget(self, session: str) -> str | None:
+        """Which budget (``"session"`` or ``"daily"``) is used up, or None."""
+        if self.session_budget_usd and self.session_cost(session) >= self.session_budget_usd:
+            return "session"
+        if self.daily_budget_usd and self.day_cost() >= self.daily_budget_usd:
+            return "daily"
+        return None
+
+    def summary(self, by: str = "day", since_day: str | None = None, limit: int = 50) -> list[dict[str, Any]]:
+        """Totals grouped by one of GROUPINGS, most expensive first."""
+        if by not in GROUPINGS:
+            raise ValueError(f"by must be one of {', '.join(GROUPINGS)}")
+        where, args = ("WHERE day >= ?", (since_day,)) if since_day else ("", ())
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {by}, COUNT(*), SUM(prompt_tokens), SUM(completion_tokens), SUM(cached_tokens), "
+                f"SUM(cache_write_tokens), SUM(cost) "
+                f"FROM calls {where} GROUP BY {by} ORDER BY SUM(cost) DESC, {by} LIMIT ?",
+                (*args, limit),
+            ).fetchall()
+        keys = (by, "calls", "prompt_tokens", "completion_tokens", "cached_tokens", "cache_write_tokens", "cost")
+        return [dict(zip(keys, row)) for row in rows]
@@ -1,8 +1,15 @@
 """Utility functions for nanobot."""
 
 import re
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: multi-process gateway mode is POSIX-only
+    fcntl = None
 
 
 def ensure_dir(path: Path) -> Path:
@@ -22,6 +29,35 @@ def get_workspace_path(workspace: str | None = None) -> Path:
     return ensure_dir(path)
 
 
+def file_signature(path: Path) -> tuple[int, int] | None:
+    """(mtime_ns, size) of a file, or None if it does not exist. Cheap change detection."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """
+    Exclusive advisory lock on ``<path>.lock`` across processes.
+
+    Guards workspace files that gateway worker processes share (MEMORY.md,
+    HISTORY.md, cron jobs.json). A no-op where fcntl is unavailable.
+    """
+    if fcntl is None:
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + ".lock"), "a") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
 def timestamp() -> str:
     """Current ISO timestamp."""
     return datetime.now().isoformat()
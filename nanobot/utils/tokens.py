@@ -0,0 +1,43 @@
+"""Fast local token estimates for prompt budgeting."""
+
+import json
+from typing import Any
+
+# Per-message framing overhead (role markers, separators) in chat formats.
+MESSAGE_OVERHEAD = 4
+# Rough cost of one image input; providers vary, this errs on the high side.
+IMAGE_TOKENS = 800
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of text without a tokenizer.
+
+    ASCII text averages about four characters per token; CJK and other
+    multi-byte scripts are closer to one token per character.
+    """
+    if not text:
+        return 0
+    n_chars = len(text)
+    # UTF-8 uses 2-4 bytes for non-ASCII characters; assume 3 on average.
+    non_ascii = (len(text.encode("utf-8")) - n_chars) // 2
+    return (n_chars - non_ascii + 3) // 4 + non_ascii
+
+
+def estimate_message_tokens(message: dict[str, Any]) -> int:
+    """Estimate the tokens a chat message contributes to a prompt."""
+    tokens = MESSAGE_OVERHEAD
+    content = message.get("content")
+    if isinstance(content, str):
+        tokens += estimate_tokens(content)
+    elif isinstance(content, list):
+        for part in content:
+            if not isinstance(part, dict):
+                continue
+            if part.get("type") == "image_url":
+                tokens += IMAGE_TOKENS
+            else:
+                tokens += estimate_tokens(part.get("text") or "")
+    if tool_calls := message.get("tool_calls"):
+        tokens += estimate_tokens(json.dumps(tool_calls, ensure_ascii=False))
+    return tokens
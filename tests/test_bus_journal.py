@@ -0,0 +1,67 @@
+"""Tests for the durable bus journal."""
+
+from datetime import datetime
+from pathlib import Path
+
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.journal import INBOUND_IDS, MessageJournal
+from nanobot.bus.queue import MessageBus
+
+
+def _msg(content: str, message_id: int | None = None, chat_id: str = "c") -> InboundMessage:
+    metadata = {"message_id": message_id} if message_id is not None else {}
+    return InboundMessage(channel="telegram", sender_id="u", chat_id=chat_id, content=content, metadata=metadata)
+
+
+def _bus(path: Path, **kwargs) -> MessageBus:
+    return MessageBus(journal=MessageJournal(path / "journal.db"), **kwargs)
+
+
+async def test_unfinished_turn_is_replayed_after_restart(tmp_path: Path) -> None:
+    bus = _bus(tmp_path)
+    await bus.publish_inbound(_msg("done", 1))
+    await bus.publish_inbound(_msg("in flight", 2, chat_id="d"))
+    first = await bus.consume_inbound()
+    await bus.consume_inbound()  # crash before this turn replies
+    await bus.publish_outbound(OutboundMessage(
+        channel="telegram", chat_id="c", content="reply", metadata=first.metadata,
+    ))
+    bus.journal.close()
+
+    restarted = _bus(tmp_path)
+    assert await restarted.replay_journal() == (1, 1)
+    replayed = await restarted.consume_inbound()
+    assert replayed.content == "in flight"
+    assert isinstance(replayed.timestamp, datetime)
+    reply = await restarted.consume_outbound()
+    assert reply.content == "reply"
+
+    restarted.outbound_done(reply)
+    restarted.inbound_done(replayed)
+    restarted.journal.close()
+    assert await _bus(tmp_path).replay_journal() == (0, 0)
+
+
+async def test_redelivered_message_is_not_processed_twice(tmp_path: Path) -> None:
+    bus = _bus(tmp_path)
+    await bus.publish_inbound(_msg("hello", 7))
+    msg = await bus.consume_inbound()
+    bus.inbound_done(msg)
+
+    await bus.publish_inbound(_msg("hello", 7))
+    assert bus.inbound_size == 0
+
+
+async def test_progress_is_not_journaled_and_coalesced_ids_are_acked(tmp_path: Path) -> None:
+    bus = _bus(tmp_path, coalesce_ms=1)
+    await bus.publish_inbound(_msg("a", 1))
+    await bus.publish_inbound(_msg("b", 2))
+    merged = await bus.consume_inbound()
+    assert len(merged.metadata[INBOUND_IDS]) == 2
+
+    await bus.publish_outbound(OutboundMessage(
+        channel="telegram", chat_id="c", content="...", metadata={**merged.metadata, "_progress": True},
+    ))
+    assert bus.journal.pending_outbound() == []
+    await bus.publish_outbound(OutboundMessage(channel="telegram", chat_id="c", content="ok", metadata=merged.metadata))
+    assert bus.journal.pending_inbound() == []
@@ -0,0 +1,164 @@
+"""Tests for per-session fair scheduling on the inbound bus."""
+
+import asyncio
+import time
+
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.bus.scheduler import FairScheduler, Lane, lane_of
+
+
+def _msg(chat_id: str, content: str = "hi", channel: str = "telegram", sender: str = "u") -> InboundMessage:
+    return InboundMessage(channel=channel, sender_id=sender, chat_id=chat_id, content=content)
+
+
+def test_round_robin_across_sessions() -> None:
+    sched = FairScheduler()
+    for i in range(5):
+        sched.put_nowait(_msg("busy", f"b{i}"))
+    sched.put_nowait(_msg("quiet", "q0"))
+
+    first = sched.get_nowait()
+    second = sched.get_nowait()
+    assert (first.content, second.content) == ("b0", "q0")
+    # Both sessions have a turn in flight: nothing else is dispatchable.
+    assert sched.get_nowait() is None
+    assert sched.qsize() == 4
+
+    sched.done(first.session_key)
+    assert sched.get_nowait().content == "b1"
+
+
+def test_priority_lanes_and_control_bypass() -> None:
+    sched = FairScheduler(max_active=1)
+    sched.put_nowait(_msg("c1", "announce", channel="system", sender="subagent"))
+    sched.put_nowait(_msg("c2", "hello"))
+    sched.put_nowait(_msg("c3", "tick", channel="system", sender="cron"))
+
+    assert sched.get_nowait().content == "hello"
+    assert sched.get_nowait() is None  # global cap reached
+
+    sched.put_nowait(_msg("c2", "/stop"))
+    assert sched.get_nowait().content == "/stop"
+
+    sched.done("telegram:c2")
+    assert sched.get_nowait().content == "announce"
+    sched.done("system:c1")
+    assert sched.get_nowait().content == "tick"
+
+
+def test_lane_of_defaults_and_override() -> None:
+    assert lane_of(_msg("c", "/STOP ")) is Lane.CONTROL
+    assert lane_of(_msg("c", channel="system", sender="subagent")) is Lane.SUBAGENT
+    assert lane_of(_msg("c", channel="system", sender="heartbeat")) is Lane.BACKGROUND
+    msg = _msg("c")
+    msg.metadata["_lane"] = Lane.KAIZEN
+    assert lane_of(msg) is Lane.KAIZEN
+
+
+async def test_consume_waits_for_session_release() -> None:
+    bus = MessageBus()
+    await bus.publish_inbound(_msg("a", "one"))
+    await bus.publish_inbound(_msg("a", "two"))
+
+    first = await bus.consume_inbound()
+    waiter = asyncio.create_task(bus.consume_inbound())
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    bus.inbound_done(first)
+    assert (await asyncio.wait_for(waiter, timeout=1.0)).content == "two"
+
+
+def test_drop_pending() -> None:
+    bus = MessageBus()
+    for i in range(3):
+        bus.inbound.put_nowait(_msg("a", str(i)))
+    bus.inbound.put_nowait(_msg("b"))
+    assert bus.drop_pending("telegram:a") == 3
+    assert bus.inbound_size == 1
+
+
+def test_queued_burst_is_merged_up_to_a_command() -> None:
+    sched = FairScheduler(coalesce_s=0.001)
+    first = _msg("a", "part one")
+    first.media = ["/tmp/1.jpg"]
+    second = _msg("a", "part two")
+    second.media = ["/tmp/2.jpg"]
+    second.metadata["message_id"] = 42
+    for m in (first, second, _msg("a", "/new"), _msg("a", "after")):
+        sched.put_nowait(m)
+
+    assert sched.get_nowait() is None  # still inside the debounce window
+
+    time.sleep(0.002)
+    merged = sched.get_nowait()
+    assert merged.content == "part one\npart two"
+    assert merged.media == ["/tmp/1.jpg", "/tmp/2.jpg"]
+    assert merged.metadata == {"message_id": 42, "_coalesced": 2}
+    assert sched.qsize() == 2
+
+    sched.done(merged.session_key)
+    assert sched.get_nowait().content == "/new"
+
+
+async def test_debounce_restarts_on_each_message() -> None:
+    bus = MessageBus(coalesce_ms=50)
+    await bus.publish_inbound(_msg("a", "one"))
+    consumer = asyncio.create_task(bus.consume_inbound())
+    await asyncio.sleep(0.03)
+    await bus.publish_inbound(_msg("a", "two"))
+    await asyncio.sleep(0.03)
+    assert not consumer.done()
+
+    merged = await asyncio.wait_for(consumer, timeout=1.0)
+    assert merged.content == "one\ntwo"
+    assert bus.inbound_size == 0
+
+
+async def test_full_inbound_sheds_with_busy_reply() -> None:
+    bus = MessageBus(inbound_maxsize=1, publish_timeout_s=0.01, busy_reply="busy")
+    await bus.publish_inbound(_msg("a", "first"))
+    await bus.publish_inbound(_msg("b", "second"))
+
+    assert bus.inbound_size == 1
+    reply = bus.outbound.get_nowait()
+    assert (reply.chat_id, reply.content) == ("b", "busy")
+    # Control messages are always admitted.
+    await bus.publish_inbound(_msg("a", "/stop"))
+    assert bus.inbound_size == 2
+    assert bus.inbound.high_water == 2
+
+
+async def test_publish_waits_for_room() -> None:
+    bus = MessageBus(inbound_maxsize=1, publish_timeout_s=1.0)
+    await bus.publish_inbound(_msg("a", "first"))
+    producer = asyncio.create_task(bus.publish_inbound(_msg("b", "second")))
+    await asyncio.sleep(0.01)
+    assert not producer.done()
+
+    assert (await bus.consume_inbound()).content == "first"
+    await asyncio.wait_for(producer, timeout=1.0)
+    assert bus.outbound_size == 0
+    assert (await bus.consume_inbound()).content == "second"
+
+
+def test_stale_messages_expire_with_reply() -> None:
+    bus = MessageBus(inbound_ttl_s=0.001, busy_reply="busy")
+    bus.inbound.put_nowait(_msg("a", "old"))
+    time.sleep(0.002)
+    bus.inbound.put_nowait(_msg("b", "new", channel="system", sender="subagent"))
+
+    assert bus.inbound.get_nowait().content == "new"
+    assert bus.outbound.get_nowait().content == "busy"
+    assert bus.inbound_size == 0
+
+
+async def test_progress_dropped_when_outbound_full() -> None:
+    from nanobot.bus.events import OutboundMessage
+
+    bus = MessageBus(outbound_maxsize=1)
+    await bus.publish_outbound(OutboundMessage(channel="t", chat_id="c", content="final"))
+    await bus.publish_outbound(OutboundMessage(channel="t", chat_id="c", content="...", metadata={"_progress": True}))
+    assert bus.outbound_size == 1
+    assert bus.outbound_high_water == 1
@@ -0,0 +1,117 @@
+"""Tests for the multi-process gateway worker pool."""
+
+import asyncio
+import os
+from pathlib import Path
+
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.bus.workers import HashRing, WorkerBus, WorkerPool, shard_key
+
+
+def test_hash_ring_is_stable_and_balanced() -> None:
+    ring = HashRing([0, 1, 2, 3])
+    keys = [f"telegram:{i}" for i in range(4000)]
+    owners = [ring.node_for(k) for k in keys]
+    assert owners == [HashRing([0, 1, 2, 3]).node_for(k) for k in keys]
+    counts = [owners.count(n) for n in range(4)]
+    assert min(counts) > 600
+
+    grown = HashRing([0, 1, 2, 3, 4])
+    moved = sum(1 for k, o in zip(keys, owners) if grown.node_for(k) != o)
+    assert moved < len(keys) * 0.35
+
+
+def test_system_messages_follow_their_session() -> None:
+    announce = InboundMessage(channel="system", sender_id="subagent", chat_id="telegram:42", content="done")
+    user = InboundMessage(channel="telegram", sender_id="u", chat_id="42", content="hi")
+    assert shard_key(announce) == shard_key(user) == "telegram:42"
+
+
+def _echo_worker(index: int, socket_path: str) -> None:
+    """Stand-in for an AgentLoop process: replies with its pid."""
+
+    async def run() -> None:
+        bus = WorkerBus(index)
+        reader = await bus.connect(socket_path)
+
+        async def agent() -> None:
+            while True:
+                msg = await bus.consume_inbound()
+                await bus.publish_outbound(OutboundMessage(
+                    channel=msg.channel, chat_id=msg.chat_id, content=f"{os.getpid()}:{msg.content}",
+                    metadata=msg.metadata,
+                ))
+                bus.inbound_done(msg)
+
+        task = asyncio.create_task(agent())
+        await bus.pump(reader)
+        task.cancel()
+
+    asyncio.run(run())
+
+
+async def test_pool_routes_sessions_to_stable_workers(tmp_path: Path) -> None:
+    bus = MessageBus()
+    pool = WorkerPool(bus, tmp_path / "gw.sock", 2, _echo_worker)
+    runner = asyncio.create_task(pool.run())
+    try:
+        for i in range(3):
+            for chat in ("a", "b", "c", "d"):
+                await bus.publish_inbound(InboundMessage(channel="t", sender_id="u", chat_id=chat, content=str(i)))
+
+        replies: dict[str, list[str]] = {}
+        for _ in range(12):
+            out = await asyncio.wait_for(bus.consume_outbound(), timeout=30)
+            replies.setdefault(out.chat_id, []).append(out.content)
+    finally:
+        await pool.stop()
+        runner.cancel()
+
+    for chat, contents in replies.items():
+        pids = {c.split(":")[0] for c in contents}
+        assert len(pids) == 1, f"session {chat} must stay on one worker"
+        assert [c.split(":")[1] for c in contents] == ["0", "1", "2"]
+    assert bus.inbound.active == 0
+
+
+async def test_message_for_a_dropped_worker_is_requeued(tmp_path: Path) -> None:
+    bus = MessageBus()
+    pool = WorkerPool(bus, tmp_path / "gw.sock", 1, _echo_worker)
+    await bus.publish_inbound(InboundMessage(channel="t", sender_id="u", chat_id="a", content="hi"))
+    msg = await bus.consume_inbound()
+    pool._connected[0].set()  # connected, but the writer was dropped before the send
+
+    await pool._route(msg)
+
+    assert pool._in_flight[0] == {}
+    assert bus.inbound.active == 0
+    assert (await asyncio.wait_for(bus.consume_inbound(), 1)) is msg
+
+
+async def test_in_flight_messages_are_requeued_when_a_worker_dies_with_a_full_queue(tmp_path: Path) -> None:
+    bus = MessageBus(inbound_maxsize=2)
+    pool = WorkerPool(bus, tmp_path / "gw.sock", 1, _echo_worker)
+    in_flight = []
+    for chat in ("a", "b"):
+        await bus.publish_inbound(InboundMessage(channel="t", sender_id="u", chat_id=chat, content="hi"))
+        msg = await bus.consume_inbound()
+        pool._in_flight[0][msg.session_key] = msg
+        in_flight.append(msg)
+    for chat in ("c", "d"):
+        await bus.publish_inbound(InboundMessage(channel="t", sender_id="u", chat_id=chat, content="hi"))
+    assert bus.inbound.full()
+
+    class _Writer:
+        def close(self) -> None:
+            pass
+
+    reader = asyncio.StreamReader()
+    reader.feed_data(b'{"type": "hello", "worker": 0}\n')
+    reader.feed_eof()  # the worker process dies with both turns unfinished
+    await pool._handle_worker(reader, _Writer())
+
+    dispatched = [await asyncio.wait_for(bus.consume_inbound(), 1) for _ in range(4)]
+    assert all(msg in dispatched for msg in in_flight)
+    assert pool._in_flight[0] == {}
+    assert not pool._connected[0].is_set()
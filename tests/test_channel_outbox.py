@@ -0,0 +1,151 @@
+"""Tests for per-channel outbound workers."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.base import BaseChannel
+from nanobot.channels.dingtalk import DingTalkChannel
+from nanobot.channels.manager import ChannelManager
+from nanobot.channels.outbox import ChannelOutbox
+from nanobot.config.schema import Config, DingTalkConfig
+
+
+class _SlowChannel(BaseChannel):
+    name = "slow"
+
+    def __init__(self, delays: dict[str, float] | None = None):
+        super().__init__(config=None, bus=MessageBus())
+        self.delays = delays or {}
+        self.sent: list[tuple[str, str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def send(self, msg: OutboundMessage) -> None:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delays.get(msg.chat_id, 0.001))
+        self.in_flight -= 1
+        if msg.content == "fail":
+            raise RuntimeError("boom")
+        self.sent.append((msg.chat_id, msg.content))
+
+
+async def _drain(outbox: ChannelOutbox, channel: _SlowChannel, expected: int) -> None:
+    for _ in range(200):
+        if len(channel.sent) >= expected and not len(outbox):
+            return
+        await asyncio.sleep(0.005)
+
+
+async def test_chats_send_concurrently_but_stay_ordered() -> None:
+    channel = _SlowChannel(delays={"a": 0.01})
+    outbox = ChannelOutbox(channel, concurrency=3)
+    outbox.start()
+    try:
+        for i in range(3):
+            await outbox.put(OutboundMessage(channel="slow", chat_id="a", content=f"a{i}"))
+        await outbox.put(OutboundMessage(channel="slow", chat_id="b", content="b0"))
+        await _drain(outbox, channel, 4)
+    finally:
+        await outbox.stop()
+
+    assert channel.sent[0] == ("b", "b0"), "a slow chat must not block other chats"
+    assert [c for chat, c in channel.sent if chat == "a"] == ["a0", "a1", "a2"]
+    assert channel.max_in_flight == 2
+
+
+async def test_send_failure_does_not_stop_worker() -> None:
+    from nanobot.metrics.registry import CHANNEL_SEND_FAILURES
+
+    channel = _SlowChannel()
+    outbox = ChannelOutbox(channel)
+    outbox.start()
+    before = CHANNEL_SEND_FAILURES.value(channel="slow")
+    try:
+        await outbox.put(OutboundMessage(channel="slow", chat_id="a", content="fail"))
+        await outbox.put(OutboundMessage(channel="slow", chat_id="a", content="ok"))
+        await _drain(outbox, channel, 1)
+    finally:
+        await outbox.stop()
+
+    assert channel.sent == [("a", "ok")]
+    assert CHANNEL_SEND_FAILURES.value(channel="slow") == before + 1
+
+
+async def test_only_delivered_messages_are_acked() -> None:
+    channel = _SlowChannel()
+    acked: list[str] = []
+    outbox = ChannelOutbox(channel, on_sent=lambda m: acked.append(m.content))
+    outbox.start()
+    try:
+        await outbox.put(OutboundMessage(channel="slow", chat_id="a", content="fail"))
+        await outbox.put(OutboundMessage(channel="slow", chat_id="a", content="ok"))
+        await _drain(outbox, channel, 1)
+    finally:
+        await outbox.stop()
+
+    assert acked == ["ok"]
+
+
+async def test_channel_raises_when_the_api_rejects_a_send() -> None:
+    channel = DingTalkChannel(DingTalkConfig(client_id="id", client_secret="secret"), MessageBus())
+    channel._access_token, channel._token_expiry = "token", time.time() + 60
+    channel._http = httpx.AsyncClient(transport=httpx.MockTransport(lambda r: httpx.Response(400, text="bad")))
+    try:
+        with pytest.raises(RuntimeError, match="HTTP 400"):
+            await channel.send(OutboundMessage(channel="dingtalk", chat_id="u1", content="hi"))
+    finally:
+        await channel._http.aclose()
+
+
+async def test_full_outbox_drops_progress_and_holds_final_replies() -> None:
+    channel = _SlowChannel(delays={"a": 0.05})
+    outbox = ChannelOutbox(channel, maxsize=1)
+    await outbox.put(OutboundMessage(channel="slow", chat_id="a", content="first"))
+    await outbox.put(OutboundMessage(channel="slow", chat_id="a", content="...", metadata={"_progress": True}))
+    blocked = asyncio.create_task(outbox.put(OutboundMessage(channel="slow", chat_id="a", content="second")))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+    assert len(outbox) == 1
+
+    outbox.start()
+    try:
+        await asyncio.wait_for(blocked, 1)
+        await _drain(outbox, channel, 2)
+    finally:
+        await outbox.stop()
+
+    assert channel.sent == [("a", "first"), ("a", "second")]
+
+
+async def test_manager_routes_to_channel_outbox() -> None:
+    bus = MessageBus()
+    manager = ChannelManager(Config(), bus)
+    fast, slow = _SlowChannel(), _SlowChannel(delays={"x": 1.0})
+    fast.name = "fast"
+    manager.channels = {"fast": fast, "slow": slow}
+    manager.outboxes = {name: ChannelOutbox(ch) for name, ch in manager.channels.items()}
+    for outbox in manager.outboxes.values():
+        outbox.start()
+    dispatcher = asyncio.create_task(manager._dispatch_outbound())
+    try:
+        await bus.publish_outbound(OutboundMessage(channel="slow", chat_id="x", content="late"))
+        await bus.publish_outbound(OutboundMessage(channel="fast", chat_id="y", content="quick"))
+        await _drain(manager.outboxes["fast"], fast, 1)
+        assert fast.sent == [("y", "quick")]
+        assert slow.sent == []
+    finally:
+        dispatcher.cancel()
+        for outbox in manager.outboxes.values():
+            await outbox.stop()
@@ -0,0 +1,114 @@
+"""Tests for the Codex provider's prompt-cache key and token cache."""
+
+import json
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from nanobot.providers import openai_codex_provider as codex
+from nanobot.usage import usage_context
+
+TOOLS = [{"type": "function", "function": {"name": "list_dir", "description": "List", "parameters": {}}}]
+
+COMPLETED = {
+    "type": "response.completed",
+    "response": {
+        "status": "completed",
+        "usage": {"input_tokens": 100, "output_tokens": 5, "input_tokens_details": {"cached_tokens": 80}},
+    },
+}
+
+
+def messages(*turns: str) -> list[dict]:
+    history = [{"role": "system", "content": "You are nanobot."}]
+    for text in turns:
+        history += [{"role": "user", "content": text}, {"role": "assistant", "content": "ok"}]
+    return history[:-1]
+
+
+def sse(*events: dict) -> bytes:
+    return "".join(f"data: {json.dumps(e)}\n\n" for e in events).encode()
+
+
+def make_provider(monkeypatch, handler, lifetime_s: float = 3600) -> tuple[codex.OpenAICodexProvider, list]:
+    issued, stored = [], []
+
+    def fake_get_codex_token(min_ttl_seconds: int = 0):
+        # Like oauth_cli_kit: the stored token is returned unless it expires within min_ttl_seconds.
+        if stored and stored[-1].expires - time.time() * 1000 > min_ttl_seconds * 1000:
+            return stored[-1]
+        issued.append(min_ttl_seconds)
+        expires = int((time.time() + lifetime_s) * 1000)
+        stored.append(SimpleNamespace(account_id="acct", access=f"token-{len(issued)}", expires=expires))
+        return stored[-1]
+
+    monkeypatch.setattr(codex, "get_codex_token", fake_get_codex_token)
+    provider = codex.OpenAICodexProvider()
+    transport = httpx.MockTransport(handler)
+    client = httpx.AsyncClient(transport=transport)
+    monkeypatch.setattr(provider, "_client", lambda verify: client)
+    return provider, issued
+
+
+def test_prompt_cache_key_is_stable_across_turns_of_a_session():
+    first, _ = codex._convert_messages(messages("hi"))
+    later, _ = codex._convert_messages(messages("hi", "and now?"))
+    tools = codex._convert_tools(TOOLS)
+
+    key = codex._prompt_cache_key(first, tools, "cli:1")
+    assert codex._prompt_cache_key(later, tools, "cli:1") == key
+    assert codex._prompt_cache_key(first, tools, "cli:2") != key
+    assert codex._prompt_cache_key(first, None, "cli:1") != key
+
+
+@pytest.mark.asyncio
+async def test_token_is_reused_and_cached_tokens_reported(monkeypatch):
+    bodies, auth = [], []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(json.loads(request.content))
+        auth.append(request.headers["authorization"])
+        return httpx.Response(200, content=sse({"type": "response.output_text.delta", "delta": "hey"}, COMPLETED))
+
+    provider, issued = make_provider(monkeypatch, handler)
+    with usage_context(session="cli:1"):
+        first = await provider.chat(messages("hi"), tools=TOOLS)
+        second = await provider.chat(messages("hi", "again"), tools=TOOLS)
+
+    assert first.content == "hey"
+    assert second.usage["cached_tokens"] == 80
+    assert issued == [codex.TOKEN_REFRESH_MARGIN_S]
+    assert auth == ["Bearer token-1", "Bearer token-1"]
+    assert bodies[0]["prompt_cache_key"] == bodies[1]["prompt_cache_key"]
+
+
+@pytest.mark.asyncio
+async def test_expiring_token_is_refreshed_before_the_request(monkeypatch):
+    handler = lambda request: httpx.Response(200, content=sse(COMPLETED))  # noqa: E731
+    provider, issued = make_provider(monkeypatch, handler, lifetime_s=codex.TOKEN_REFRESH_MARGIN_S / 2)
+
+    await provider.chat(messages("hi"))
+    await provider.chat(messages("hi"))
+
+    assert len(issued) == 2
+
+
+@pytest.mark.asyncio
+async def test_rejected_token_is_refreshed_and_the_request_retried(monkeypatch):
+    auth = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        auth.append(request.headers["authorization"])
+        if request.headers["authorization"] == "Bearer token-1":
+            return httpx.Response(401, content=b"expired")
+        return httpx.Response(200, content=sse({"type": "response.output_text.delta", "delta": "ok"}, COMPLETED))
+
+    provider, issued = make_provider(monkeypatch, handler)
+    response = await provider.chat(messages("hi"))
+
+    assert response.finish_reason == "stop"
+    assert response.content == "ok"
+    assert auth == ["Bearer token-1", "Bearer token-2"]
+    assert len(issued) == 2 and issued[1] > 3600
@@ -64,3 +64,29 @@ def test_runtime_context_is_separate_untrusted_user_message(tmp_path) -> None:
 
     assert messages[-1]["role"] == "user"
     assert messages[-1]["content"] == "Return exactly: OK"
+
+
+def test_system_prompt_is_cached_until_sources_change(tmp_path, monkeypatch) -> None:
+    workspace = _make_workspace(tmp_path)
+    (workspace / "AGENTS.md").write_text("be nice", encoding="utf-8")
+    skill = workspace / "skills" / "demo" / "SKILL.md"
+    skill.parent.mkdir(parents=True)
+    skill.write_text("---\ndescription: first\n---\nbody", encoding="utf-8")
+    builder = ContextBuilder(workspace)
+
+    prompt1 = builder.build_system_prompt()
+
+    reads: list[Path] = []
+    real_read_text = Path.read_text
+    monkeypatch.setattr(Path, "read_text", lambda self, *a, **kw: reads.append(self) or real_read_text(self, *a, **kw))
+    assert builder.build_system_prompt() is prompt1
+    assert reads == []
+
+    builder.memory.write_long_term("user likes tea")
+    prompt2 = builder.build_system_prompt()
+    assert "user likes tea" in prompt2
+    assert builder.memory.memory_file in reads
+    assert workspace / "AGENTS.md" not in reads  # unchanged parts are not re-read
+
+    skill.write_text("---\ndescription: second, longer\n---\nbody", encoding="utf-8")
+    assert "second, longer" in builder.build_system_prompt()
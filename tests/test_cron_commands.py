@@ -27,3 +27,41 @@ def test_cron_add_rejects_invalid_timezone(monkeypatch, tmp_path) -> None:
     assert result.exit_code == 1
     assert "Error: unknown timezone 'America/Vancovuer'" in result.stdout
     assert not (tmp_path / "cron" / "jobs.json").exists()
+
+
+def test_cron_run_uses_the_configured_sessions_and_http_clients(monkeypatch, tmp_path) -> None:
+    from nanobot.config.schema import Config
+    from nanobot.cron.service import CronService
+    from nanobot.cron.types import CronSchedule
+    from nanobot.providers.base import LLMResponse
+    from nanobot.providers.replay import ReplayProvider
+
+    config = Config()
+    config.agents.defaults.workspace = str(tmp_path / "workspace")
+    config.agents.defaults.session_backend = "sqlite"
+    config.usage.enabled = False
+    monkeypatch.setattr("nanobot.config.loader.get_data_dir", lambda: tmp_path)
+    monkeypatch.setattr("nanobot.config.loader.load_config", lambda: config)
+    monkeypatch.setattr(
+        "nanobot.cli.commands._make_provider", lambda config: ReplayProvider(default=[LLMResponse(content="pong")]),
+    )
+    from nanobot.net import HTTP_CLIENTS
+
+    http_calls = []
+    monkeypatch.setattr(HTTP_CLIENTS, "configure", lambda http: http_calls.append(("configure", http)))
+
+    async def aclose() -> None:
+        http_calls.append(("aclose", None))
+
+    monkeypatch.setattr(HTTP_CLIENTS, "aclose", aclose)
+    job = CronService(tmp_path / "cron" / "jobs.json").add_job(
+        name="ping", schedule=CronSchedule(kind="every", every_ms=60_000), message="ping",
+    )
+
+    result = runner.invoke(app, ["cron", "run", job.id])
+
+    assert result.exit_code == 0, result.stdout
+    assert "pong" in result.stdout
+    assert (tmp_path / "workspace" / "sessions" / "sessions.db").exists()
+    assert not list((tmp_path / "workspace" / "sessions").glob("*.jsonl"))
+    assert http_calls == [("configure", config.http), ("aclose", None)]
@@ -28,3 +28,38 @@ def test_add_job_accepts_valid_timezone(tmp_path) -> None:
 
     assert job.schedule.tz == "America/Vancouver"
     assert job.state.next_run_at_ms is not None
+
+
+@pytest.mark.asyncio
+async def test_service_picks_up_jobs_written_by_another_process(tmp_path) -> None:
+    path = tmp_path / "cron" / "jobs.json"
+    gateway = CronService(path)
+    await gateway.start()
+    try:
+        worker = CronService(path)
+        worker.add_job(name="from worker", schedule=CronSchedule(kind="every", every_ms=60_000), message="hi")
+
+        gateway.refresh()
+
+        assert [j.name for j in gateway.list_jobs()] == ["from worker"]
+        assert gateway._timer_task is not None
+    finally:
+        gateway.stop()
+
+
+@pytest.mark.asyncio
+async def test_finished_job_does_not_overwrite_jobs_added_while_it_ran(tmp_path) -> None:
+    path = tmp_path / "cron" / "jobs.json"
+    worker = CronService(path)
+
+    async def on_job(job) -> None:
+        worker.add_job(name="added meanwhile", schedule=CronSchedule(kind="every", every_ms=60_000), message="hi")
+
+    gateway = CronService(path, on_job=on_job)
+    job = gateway.add_job(name="slow", schedule=CronSchedule(kind="every", every_ms=60_000), message="run")
+
+    assert await gateway.run_job(job.id)
+
+    jobs = {j.name: j for j in CronService(path).list_jobs()}
+    assert set(jobs) == {"slow", "added meanwhile"}
+    assert jobs["slow"].state.last_status == "ok"
@@ -0,0 +1,77 @@
+"""Tests for the shared HTTP client registry."""
+
+import asyncio
+
+import pytest
+
+from nanobot.config.schema import HttpConfig
+from nanobot.metrics.registry import HTTP_REQUESTS
+from nanobot.net.clients import OTHER_HOSTS, HttpClients
+
+
+async def serve_ok(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Minimal keep-alive HTTP/1.1 server answering every request with 200."""
+    try:
+        while await reader.readuntil(b"\r\n\r\n"):
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        writer.close()
+
+
+@pytest.mark.asyncio
+async def test_clients_are_pooled_per_host():
+    clients = HttpClients()
+
+    search = clients.get("https://api.search.brave.com/res/v1/web/search")
+    assert clients.get("https://api.search.brave.com/other") is search
+    assert clients.get("https://example.com/") is not search
+    assert clients.get("https://api.search.brave.com/", verify=False) is not search
+    await clients.aclose()
+
+
+@pytest.mark.asyncio
+async def test_hosts_beyond_the_limit_share_one_pool():
+    clients = HttpClients(HttpConfig(max_hosts=2))
+
+    first = clients.get("https://a.example/")
+    clients.get("https://b.example/")
+    shared = clients.get("https://c.example/")
+
+    assert clients.get("https://d.example/") is shared
+    assert clients.get("https://a.example/x") is first
+    assert (OTHER_HOSTS, True) in clients._clients
+    await clients.aclose()
+
+
+def test_a_new_event_loop_gets_new_clients():
+    clients = HttpClients()
+
+    async def get():
+        return clients.get("https://example.com/")
+
+    assert asyncio.run(get()) is not asyncio.run(get())
+
+
+@pytest.mark.asyncio
+async def test_connections_are_kept_alive_and_reported():
+    server = await asyncio.start_server(serve_ok, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    url = f"http://127.0.0.1:{port}/"
+    clients = HttpClients(HttpConfig(http2=False))
+    sent_before = HTTP_REQUESTS.value(host="127.0.0.1")
+
+    try:
+        for _ in range(3):
+            response = await clients.get(url).get(url)
+            assert response.text == "ok"
+
+        counts = clients.connection_counts()
+        assert counts[(f"http://127.0.0.1:{port}", "idle")] == 1
+        assert counts[(f"http://127.0.0.1:{port}", "active")] == 0
+        assert HTTP_REQUESTS.value(host="127.0.0.1") - sent_before == 3
+    finally:
+        await clients.aclose()
+        server.close()
+        await server.wait_closed()
+    assert clients.connection_counts() == {}
@@ -0,0 +1,116 @@
+"""Tests for LiteLLMProvider request building and its per-list cache."""
+
+from nanobot.bench import requests as requests_bench
+from nanobot.bench.requests import synthetic_history
+from nanobot.providers import litellm_provider
+from nanobot.providers.litellm_provider import LiteLLMProvider
+
+MODEL = "anthropic/claude-opus-4-5"
+
+
+def build(provider: LiteLLMProvider, messages: list[dict]) -> list[dict]:
+    return provider._build_kwargs(messages, None, MODEL, 4096, 0.7)["messages"]
+
+
+def test_only_appended_messages_are_sanitized(monkeypatch):
+    provider = LiteLLMProvider(default_model=MODEL)
+    sanitized = []
+    original = LiteLLMProvider._sanitize_message
+    monkeypatch.setattr(LiteLLMProvider, "_sanitize_message", staticmethod(lambda m: sanitized.append(m) or original(m)))
+    messages = synthetic_history(200)
+
+    first = provider._prepare_messages(messages)
+    messages.append({"role": "assistant", "content": "", "tool_calls": [{"id": "c", "type": "function"}]})
+    messages.append({"role": "tool", "tool_call_id": "c", "name": "exec", "content": "ok", "extra": 1})
+    second = provider._prepare_messages(messages)
+
+    assert len(sanitized) == 202
+    assert second[:200] == first
+    assert second[-2]["content"] is None
+    assert "extra" not in second[-1]
+    assert "timestamp" not in second[1] and "reasoning_content" in second[2]
+
+
+def test_changed_prefix_and_other_lists_are_prepared_from_scratch():
+    provider = LiteLLMProvider(default_model=MODEL)
+    messages = [{"role": "system", "content": "sys"}, {"role": "user", "content": "hi"}]
+    provider._prepare_messages(messages)
+
+    messages[1] = {"role": "user", "content": ""}
+    assert provider._prepare_messages(messages)[1]["content"] == "(empty)"
+    other = [{"role": "user", "content": "other"}]
+    assert provider._prepare_messages(other) == [{"role": "user", "content": "other"}]
+
+
+def test_model_lookups_are_memoized(monkeypatch):
+    provider = LiteLLMProvider(default_model="moonshot/kimi-k2.5")
+    lookups = []
+    original = litellm_provider.find_by_model
+    monkeypatch.setattr(litellm_provider, "find_by_model", lambda m: lookups.append(m) or original(m))
+
+    for _ in range(3):
+        kwargs = provider._build_kwargs([{"role": "user", "content": "hi"}], None, None, 4096, 0.7)
+
+    assert kwargs["model"] == "moonshot/kimi-k2.5"
+    assert kwargs["temperature"] == 1.0  # registry override
+    assert len(lookups) == 3  # resolve, cache support and overrides, once for the model
+
+
+def test_request_bench_sanitizes_only_new_messages_incrementally(monkeypatch):
+    sanitized, full_builds = [], []
+    original = LiteLLMProvider._sanitize_message
+    monkeypatch.setattr(LiteLLMProvider, "_sanitize_message", staticmethod(lambda m: sanitized.append(m) or original(m)))
+    full_build = requests_bench._full_build
+
+    def counted_full_build(*args):
+        before = len(sanitized)
+        kwargs = full_build(*args)
+        full_builds.append(len(sanitized) - before)
+        return kwargs
+
+    monkeypatch.setattr(requests_bench, "_full_build", counted_full_build)
+    result = requests_bench.run_request_bench(history=200, iterations=5, repeats=1)
+
+    assert result.history == 200 and result.iterations == 5
+    assert full_builds == [200, 202, 204, 206, 208]
+    assert len(sanitized) - sum(full_builds) == 200 + 2 * 4  # the history once, then each step's two new messages
+
+
+def cache_marked(messages: list[dict]) -> list[int]:
+    return [i for i, m in enumerate(messages)
+            if isinstance(m.get("content"), list) and "cache_control" in m["content"][-1]]
+
+
+def test_cache_breakpoints_cover_the_current_and_previous_request():
+    provider = LiteLLMProvider(default_model=MODEL)
+    tools = [{"type": "function", "function": {"name": "exec"}}]
+    call = {"role": "assistant", "content": None, "tool_calls": [{"id": "c1", "type": "function"}]}
+    messages = [
+        {"role": "system", "content": "sys"},
+        {"role": "user", "content": "earlier question"},
+        {"role": "assistant", "content": "earlier answer"},
+        {"role": "user", "content": "run it"},
+        call,
+        {"role": "tool", "tool_call_id": "c1", "name": "exec", "content": "done"},
+    ]
+
+    kwargs = provider._build_kwargs(messages, tools, None, 4096, 0.7)
+
+    assert cache_marked(kwargs["messages"]) == [0, 3, 5]  # system, previous call's input, this call's input
+    assert kwargs["tools"][-1]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in tools[-1] and isinstance(messages[5]["content"], str)
+
+
+def test_cache_breakpoints_stay_within_the_limit():
+    provider = LiteLLMProvider(default_model=MODEL)
+    messages = [{"role": "system", "content": "sys"}]
+    for i in range(10):
+        messages += [{"role": "user", "content": f"q{i}"}, {"role": "assistant", "content": f"a{i}"}]
+    messages.append({"role": "user", "content": "last"})
+
+    marked = cache_marked(provider._build_kwargs(messages, None, None, 4096, 0.7)["messages"])
+
+    assert marked == [0, 17, 19, 21]
+    assert cache_marked(LiteLLMProvider(default_model="openai/gpt-4o")._build_kwargs(
+        messages, None, None, 4096, 0.7)["messages"]) == []
+
@@ -0,0 +1,91 @@
+"""Tests for the synthetic load generator channel."""
+
+import asyncio
+import json
+
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.loadgen import LoadgenChannel
+from nanobot.config.schema import LoadgenConfig, LoadgenStep
+
+
+def make_config(**overrides) -> LoadgenConfig:
+    options = dict(
+        enabled=True, concurrency=[1, 3], stage_duration_s=0.3, drain_s=1.0, arrival_rate=50.0,
+        script=[LoadgenStep(content="hello"), LoadgenStep(content="/help")],
+    )
+    options.update(overrides)
+    return LoadgenConfig(**options)
+
+
+async def echo_agent(bus: MessageBus, channel: LoadgenChannel, busy_every: int = 0, answer_turns: bool = True) -> None:
+    """Answer each inbound message like the agent loop: turns keep metadata, slash commands do not."""
+    count = 0
+    while True:
+        msg = await bus.consume_inbound()
+        bus.inbound_done(msg)
+        count += 1
+        await asyncio.sleep(0.005)
+        if busy_every and count % busy_every == 0:
+            content, metadata = "busy", dict(msg.metadata)
+        elif msg.content.startswith("/"):
+            content, metadata = "help text", {}
+        elif not answer_turns:
+            continue
+        else:
+            content, metadata = "ok", dict(msg.metadata)
+        await channel.send(OutboundMessage(channel="loadgen", chat_id=msg.chat_id, content=content, metadata=metadata))
+
+
+def run_channel(channel: LoadgenChannel, bus: MessageBus, **agent_options) -> None:
+    async def run():
+        agent = asyncio.create_task(echo_agent(bus, channel, **agent_options))
+        runner = asyncio.create_task(channel.start())
+        await asyncio.wait_for(channel.finished.wait(), 10)
+        await channel.stop()
+        for task in (agent, runner):
+            task.cancel()
+        await asyncio.gather(agent, runner, return_exceptions=True)
+
+    asyncio.run(run())
+
+
+def test_loadgen_measures_each_concurrency_stage(tmp_path):
+    bus = MessageBus()
+    report = tmp_path / "report.json"
+    channel = LoadgenChannel(make_config(), bus, busy_reply="busy", report_path=report)
+
+    run_channel(channel, bus)
+
+    assert [p.concurrency for p in channel.results] == [1, 3]
+    for point in channel.results:
+        assert point.sent > 0
+        assert point.answered == point.sent
+        assert point.unanswered == 0
+        assert 0 < point.p50 <= point.p95 <= point.p99
+    data = json.loads(report.read_text())
+    assert [p["concurrency"] for p in data["points"]] == [1, 3]
+
+
+def test_loadgen_counts_busy_replies_as_shed(tmp_path):
+    bus = MessageBus()
+    channel = LoadgenChannel(make_config(concurrency=[2]), bus, busy_reply="busy")
+
+    run_channel(channel, bus, busy_every=2)
+
+    point = channel.results[0]
+    assert point.shed > 0
+    assert point.answered + point.shed == point.sent
+
+
+def test_scripted_stop_cancels_outstanding_turns():
+    bus = MessageBus()
+    script = [LoadgenStep(content="hello"), LoadgenStep(content="/stop")]
+    channel = LoadgenChannel(make_config(concurrency=[2], drain_s=0.2, script=script), bus)
+
+    run_channel(channel, bus, answer_turns=False)
+
+    point = channel.results[0]
+    assert point.stopped > 0
+    assert point.answered > 0  # the /stop replies
+    assert point.answered + point.stopped + point.unanswered == point.sent
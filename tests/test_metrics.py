@@ -0,0 +1,108 @@
+"""Tests for the metrics registry and the gateway metrics endpoint."""
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.registry import ToolRegistry
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.metrics import METRICS, MetricsRegistry, MetricsServer
+from nanobot.session.manager import SessionManager
+
+
+def test_render_counter_gauge_and_histogram() -> None:
+    registry = MetricsRegistry()
+    counter = registry.counter("x_total", "Things.", ("kind",))
+    counter.inc(kind="a")
+    counter.inc(2, kind="a")
+    registry.gauge("depth", "Depth.").set_function(lambda: 7)
+    hist = registry.histogram("lat_seconds", "Latency.", ("op",), buckets=(0.1, 1.0))
+    hist.observe(0.05, op="read")
+    hist.observe(0.5, op="read")
+
+    text = registry.render()
+
+    assert "# TYPE x_total counter" in text
+    assert 'x_total{kind="a"} 3' in text
+    assert "depth 7" in text
+    assert 'lat_seconds_bucket{op="read",le="0.1"} 1' in text
+    assert 'lat_seconds_bucket{op="read",le="1"} 2' in text
+    assert 'lat_seconds_bucket{op="read",le="+Inf"} 2' in text
+    assert 'lat_seconds_count{op="read"} 2' in text
+    assert text.endswith("\n")
+
+
+def test_label_mismatch_and_type_conflict_raise() -> None:
+    registry = MetricsRegistry()
+    counter = registry.counter("c_total", "C.", ("a",))
+    with pytest.raises(ValueError):
+        counter.inc(b="x")
+    with pytest.raises(ValueError):
+        registry.gauge("c_total", "C.")
+
+
+class _Failing(Tool):
+    @property
+    def name(self) -> str:
+        return "failing_tool"
+
+    @property
+    def description(self) -> str:
+        return "Always fails."
+
+    @property
+    def parameters(self) -> dict:
+        return {"type": "object", "properties": {}}
+
+    async def execute(self, **kwargs) -> str:
+        raise RuntimeError("boom")
+
+
+async def test_tool_registry_records_latency_and_errors() -> None:
+    from nanobot.metrics.registry import TOOL_ERRORS, TOOL_SECONDS
+
+    registry = ToolRegistry()
+    registry.register(_Failing())
+    before = TOOL_ERRORS.value(tool="failing_tool")
+
+    result = await registry.execute("failing_tool", {})
+
+    assert result.startswith("Error")
+    assert TOOL_ERRORS.value(tool="failing_tool") == before + 1
+    assert TOOL_SECONDS.count(tool="failing_tool") >= 1
+
+
+async def _get(port: int, path: str) -> tuple[str, str]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, body = raw.decode().partition("\r\n\r\n")
+    return head.splitlines()[0], body
+
+
+async def test_server_serves_metrics_and_health(tmp_path: Path) -> None:
+    bus = MessageBus()
+    await bus.publish_inbound(InboundMessage(channel="cli", sender_id="u", chat_id="c", content="hi"))
+    server = MetricsServer("127.0.0.1", 0, bus=bus, sessions=SessionManager(tmp_path))
+    await server.start()
+    try:
+        status, body = await _get(server.port, "/metrics")
+        assert status == "HTTP/1.1 200 OK"
+        assert "nanobot_bus_inbound_depth 1" in body
+        assert "nanobot_session_cache_entries 0" in body
+
+        status, body = await _get(server.port, "/health")
+        assert status == "HTTP/1.1 200 OK"
+        assert json.loads(body)["status"] == "ok"
+
+        status, _ = await _get(server.port, "/nope")
+        assert status == "HTTP/1.1 404 Not Found"
+    finally:
+        await server.stop()
+    assert METRICS.render()
@@ -0,0 +1,148 @@
+"""Tests for provider retries, circuit breaking and model fallback."""
+
+import asyncio
+
+import pytest
+
+from nanobot.providers.base import LLMProvider, LLMResponse, StreamChunk, error_response
+from nanobot.providers.resilient import CircuitBreaker, ResilientProvider
+
+
+class FakeProvider(LLMProvider):
+    def __init__(self, responses: list[LLMResponse], model: str = "primary"):
+        super().__init__()
+        self.responses = list(responses)
+        self.model = model
+        self.calls: list[str] = []
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        self.calls.append(model)
+        return self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+
+    def get_default_model(self) -> str:
+        return self.model
+
+
+def _error(status: int | None, retry_after: float | None = None) -> LLMResponse:
+    return LLMResponse(
+        content=f"Error calling LLM: {status}", finish_reason="error",
+        error_status=status, retry_after=retry_after,
+    )
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    delays: list[float] = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    return delays
+
+
+async def test_retries_transient_errors_then_succeeds(no_sleep) -> None:
+    primary = FakeProvider([_error(503), _error(429, retry_after=2.0), LLMResponse(content="ok")])
+    provider = ResilientProvider(primary, max_retries=2)
+
+    response = await provider.chat([{"role": "user", "content": "hi"}])
+
+    assert response.content == "ok"
+    assert len(primary.calls) == 3
+    assert no_sleep[1] == 2.0  # Retry-After is honoured
+
+
+async def test_non_retryable_error_goes_straight_to_fallback(no_sleep) -> None:
+    primary = FakeProvider([_error(400)])
+    backup = FakeProvider([LLMResponse(content="from backup")], model="backup")
+    provider = ResilientProvider(primary, [(backup, "backup-model")], max_retries=3)
+
+    response = await provider.chat([{"role": "user", "content": "hi"}], model="primary-model")
+
+    assert response.content == "from backup"
+    assert primary.calls == ["primary-model"]
+    assert backup.calls == ["backup-model"]
+    assert no_sleep == []
+
+
+async def test_all_tiers_failing_returns_last_error() -> None:
+    provider = ResilientProvider(FakeProvider([_error(500)]), [(FakeProvider([_error(401)]), "b")], max_retries=1)
+
+    response = await provider.chat([{"role": "user", "content": "hi"}])
+
+    assert response.finish_reason == "error"
+    assert response.error_status == 401
+
+
+async def test_open_circuit_skips_tier() -> None:
+    primary = FakeProvider([_error(None)])
+    backup = FakeProvider([LLMResponse(content="ok")], model="backup")
+    provider = ResilientProvider(primary, [(backup, "b")], max_retries=0, failure_threshold=2)
+
+    for _ in range(2):
+        await provider.chat([{"role": "user", "content": "hi"}])
+    assert provider.breaker("primary").state == "open"
+
+    await provider.chat([{"role": "user", "content": "hi"}])
+    assert len(primary.calls) == 2
+    assert len(backup.calls) == 3
+
+
+async def test_rejected_requests_do_not_open_the_circuit() -> None:
+    primary = FakeProvider([_error(400)])
+    provider = ResilientProvider(primary, max_retries=0, failure_threshold=2)
+
+    for _ in range(3):
+        await provider.chat([{"role": "user", "content": "far too long"}])
+
+    assert provider.breaker("primary").state == "closed"
+    assert len(primary.calls) == 3
+
+
+def test_circuit_breaker_half_opens_after_timeout(monkeypatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr("nanobot.providers.resilient.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_s=30)
+
+    breaker.record_failure()
+    assert not breaker.allow()
+    now[0] += 31
+    assert breaker.allow()  # one trial call
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+async def test_stream_is_not_retried_after_output_started() -> None:
+    class Streaming(FakeProvider):
+        async def chat_stream(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+            self.calls.append(model)
+            if len(self.calls) == 1:
+                yield StreamChunk(response=_error(503))
+                return
+            yield StreamChunk(content="par")
+            yield StreamChunk(response=_error(502))
+
+    primary = Streaming([])
+    provider = ResilientProvider(primary, max_retries=3)
+
+    chunks = [c async for c in provider.chat_stream([{"role": "user", "content": "hi"}])]
+
+    assert len(primary.calls) == 2
+    assert chunks[0].content == "par"
+    assert chunks[-1].response.error_status == 502
+
+
+def test_error_response_reads_status_and_retry_after() -> None:
+    class Response:
+        headers = {"retry-after": "7"}
+
+    class RateLimitError(Exception):
+        status_code = 429
+        response = Response
+
+    response = error_response("Error calling LLM: slow down", RateLimitError())
+
+    assert response.finish_reason == "error"
+    assert response.error_status == 429
+    assert response.retry_after == 7.0
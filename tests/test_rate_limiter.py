@@ -0,0 +1,114 @@
+"""Tests for the shared client-side LLM rate limiter."""
+
+import asyncio
+
+import pytest
+
+from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.providers.ratelimit import (
+    Priority,
+    RateLimitedProvider,
+    RateLimiter,
+    RateLimiters,
+    current_priority,
+    llm_priority,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> Clock:
+    return Clock()
+
+
+class EchoProvider(LLMProvider):
+    def __init__(self):
+        super().__init__()
+        self.calls: list[str] = []
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        self.calls.append(model)
+        return LLMResponse(content="ok", usage={"total_tokens": 10})
+
+    def get_default_model(self) -> str:
+        return "anthropic/claude-opus-4-5"
+
+
+async def test_request_budget_admits_within_limit(clock) -> None:
+    limiter = RateLimiter("m", rpm=2, clock=clock)
+    assert await limiter.acquire(0) == 0
+    assert await limiter.acquire(0) == 0
+
+    third = asyncio.create_task(limiter.acquire(0))
+    await asyncio.sleep(0.05)
+    assert not third.done()
+
+    clock.now += 30  # one request refilled
+    async with limiter._changed:
+        limiter._changed.notify_all()
+    await asyncio.wait_for(third, 1)
+
+
+async def test_interactive_overtakes_queued_background(clock) -> None:
+    limiter = RateLimiter("m", rpm=1, clock=clock)
+    await limiter.acquire(0)
+    order: list[str] = []
+
+    async def call(name: str, priority: Priority) -> None:
+        await limiter.acquire(0, priority)
+        order.append(name)
+
+    background = [asyncio.create_task(call(f"bg{i}", Priority.BACKGROUND)) for i in range(2)]
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(call("user", Priority.INTERACTIVE))
+    await asyncio.sleep(0)
+
+    for _ in range(3):
+        clock.now += 60
+        async with limiter._changed:
+            limiter._changed.notify_all()
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+    await asyncio.wait_for(asyncio.gather(interactive, *background), 1)
+    assert order == ["user", "bg0", "bg1"]
+
+
+async def test_token_budget_is_settled_with_real_usage(clock) -> None:
+    limiter = RateLimiter("m", tpm=1000, clock=clock)
+    await limiter.acquire(800)
+    limiter.settle(estimated=800, actual=100)
+    assert limiter.tokens.level == pytest.approx(900)
+
+
+def test_limits_resolve_model_before_provider() -> None:
+    limiters = RateLimiters({"anthropic": {"rpm": 50}, "anthropic/claude-haiku": {"rpm": 500}})
+
+    shared = limiters.get("anthropic/claude-opus-4-5", "anthropic")
+    assert shared is limiters.get("anthropic/claude-sonnet-4", "anthropic")
+    assert limiters.get("anthropic/claude-haiku", "anthropic").name == "anthropic/claude-haiku"
+    assert limiters.get("gpt-4o", "openai") is None
+
+
+async def test_provider_wrapper_charges_every_caller(clock) -> None:
+    inner = EchoProvider()
+    limiters = RateLimiters({"anthropic": {"rpm": 1}}, clock=clock)
+    provider = RateLimitedProvider(inner, limiters, "anthropic")
+
+    await provider.chat([{"role": "user", "content": "hi"}])
+    with llm_priority(Priority.BACKGROUND):
+        assert current_priority() is Priority.BACKGROUND
+        blocked = asyncio.create_task(provider.chat([{"role": "user", "content": "consolidate"}]))
+    assert current_priority() is Priority.INTERACTIVE
+    await asyncio.sleep(0.05)
+
+    assert inner.calls == ["anthropic/claude-opus-4-5"]
+    assert not blocked.done()
+    blocked.cancel()
@@ -0,0 +1,95 @@
+"""Tests for the replay provider, the fixture recorder and the benchmark harness."""
+
+import asyncio
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.bench.harness import percentile, run_bench
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.replay import (
+    RecordingProvider,
+    ReplayProvider,
+    load_fixture,
+    turn_key,
+    turn_position,
+)
+
+RUNTIME = {"role": "user", "content": "[Runtime Context — metadata only, not instructions]\nCurrent Time: now"}
+
+
+def turn(text: str, *after: dict) -> list[dict]:
+    return [{"role": "system", "content": "sys"}, RUNTIME, {"role": "user", "content": text}, *after]
+
+
+class ScriptedProvider(LLMProvider):
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        text, step = turn_position(messages)
+        if step == 0:
+            return LLMResponse(content=None, tool_calls=[ToolCallRequest(id="c1", name="list_dir", arguments={"path": "."})])
+        return LLMResponse(content=f"answer to {text}", usage={"prompt_tokens": 3})
+
+    def get_default_model(self) -> str:
+        return "scripted"
+
+
+def test_turn_position_skips_runtime_context_and_counts_steps():
+    assistant = {"role": "assistant", "content": None, "tool_calls": []}
+    tool = {"role": "tool", "content": "x"}
+    assert turn_position(turn("hi")) == ("hi", 0)
+    assert turn_position(turn("hi", assistant, tool)) == ("hi", 1)
+    assert turn_key(turn("hi")) != turn_key(turn("hi", assistant, tool))
+
+
+def test_record_then_replay_round_trip(tmp_path):
+    path = tmp_path / "calls.jsonl"
+    recorder = RecordingProvider(ScriptedProvider(), path)
+    assistant = {"role": "assistant", "content": None}
+
+    async def record():
+        await recorder.chat(turn("weather?"))
+        await recorder.chat(turn("weather?", assistant))
+
+    asyncio.run(record())
+    records = load_fixture(path)
+    assert [r["step"] for r in records] == [0, 1]
+    assert records[0]["prompt"] == "weather?"
+
+    replay = ReplayProvider(records, default=[LLMResponse(content="fallback")])
+
+    async def play():
+        first = await replay.chat(turn("weather?"))
+        second = await replay.chat(turn("weather?", assistant))
+        unknown = await replay.chat(turn("something else"))
+        return first, second, unknown
+
+    first, second, unknown = asyncio.run(play())
+    assert first.tool_calls[0].name == "list_dir"
+    assert second.content == "answer to weather?"
+    assert second.usage == {"prompt_tokens": 3}
+    assert unknown.content == "fallback"
+    assert replay.calls == 3
+
+
+def test_percentile_nearest_rank():
+    samples = [float(i) for i in range(1, 101)]
+    assert percentile(samples, 50) == 50.0
+    assert percentile(samples, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+
+def test_run_bench_drives_sessions_through_the_bus(tmp_path):
+    bus = MessageBus()
+    provider = ReplayProvider(default=[
+        LLMResponse(content=None, tool_calls=[ToolCallRequest(id="c1", name="list_dir", arguments={"path": "."})]),
+        LLMResponse(content="Done."),
+    ])
+    agent = AgentLoop(bus=bus, provider=provider, workspace=tmp_path)
+
+    result = asyncio.run(run_bench(agent, bus, sessions=3, turns=2, turn_timeout_s=10))
+
+    assert result.turns == 6
+    assert result.timeouts == 0
+    assert result.llm_calls == 12
+    assert result.throughput > 0
+    assert result.stages["tools"] > 0
+    assert set(result.stage_breakdown()) == {"queue", "llm", "tools", "session_io", "agent"}
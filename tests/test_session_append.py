@@ -0,0 +1,216 @@
+"""Tests for append-only session persistence and compaction."""
+
+import asyncio
+import json
+from pathlib import Path
+
+from nanobot.session.manager import Session, SessionManager
+
+
+def _lines(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line]
+
+
+def test_save_appends_only_new_messages(tmp_path: Path) -> None:
+    manager = SessionManager(tmp_path)
+    session = manager.get_or_create("cli:append")
+    for i in range(200):
+        session.add_message("user", f"msg{i}")
+    manager.save(session)
+    path = manager._get_session_path(session.key)
+    prefix = path.read_bytes()
+
+    session.add_message("user", "new")
+    session.last_consolidated = 7
+    manager.save(session)
+
+    data = path.read_bytes()
+    assert data.startswith(prefix), "existing history must not be rewritten"
+    appended = _lines(path)[-2:]
+    assert appended[0]["content"] == "new"
+    assert appended[1]["_type"] == "metadata"
+    assert appended[1]["last_consolidated"] == 7
+
+
+def test_save_cost_independent_of_history_length(tmp_path: Path) -> None:
+    """Bytes written per turn stay constant no matter how long the history is."""
+    manager = SessionManager(tmp_path)
+    written = []
+    for size in (10, 5000):
+        session = manager.get_or_create(f"cli:bench{size}")
+        for i in range(size):
+            session.add_message("user", f"msg{i}")
+        manager.save(session)
+        path = manager._get_session_path(session.key)
+        before = path.stat().st_size
+        session.add_message("assistant", "reply")
+        manager.save(session)
+        written.append(path.stat().st_size - before)
+    assert abs(written[0] - written[1]) < 16
+
+
+def test_reload_uses_trailing_metadata(tmp_path: Path) -> None:
+    manager = SessionManager(tmp_path)
+    session = manager.get_or_create("cli:reload")
+    session.add_message("user", "a")
+    manager.save(session)
+    session.add_message("assistant", "b")
+    session.last_consolidated = 1
+    session.metadata["topic"] = "x"
+    manager.save(session)
+
+    manager2 = SessionManager(tmp_path)
+    fresh = manager2.get_or_create("cli:reload")
+    assert fresh.messages[1]["content"] == "b"
+    assert fresh.last_consolidated == 1
+    assert fresh.metadata == {"topic": "x"}
+    manager2.load_history(fresh)
+    assert [m["content"] for m in fresh.messages] == ["a", "b"]
+
+    listed = SessionManager(tmp_path).list_sessions()
+    assert listed[0]["updated_at"] == session.updated_at.isoformat()
+
+
+def test_clear_rewrites_file(tmp_path: Path) -> None:
+    manager = SessionManager(tmp_path)
+    session = manager.get_or_create("cli:clear")
+    session.add_message("user", "old")
+    manager.save(session)
+    session.clear()
+    manager.save(session)
+
+    path = manager._get_session_path(session.key)
+    assert [d.get("_type") for d in _lines(path)] == ["metadata"]
+
+
+def test_torn_append_is_tolerated_and_repaired(tmp_path: Path) -> None:
+    manager = SessionManager(tmp_path)
+    session = manager.get_or_create("cli:torn")
+    session.add_message("user", "ok")
+    manager.save(session)
+    path = manager._get_session_path(session.key)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"role": "user", "cont')
+
+    loaded = SessionManager(tmp_path).get_or_create("cli:torn")
+    assert [m["content"] for m in loaded.messages] == ["ok"]
+    loaded.add_message("assistant", "fine")
+
+    manager2 = SessionManager(tmp_path)
+    manager2.save(loaded)
+    assert [d.get("content") for d in _lines(path)[1:]] == ["ok", "fine"]
+
+
+def test_compaction_drops_superseded_metadata(tmp_path: Path) -> None:
+    manager = SessionManager(tmp_path)
+    manager.COMPACT_AFTER = 3
+    session = manager.get_or_create("cli:compact")
+    for i in range(5):
+        session.add_message("user", f"m{i}")
+        manager.save(session)
+
+    path = manager._get_session_path(session.key)
+    records = _lines(path)
+    assert sum(1 for d in records if d.get("_type") == "metadata") <= 2
+    assert [d["content"] for d in records if "content" in d] == [f"m{i}" for i in range(5)]
+
+
+async def test_background_compaction_keeps_concurrent_appends(tmp_path: Path) -> None:
+    manager = SessionManager(tmp_path)
+    manager.COMPACT_AFTER = 2
+    session = manager.get_or_create("cli:bg")
+    for i in range(3):
+        session.add_message("user", f"m{i}")
+        manager.save(session)
+    assert session.key in manager._compactions
+
+    session.add_message("user", "during")
+    manager.save(session)
+    await manager._compactions[session.key]
+    await asyncio.sleep(0)
+
+    reloaded = SessionManager(tmp_path).get_or_create("cli:bg")
+    assert [m["content"] for m in reloaded.messages] == ["m0", "m1", "m2", "during"]
+    assert reloaded.updated_at == session.updated_at
+
+
+def test_manual_session_object_overwrites_instead_of_appending(tmp_path: Path) -> None:
+    manager = SessionManager(tmp_path)
+    first = Session(key="cli:manual")
+    first.add_message("user", "a")
+    manager.save(first)
+
+    second = Session(key="cli:manual")
+    second.add_message("user", "b")
+    manager.save(second)
+
+    path = manager._get_session_path("cli:manual")
+    assert [d.get("content") for d in _lines(path)[1:]] == ["b"]
+
+
+def _consolidated_session(manager: SessionManager, key: str, total: int, consolidated: int) -> Session:
+    session = manager.get_or_create(key)
+    for i in range(total):
+        session.add_message("user", f"m{i}")
+    session.last_consolidated = consolidated
+    manager.save(session)
+    return session
+
+
+def test_load_parses_only_unconsolidated_tail(tmp_path: Path, monkeypatch) -> None:
+    manager = SessionManager(tmp_path)
+    session = _consolidated_session(manager, "cli:tail", 500, 0)
+    session.add_message("assistant", "latest")
+    session.last_consolidated = 495
+    manager.save(session)
+
+    parsed = []
+    real_loads = json.loads
+    monkeypatch.setattr(json, "loads", lambda s, *a, **kw: parsed.append(s) or real_loads(s, *a, **kw))
+    loaded = SessionManager(tmp_path).get_or_create("cli:tail")
+    monkeypatch.undo()
+
+    assert len(loaded.messages) == 501
+    assert loaded.last_consolidated == 495
+    assert [m["content"] for m in loaded.get_history()] == ["m495", "m496", "m497", "m498", "m499", "latest"]
+    assert len(parsed) < 20, "consolidated history must not be parsed"
+
+
+def test_rewrite_and_compaction_record_checkpoint(tmp_path: Path) -> None:
+    manager = SessionManager(tmp_path)
+    manager.COMPACT_AFTER = 2
+    _consolidated_session(manager, "cli:ckpt", 30, 20)  # full rewrite: checkpoint in the header
+
+    loaded = SessionManager(tmp_path).get_or_create("cli:ckpt")
+    assert loaded._loaded_from == 20
+    assert loaded.messages[20]["content"] == "m20"
+
+    manager2 = SessionManager(tmp_path)
+    manager2.COMPACT_AFTER = 2
+    session = manager2.get_or_create("cli:ckpt")
+    for i in range(3):
+        session.add_message("user", f"new{i}")
+        session.last_consolidated += 1
+        manager2.save(session)  # triggers a compaction of a tail-only session
+
+    fresh_manager = SessionManager(tmp_path)
+    fresh = fresh_manager.get_or_create("cli:ckpt")
+    assert fresh.last_consolidated == 23
+    assert fresh.messages[23]["content"] == "m23"
+    fresh_manager.load_history(fresh)
+    assert [m["content"] for m in fresh.messages] == [f"m{i}" for i in range(30)] + ["new0", "new1", "new2"]
+
+
+def test_load_history_then_rewrite_keeps_prefix(tmp_path: Path) -> None:
+    manager = SessionManager(tmp_path)
+    _consolidated_session(manager, "cli:prefix", 10, 8)
+
+    manager2 = SessionManager(tmp_path)
+    session = manager2.get_or_create("cli:prefix")
+    session._persisted = None  # force a full rewrite
+    manager2.save(session)
+
+    fresh_manager = SessionManager(tmp_path)
+    fresh = fresh_manager.get_or_create("cli:prefix")
+    fresh_manager.load_history(fresh)
+    assert [m["content"] for m in fresh.messages] == [f"m{i}" for i in range(10)]
@@ -0,0 +1,109 @@
+"""Tests for the bounded session cache."""
+
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMResponse
+from nanobot.session.manager import SessionManager
+
+
+def _fill(manager: SessionManager, key: str, n: int = 1, size: int = 10) -> None:
+    session = manager.get_or_create(key)
+    for _ in range(n):
+        session.add_message("user", "x" * size)
+    manager.save(session)
+
+
+def test_lru_evicts_least_recently_used(tmp_path: Path) -> None:
+    manager = SessionManager(tmp_path, max_cached=2)
+    _fill(manager, "cli:a")
+    _fill(manager, "cli:b")
+    manager.get_or_create("cli:a")  # a becomes most recent
+    _fill(manager, "cli:c")
+
+    assert list(manager._cache) == ["cli:a", "cli:c"]
+    assert manager.cache_stats()["evictions"] == 1
+
+    reloaded = manager.get_or_create("cli:b")
+    assert reloaded.messages[0]["content"] == "x" * 10
+    stats = manager.cache_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 4)
+
+
+def test_byte_budget_and_in_use_veto(tmp_path: Path) -> None:
+    manager = SessionManager(tmp_path, max_cached=0, max_cached_bytes=30_000)
+    busy = {"cli:big"}
+    evicted: list[str] = []
+    manager.in_use = lambda key: key in busy
+    manager.on_evict = evicted.append
+
+    _fill(manager, "cli:big", n=20, size=1000)
+    _fill(manager, "cli:small", n=1)
+    _fill(manager, "cli:huge", n=20, size=1000)
+
+    assert "cli:big" in manager._cache
+    assert evicted == ["cli:small"]
+    assert manager.cache_stats()["bytes"] > 30_000  # over budget, but everything left is busy
+
+    busy.clear()
+    manager.get_or_create("cli:other")
+    assert evicted == ["cli:small", "cli:big"]
+
+
+def test_cache_bytes_track_clear(tmp_path: Path) -> None:
+    manager = SessionManager(tmp_path)
+    _fill(manager, "cli:a", n=10, size=1000)
+    before = manager.cache_stats()["bytes"]
+    session = manager.get_or_create("cli:a")
+    session.clear()
+    manager.save(session)
+    assert manager.cache_stats()["bytes"] < before
+    manager.invalidate("cli:a")
+    assert manager.cache_stats() | {"hits": 0, "misses": 0} == {
+        "entries": 0, "bytes": 0, "hits": 0, "misses": 0, "evictions": 0,
+    }
+
+
+async def test_agent_loop_drops_lock_state_with_session(tmp_path: Path) -> None:
+    provider = MagicMock()
+    provider.get_default_model.return_value = "test-model"
+    sessions = SessionManager(tmp_path, max_cached=1)
+    loop = AgentLoop(bus=MessageBus(), provider=provider, workspace=tmp_path, session_manager=sessions)
+
+    lock = loop._session_locks.setdefault("cli:a", asyncio.Lock())
+    sessions.get_or_create("cli:a")
+    async with lock:
+        sessions.get_or_create("cli:b")
+        assert "cli:a" in sessions._cache  # mid-turn sessions are not evicted
+
+    loop._session_locks.setdefault("cli:b", asyncio.Lock())
+    sessions.get_or_create("cli:c")
+    assert set(sessions._cache) == {"cli:c"}
+    assert "cli:a" not in loop._session_locks
+    assert "cli:b" not in loop._session_locks
+
+
+async def test_background_consolidation_offset_survives_eviction(tmp_path: Path) -> None:
+    provider = MagicMock()
+    provider.get_default_model.return_value = "test-model"
+    provider.chat = AsyncMock(return_value=LLMResponse(content="ok"))
+    loop = AgentLoop(bus=MessageBus(), provider=provider, workspace=tmp_path, model="test-model", memory_window=10)
+    loop.tools.get_definitions = MagicMock(return_value=[])
+    _fill(loop.sessions, "cli:a", n=12)
+
+    async def _fake_consolidate(session, archive_all: bool = False) -> bool:
+        session.last_consolidated = len(session.messages) - 5
+        return True
+
+    loop._consolidate_memory = _fake_consolidate  # type: ignore[method-assign]
+    await loop._process_message(InboundMessage(channel="cli", sender_id="u", chat_id="a", content="hi"))
+    await asyncio.gather(*loop._consolidation_tasks)
+    expected = loop.sessions.get_or_create("cli:a").last_consolidated
+
+    loop.sessions.invalidate("cli:a")
+    assert expected > 0
+    assert loop.sessions.get_or_create("cli:a").last_consolidated == expected
@@ -0,0 +1,104 @@
+"""Tests for the SQLite session backend."""
+
+from pathlib import Path
+
+from nanobot.session.manager import Session, SessionManager
+from nanobot.session.sqlite import SQLiteSessionManager
+
+
+def _contents(session: Session) -> list[str]:
+    return [m["content"] for m in session.messages]
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    manager = SQLiteSessionManager(tmp_path)
+    session = manager.get_or_create("telegram:1")
+    session.add_message("user", "hi")
+    session.add_message("assistant", "hello", tools_used=["read_file"])
+    session.metadata["topic"] = "greeting"
+    session.last_consolidated = 1
+    manager.save(session)
+    manager.close()
+
+    manager = SQLiteSessionManager(tmp_path)
+    loaded = manager.get_or_create("telegram:1")
+    assert loaded.messages[0] is None  # consolidated, not loaded
+    manager.load_history(loaded)
+    assert _contents(loaded) == ["hi", "hello"]
+    assert loaded.messages[1]["tools_used"] == ["read_file"]
+    assert loaded.metadata == {"topic": "greeting"}
+    assert loaded.last_consolidated == 1
+    assert loaded.created_at == session.created_at
+    assert loaded.updated_at == session.updated_at
+
+
+def test_save_inserts_only_new_messages(tmp_path: Path) -> None:
+    manager = SQLiteSessionManager(tmp_path)
+    session = manager.get_or_create("cli:inc")
+    session.add_message("user", "a")
+    manager.save(session)
+
+    before = manager._conn.total_changes
+    session.add_message("assistant", "b")
+    manager.save(session)
+
+    # One message insert plus one session upsert.
+    assert manager._conn.total_changes - before == 2
+    assert _contents(SQLiteSessionManager(tmp_path).get_or_create("cli:inc")) == ["a", "b"]
+
+
+def test_clear_replaces_messages(tmp_path: Path) -> None:
+    manager = SQLiteSessionManager(tmp_path)
+    session = manager.get_or_create("cli:clear")
+    session.add_message("user", "old")
+    manager.save(session)
+    session.clear()
+    session.add_message("user", "new")
+    manager.save(session)
+
+    assert _contents(SQLiteSessionManager(tmp_path).get_or_create("cli:clear")) == ["new"]
+
+
+def test_list_sessions_newest_first_and_delete(tmp_path: Path) -> None:
+    manager = SQLiteSessionManager(tmp_path)
+    for key in ("cli:a", "cli:b", "cli:c"):
+        session = manager.get_or_create(key)
+        session.add_message("user", key)
+        manager.save(session)
+
+    assert [s["key"] for s in manager.list_sessions()] == ["cli:c", "cli:b", "cli:a"]
+
+    assert manager.delete("cli:b") is True
+    assert manager.delete("cli:b") is False
+    assert [s["key"] for s in manager.list_sessions()] == ["cli:c", "cli:a"]
+    assert manager.get_or_create("cli:b").messages == []
+
+
+def test_migrate_from_jsonl(tmp_path: Path) -> None:
+    jsonl = SessionManager(tmp_path)
+    for key in ("telegram:1", "slack:2"):
+        session = jsonl.get_or_create(key)
+        session.add_message("user", f"from {key}")
+        session.last_consolidated = 1
+        jsonl.save(session)
+
+    manager = SQLiteSessionManager(tmp_path)
+    assert manager.migrate_from_jsonl() == 2
+    assert manager.migrate_from_jsonl() == 0
+
+    loaded = manager.get_or_create("slack:2")
+    manager.load_history(loaded)
+    assert _contents(loaded) == ["from slack:2"]
+    assert loaded.last_consolidated == 1
+    assert {s["key"] for s in manager.list_sessions()} == {"telegram:1", "slack:2"}
+
+
+def test_jsonl_delete_removes_file(tmp_path: Path) -> None:
+    manager = SessionManager(tmp_path)
+    session = manager.get_or_create("cli:gone")
+    session.add_message("user", "x")
+    manager.save(session)
+
+    assert manager.delete("cli:gone") is True
+    assert not manager._get_session_path("cli:gone").exists()
+    assert manager.list_sessions() == []
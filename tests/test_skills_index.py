@@ -0,0 +1,96 @@
+"""Tests for the SkillsLoader index."""
+
+import shutil
+from pathlib import Path
+
+from nanobot.agent.context import ContextBuilder
+from nanobot.agent.skills import SkillsLoader
+
+
+def _make_skills(workspace: Path, count: int) -> None:
+    for i in range(count):
+        skill = workspace / "skills" / f"skill{i:03d}"
+        skill.mkdir(parents=True)
+        meta = '{"nanobot": {"requires": {"bins": ["tool%d"]}}}' % (i % 5)
+        skill.joinpath("SKILL.md").write_text(
+            f"---\nname: skill{i:03d}\ndescription: Skill number {i}\nmetadata: {meta}\n---\nBody {i}\n",
+            encoding="utf-8",
+        )
+
+
+def _counting(monkeypatch):
+    counts = {"reads": 0, "which": 0}
+    real_read_text = Path.read_text
+    real_which = shutil.which
+
+    def read_text(self, *args, **kwargs):
+        counts["reads"] += 1
+        return real_read_text(self, *args, **kwargs)
+
+    def which(name, *args, **kwargs):
+        counts["which"] += 1
+        return real_which(name, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "read_text", read_text)
+    monkeypatch.setattr(shutil, "which", which)
+    return counts
+
+
+def test_index_parses_each_skill_once(tmp_path: Path, monkeypatch) -> None:
+    _make_skills(tmp_path, 300)
+    loader = SkillsLoader(tmp_path, builtin_skills_dir=tmp_path / "none")
+    counts = _counting(monkeypatch)
+
+    loader.build_skills_summary()
+    assert counts == {"reads": 300, "which": 5}
+
+    for _ in range(20):
+        summary = loader.build_skills_summary()
+        loader.get_always_skills()
+
+    assert counts == {"reads": 300, "which": 5}
+    assert summary.count("<skill ") == 300
+
+
+def test_index_picks_up_edits_new_and_removed_skills(tmp_path: Path) -> None:
+    _make_skills(tmp_path, 3)
+    loader = SkillsLoader(tmp_path, builtin_skills_dir=tmp_path / "none")
+    assert "Skill number 1" in loader.build_skills_summary()
+
+    (tmp_path / "skills" / "skill001" / "SKILL.md").write_text(
+        "---\ndescription: rewritten and longer\n---\n", encoding="utf-8",
+    )
+    shutil.rmtree(tmp_path / "skills" / "skill002")
+    new = tmp_path / "skills" / "fresh"
+    new.mkdir()
+    (new / "SKILL.md").write_text("---\ndescription: brand new\nalways: true\n---\nhi", encoding="utf-8")
+
+    summary = loader.build_skills_summary()
+    assert "rewritten and longer" in summary
+    assert "skill002" not in summary
+    assert "brand new" in summary
+    assert loader.get_always_skills() == ["fresh"]
+
+
+def test_workspace_skill_shadows_builtin(tmp_path: Path) -> None:
+    builtin = tmp_path / "builtin" / "weather"
+    builtin.mkdir(parents=True)
+    (builtin / "SKILL.md").write_text("---\ndescription: builtin\n---\n", encoding="utf-8")
+    local = tmp_path / "ws" / "skills" / "weather"
+    local.mkdir(parents=True)
+    (local / "SKILL.md").write_text("---\ndescription: local\n---\n", encoding="utf-8")
+
+    loader = SkillsLoader(tmp_path / "ws", builtin_skills_dir=tmp_path / "builtin")
+    assert loader.list_skills() == [{"name": "weather", "path": str(local / "SKILL.md"), "source": "workspace"}]
+
+
+def test_warm_system_prompt_reads_no_skill_files(tmp_path: Path, monkeypatch) -> None:
+    _make_skills(tmp_path, 200)
+    builder = ContextBuilder(tmp_path)
+    builder.build_system_prompt()
+    counts = _counting(monkeypatch)
+    builder._prompt = None
+    builder._parts.pop("skills")  # force the skills sections to be rebuilt from the index
+
+    builder.build_system_prompt()
+    assert counts == {"reads": 0, "which": 0}
@@ -0,0 +1,186 @@
+"""Tests for streamed LLM responses and partial reply forwarding."""
+
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.queue import MessageBus
+from nanobot.config.schema import ChannelsConfig
+from nanobot.providers.base import LLMResponse, StreamAccumulator, StreamChunk, ToolCallRequest
+
+
+def _chunk(content=None, tool_calls=None, finish_reason=None, usage=None):
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls, reasoning_content=None)
+    return SimpleNamespace(
+        choices=[SimpleNamespace(delta=delta, finish_reason=finish_reason)],
+        usage=usage,
+    )
+
+
+def _tc_delta(index, id=None, name=None, arguments=None):
+    return SimpleNamespace(index=index, id=id, function=SimpleNamespace(name=name, arguments=arguments))
+
+
+def _make_loop(tmp_path: Path, stream: bool = True) -> AgentLoop:
+    provider = MagicMock()
+    provider.get_default_model.return_value = "test-model"
+    channels = ChannelsConfig(stream_replies=stream, stream_interval_ms=0)
+    loop = AgentLoop(
+        bus=MessageBus(), provider=provider, workspace=tmp_path,
+        model="test-model", channels_config=channels,
+    )
+    loop.tools.get_definitions = MagicMock(return_value=[])
+    return loop
+
+
+def test_accumulator_assembles_text_tool_calls_and_usage() -> None:
+    acc = StreamAccumulator()
+    assert acc.add(_chunk(content="Hel")) == "Hel"
+    assert acc.add(_chunk(content="lo")) == "lo"
+    acc.add(_chunk(tool_calls=[_tc_delta(0, id="call1", name="read_file", arguments='{"pa')]))
+    acc.add(_chunk(tool_calls=[_tc_delta(0, arguments='th": "a.txt"}')]))
+    acc.add(_chunk(finish_reason="tool_calls"))
+    acc.add(SimpleNamespace(
+        choices=[], usage=SimpleNamespace(prompt_tokens=3, completion_tokens=4, total_tokens=7),
+    ))
+
+    response = acc.build()
+
+    assert response.content == "Hello"
+    assert response.finish_reason == "tool_calls"
+    assert response.tool_calls[0].id == "call1"
+    assert response.tool_calls[0].arguments == {"path": "a.txt"}
+    assert response.usage == {"prompt_tokens": 3, "completion_tokens": 4, "total_tokens": 7}
+
+
+@pytest.mark.asyncio
+async def test_default_chat_stream_falls_back_to_chat() -> None:
+    from nanobot.providers.base import LLMProvider
+
+    class Plain(LLMProvider):
+        async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+            return LLMResponse(content="whole answer")
+
+        def get_default_model(self) -> str:
+            return "m"
+
+    chunks = [c async for c in Plain().chat_stream([{"role": "user", "content": "hi"}])]
+
+    assert len(chunks) == 1
+    assert chunks[0].response.content == "whole answer"
+
+
+@pytest.mark.asyncio
+async def test_agent_loop_forwards_partial_replies(tmp_path: Path) -> None:
+    loop = _make_loop(tmp_path)
+
+    async def fake_stream(**kwargs):
+        for piece in ("Hel", "lo", " world"):
+            yield StreamChunk(content=piece)
+        yield StreamChunk(response=LLMResponse(content="Hello world"))
+
+    loop.provider.chat_stream = fake_stream
+    updates: list[tuple[str, str | None]] = []
+
+    async def on_progress(content: str, *, tool_hint: bool = False, stream: str | None = None) -> None:
+        updates.append((content, stream))
+
+    final, _, _ = await loop._run_agent_loop([{"role": "user", "content": "hi"}], on_progress=on_progress)
+
+    assert final == "Hello world"
+    assert [u[0] for u in updates] == ["Hel", "Hello", "Hello world"]
+    assert len({u[1] for u in updates}) == 1
+
+
+@pytest.mark.asyncio
+async def test_streamed_text_is_not_repeated_before_tool_calls(tmp_path: Path) -> None:
+    loop = _make_loop(tmp_path)
+    calls = iter([
+        LLMResponse(content="Checking", tool_calls=[ToolCallRequest(id="c1", name="list_dir", arguments={"path": "."})]),
+        LLMResponse(content="Done"),
+    ])
+
+    async def fake_stream(**kwargs):
+        response = next(calls)
+        yield StreamChunk(content=response.content)
+        yield StreamChunk(response=response)
+
+    loop.provider.chat_stream = fake_stream
+    updates: list[tuple[str, bool, str | None]] = []
+
+    async def on_progress(content: str, *, tool_hint: bool = False, stream: str | None = None) -> None:
+        updates.append((content, tool_hint, stream))
+
+    await loop._run_agent_loop([{"role": "user", "content": "hi"}], on_progress=on_progress)
+
+    plain = [u for u in updates if not u[1] and not u[2]]
+    assert plain == []
+    assert [u[0] for u in updates if u[2]] == ["Checking", "Done"]
+    assert updates[0][2] != updates[-1][2]
+
+
+@pytest.mark.asyncio
+async def test_streaming_disabled_uses_chat(tmp_path: Path) -> None:
+    loop = _make_loop(tmp_path, stream=False)
+    loop.provider.chat = AsyncMock(return_value=LLMResponse(content="ok"))
+    loop.provider.chat_stream = MagicMock()
+
+    final, _, _ = await loop._run_agent_loop(
+        [{"role": "user", "content": "hi"}], on_progress=AsyncMock(),
+    )
+
+    assert final == "ok"
+    loop.provider.chat_stream.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_codex_sse_yields_deltas_and_final_response() -> None:
+    from nanobot.providers.openai_codex_provider import _stream_sse
+
+    events = [
+        '{"type": "response.output_text.delta", "delta": "Hi"}',
+        '{"type": "response.output_text.delta", "delta": " there"}',
+        '{"type": "response.output_item.added", "item": {"type": "function_call", "call_id": "c1", "id": "fc1", "name": "web_fetch"}}',
+        '{"type": "response.function_call_arguments.done", "call_id": "c1", "arguments": "{\\"url\\": \\"https://x\\"}"}',
+        '{"type": "response.output_item.done", "item": {"type": "function_call", "call_id": "c1"}}',
+        '{"type": "response.completed", "response": {"status": "completed"}}',
+    ]
+
+    class FakeResponse:
+        async def aiter_lines(self):
+            for e in events:
+                yield f"data: {e}"
+                yield ""
+
+    chunks = [c async for c in _stream_sse(FakeResponse())]
+
+    assert [c.content for c in chunks if c.content] == ["Hi", " there"]
+    assert [c.tool_call.name for c in chunks if c.tool_call] == ["web_fetch"]
+    final = chunks[-1].response
+    assert final.content == "Hi there"
+    assert final.tool_calls[0].arguments == {"url": "https://x"}
+    assert final.finish_reason == "stop"
+
+
+@pytest.mark.asyncio
+async def test_final_reply_names_the_stream_it_replaces(tmp_path: Path) -> None:
+    from nanobot.bus.events import InboundMessage
+
+    loop = _make_loop(tmp_path)
+
+    async def fake_stream(**kwargs):
+        yield StreamChunk(content="Hi there")
+        yield StreamChunk(response=LLMResponse(content="Hi there"))
+
+    loop.provider.chat_stream = fake_stream
+    msg = InboundMessage(channel="telegram", sender_id="u", chat_id="c", content="hi")
+
+    final = await loop._process_message(msg)
+    partial = await loop.bus.consume_outbound()
+
+    assert partial.metadata["_stream"]
+    assert final.metadata["_replaces_stream"] == partial.metadata["_stream"]
+    assert "_replaces_stream" not in (msg.metadata or {})
@@ -0,0 +1,101 @@
+"""Tests for token-budget history assembly and consolidation."""
+
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMResponse
+from nanobot.session.manager import Session
+from nanobot.utils.tokens import estimate_message_tokens, estimate_tokens
+
+
+def test_estimate_tokens_handles_ascii_and_cjk() -> None:
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("a" * 400) == 100
+    assert estimate_tokens("你好" * 50) == 100
+    image = {"role": "user", "content": [{"type": "image_url", "image_url": {"url": "data:..."}}]}
+    assert estimate_message_tokens(image) > estimate_message_tokens({"role": "user", "content": "hi"})
+
+
+def test_get_history_packs_newest_messages_within_budget() -> None:
+    session = Session(key="cli:t")
+    session.add_message("user", "old question")
+    session.add_message("tool", "x" * 4000)  # ~1000 tokens
+    session.add_message("user", "recent question")
+    session.add_message("assistant", "short answer")
+
+    history = session.get_history(max_messages=100, max_tokens=200)
+    assert [m["content"] for m in history] == ["recent question", "short answer"]
+    assert len(session.get_history(max_messages=100, max_tokens=5000)) == 4
+
+
+def test_token_estimates_are_cached_per_message(monkeypatch) -> None:
+    import nanobot.session.manager as manager_module
+
+    calls = []
+    monkeypatch.setattr(manager_module, "estimate_message_tokens", lambda m: calls.append(m) or 10)
+    session = Session(key="cli:t")
+    for i in range(5):
+        session.add_message("user", f"m{i}")
+
+    session.get_history(max_tokens=1000)
+    session.unconsolidated_tokens()
+    session.add_message("assistant", "new")
+    session.get_history(max_tokens=1000)
+    assert len(calls) == 6
+
+
+def _make_loop(tmp_path: Path, window: int) -> AgentLoop:
+    provider = MagicMock()
+    provider.get_default_model.return_value = "test-model"
+    loop = AgentLoop(
+        bus=MessageBus(), provider=provider, workspace=tmp_path, model="test-model",
+        memory_window=1000, max_tokens=100, context_window_tokens=window,
+        model_context_windows={"big-model": 1_000_000},
+    )
+    loop.provider.chat = AsyncMock(return_value=LLMResponse(content="ok"))
+    loop.tools.get_definitions = MagicMock(return_value=[])
+    return loop
+
+
+async def test_consolidation_triggers_on_token_mass(tmp_path: Path) -> None:
+    loop = _make_loop(tmp_path, window=4000)
+    budget = loop._history_budget("test-model", "hello")
+    assert 0 < budget < 4000
+    assert loop._history_budget("big-model", "hello") > 900_000
+
+    session = loop.sessions.get_or_create("cli:t")
+    for i in range(4):  # few messages, but far more tokens than the budget
+        session.add_message("user", f"q{i}")
+        session.add_message("tool", "y" * 4 * budget)
+    loop.sessions.save(session)
+
+    calls = []
+
+    async def fake_consolidate(snap, archive_all=False, keep_count=None):
+        calls.append(keep_count)
+        return True
+
+    loop._consolidate_memory = fake_consolidate  # type: ignore[method-assign]
+    sent = []
+    original_chat = loop.provider.chat
+
+    async def capture_chat(messages, **kwargs):
+        sent.append(messages)
+        return await original_chat(messages, **kwargs)
+
+    loop.provider.chat = capture_chat
+    await loop._process_message(InboundMessage(channel="cli", sender_id="u", chat_id="t", content="hello"))
+    await asyncio.sleep(0)
+
+    assert calls == [0]  # even the newest message is over half the budget
+    # History sent to the model stays within the budget: the huge tool results are dropped.
+    assert all(len(str(m.get("content"))) < 4 * budget for m in sent[0])
+
+
+async def test_message_count_mode_is_unchanged(tmp_path: Path) -> None:
+    loop = _make_loop(tmp_path, window=0)
+    assert loop._history_budget("test-model", "hello") is None
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
@@ -86,3 +87,67 @@ async def test_registry_returns_validation_error() -> None:
     reg.register(SampleTool())
     result = await reg.execute("sample", {"query": "hi"})
     assert "Invalid parameters" in result
+
+
+class SleepTool(Tool):
+    def __init__(self, name: str, read_only: bool, log: list[str]):
+        self._name = name
+        self._read_only = read_only
+        self._log = log
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return "sleep tool"
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {"delay": {"type": "number"}}}
+
+    @property
+    def read_only(self) -> bool:
+        return self._read_only
+
+    async def execute(self, delay: float = 0.0, **kwargs: Any) -> str:
+        self._log.append(f"start:{self._name}")
+        await asyncio.sleep(delay)
+        self._log.append(f"end:{self._name}")
+        return f"{self._name}:{delay}"
+
+
+async def test_registry_batch_runs_read_only_calls_concurrently() -> None:
+    log: list[str] = []
+    reg = ToolRegistry(max_concurrency=4)
+    reg.register(SleepTool("a", True, log))
+    reg.register(SleepTool("b", True, log))
+
+    results = await reg.execute_batch([("a", {"delay": 0.05}), ("b", {"delay": 0.0})])
+
+    assert results == ["a:0.05", "b:0.0"]
+    assert log == ["start:a", "start:b", "end:b", "end:a"]
+
+
+async def test_registry_batch_serializes_mutating_calls() -> None:
+    log: list[str] = []
+    reg = ToolRegistry(max_concurrency=4)
+    reg.register(SleepTool("r", True, log))
+    reg.register(SleepTool("w", False, log))
+
+    results = await reg.execute_batch([("r", {"delay": 0.02}), ("w", {}), ("r", {})])
+
+    assert results == ["r:0.02", "w:0.0", "r:0.0"]
+    assert log == ["start:r", "end:r", "start:w", "end:w", "start:r", "end:r"]
+
+
+async def test_registry_batch_sequential_when_concurrency_is_one() -> None:
+    log: list[str] = []
+    reg = ToolRegistry()
+    reg.register(SleepTool("a", True, log))
+    reg.register(SleepTool("b", True, log))
+
+    await reg.execute_batch([("a", {"delay": 0.02}), ("b", {})])
+
+    assert log == ["start:a", "end:a", "start:b", "end:b"]
@@ -0,0 +1,151 @@
+"""Tests for the LLM usage ledger, metering and spend budgets."""
+
+import asyncio
+
+import pytest
+
+from nanobot.providers.base import LLMProvider, LLMResponse, StreamChunk, parse_usage
+from nanobot.providers.metered import BudgetedProvider, MeteredProvider
+from nanobot.providers.openai_codex_provider import _map_usage
+from nanobot.usage.ledger import ModelPrice, UsageLedger, estimate_cost, usage_context
+
+PRICES = {
+    "big": ModelPrice(input=10.0, output=30.0, cached_input=1.0),
+    "small": ModelPrice(input=1.0, output=2.0),
+}
+
+
+class FixedProvider(LLMProvider):
+    def __init__(self, usage: dict[str, int]):
+        super().__init__()
+        self.usage = usage
+        self.models: list[str] = []
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        self.models.append(model)
+        return LLMResponse(content="ok", usage=dict(self.usage))
+
+    async def chat_stream(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        self.models.append(model)
+        yield StreamChunk(content="ok")
+        yield StreamChunk(response=LLMResponse(content="ok", usage=dict(self.usage)))
+
+    def get_default_model(self) -> str:
+        return "big"
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    ledger = UsageLedger(tmp_path / "usage.db", prices=PRICES)
+    yield ledger
+    ledger.close()
+
+
+def test_estimate_cost_bills_cached_prompt_tokens_at_cached_rate():
+    usage = {"prompt_tokens": 1_000_000, "completion_tokens": 100_000, "cached_tokens": 400_000}
+    assert estimate_cost("big", usage, PRICES) == pytest.approx(6.0 + 0.4 + 3.0)
+    assert estimate_cost("unknown-model-xyz", usage, PRICES) == 0.0
+
+
+def test_record_uses_usage_context_and_summarises(ledger):
+    usage = {"prompt_tokens": 1000, "completion_tokens": 100, "total_tokens": 1100}
+    with usage_context(session="telegram:1"):
+        ledger.record("big", usage)
+        with usage_context(site="consolidation"):
+            ledger.record("small", usage)
+    ledger.record("big", usage, session="cli:direct")
+
+    by_session = {row["session"]: row for row in ledger.summary(by="session")}
+    assert by_session["telegram:1"]["calls"] == 2
+    assert by_session["cli:direct"]["prompt_tokens"] == 1000
+    by_site = {row["site"]: row["calls"] for row in ledger.summary(by="site")}
+    assert by_site == {"agent": 2, "consolidation": 1}
+    assert ledger.session_cost("telegram:1") == pytest.approx(0.013 + 0.0012)
+    with pytest.raises(ValueError):
+        ledger.summary(by="cost; DROP TABLE calls")
+
+
+def test_parse_usage_reads_cached_tokens():
+    usage = parse_usage({
+        "prompt_tokens": 50, "completion_tokens": 5, "total_tokens": 55,
+        "prompt_tokens_details": {"cached_tokens": 40},
+    })
+    assert usage == {"prompt_tokens": 50, "completion_tokens": 5, "total_tokens": 55, "cached_tokens": 40}
+    assert _map_usage({"input_tokens": 50, "output_tokens": 5, "input_tokens_details": {"cached_tokens": 32}}) == {
+        "prompt_tokens": 50, "completion_tokens": 5, "total_tokens": 55, "cached_tokens": 32,
+    }
+
+
+def test_cache_writes_are_parsed_billed_and_summarised(tmp_path):
+    usage = parse_usage({
+        "prompt_tokens": 1_000_000, "completion_tokens": 0, "total_tokens": 1_000_000,
+        "cache_read_input_tokens": 400_000, "cache_creation_input_tokens": 100_000,
+    })
+    assert usage["cached_tokens"] == 400_000 and usage["cache_write_tokens"] == 100_000
+    prices = {"big": ModelPrice(input=10.0, output=30.0, cached_input=1.0, cache_write_input=12.5)}
+    assert estimate_cost("big", usage, prices) == pytest.approx(5.0 + 0.4 + 1.25)
+
+    ledger = UsageLedger(tmp_path / "usage.db", prices=prices)
+    try:
+        ledger.record("big", usage)
+        assert ledger.summary(by="model")[0]["cache_write_tokens"] == 100_000
+    finally:
+        ledger.close()
+
+
+def test_ledger_without_cache_write_column_is_migrated(tmp_path):
+    import sqlite3
+
+    path = tmp_path / "usage.db"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE calls (ts REAL, day TEXT, session TEXT, model TEXT, site TEXT, "
+        "prompt_tokens INTEGER, completion_tokens INTEGER, cached_tokens INTEGER, cost REAL)"
+    )
+    conn.execute("INSERT INTO calls VALUES (0, '2026-01-01', 's', 'big', 'agent', 10, 1, 0, 0.5)")
+    conn.commit()
+    conn.close()
+
+    ledger = UsageLedger(path, prices=PRICES)
+    try:
+        ledger.record("big", {"prompt_tokens": 10, "cache_write_tokens": 5})
+        assert ledger.summary(by="model")[0]["cache_write_tokens"] == 5
+    finally:
+        ledger.close()
+
+
+def test_metered_provider_records_chat_and_stream(ledger):
+    provider = MeteredProvider(FixedProvider({"prompt_tokens": 10, "completion_tokens": 1, "total_tokens": 11}), ledger)
+
+    async def run():
+        with usage_context(site="subagent", session="s1"):
+            await provider.chat([{"role": "user", "content": "hi"}])
+            async for _ in provider.chat_stream([{"role": "user", "content": "hi"}], model="small"):
+                pass
+
+    asyncio.run(run())
+    rows = {row["model"]: row for row in ledger.summary(by="model")}
+    assert rows["big"]["calls"] == 1
+    assert rows["small"]["calls"] == 1
+    assert ledger.summary(by="site")[0]["site"] == "subagent"
+
+
+def test_budget_switches_to_cheaper_model(tmp_path):
+    ledger = UsageLedger(tmp_path / "usage.db", prices=PRICES, session_budget_usd=0.01)
+    usage = {"prompt_tokens": 1000, "completion_tokens": 0, "total_tokens": 1000}
+    main, cheap = FixedProvider(usage), FixedProvider(usage)
+    provider = BudgetedProvider(MeteredProvider(main, ledger), ledger, MeteredProvider(cheap, ledger), "small")
+
+    async def run():
+        with usage_context(session="s1"):
+            await provider.chat([], model="big")  # $0.01: spends the budget
+            await provider.chat([], model="big")
+        with usage_context(session="s2"):
+            await provider.chat([], model="big")
+
+    try:
+        asyncio.run(run())
+    finally:
+        ledger.close()
+    assert main.models == ["big", "big"]
+    assert cheap.models == ["small"]